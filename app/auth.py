@@ -1,15 +1,22 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.concurrency import run_in_threadpool
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+import asyncio
 import os
+import threading
+import uuid
 
 from app.database import get_db
 from app.models.users import User
 from app.schemas.token import TokenData
+from app.principal_cache import principal_cache
+from app.revocation import revocation_filter
 
 # Constants for JWT
 # WARNING: THIS DEFAULT SECRET_KEY IS FOR DEVELOPMENT ONLY AND IS INSECURE.
@@ -17,11 +24,25 @@ from app.schemas.token import TokenData
 # TO A STRONG, UNIQUE, AND RANDOMLY GENERATED STRING.
 SECRET_KEY = os.environ.get("SECRET_KEY", "medimarket-secret-key")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
+# Access tokens carry role and active-state claims, so they are kept short-lived;
+# clients renew them through /api/auth/refresh with a longer-lived refresh token.
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+
+# User types that are treated as administrators
+ADMIN_TYPES = ("admin", "administrator", "system")
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Bounded worker pool for bcrypt so hashing never runs on the event loop.
+# At most PASSWORD_HASH_WORKERS hashes run at once and at most
+# PASSWORD_HASH_MAX_QUEUE more may wait; beyond that requests fail fast.
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", "32"))
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE)
+
 # OAuth2 scheme for token validation
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
@@ -33,6 +54,30 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# Run a password hashing call on the bounded worker pool
+async def _run_in_hash_pool(func, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _hash_executor.submit(func, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+# Async variant of verify_password for use inside async routes
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+# Async variant of get_password_hash for use inside async routes
+async def get_password_hash_async(password):
+    return await _run_in_hash_pool(get_password_hash, password)
+
 # Function to authenticate user
 def authenticate_user(db: Session, email: str, password: str):
     user = db.query(User).filter(User.email == email).first()
@@ -42,6 +87,29 @@ def authenticate_user(db: Session, email: str, password: str):
         return False
     return user
 
+# Async variant of authenticate_user; the lookup and password verification run off the event loop
+async def authenticate_user_async(db: Session, email: str, password: str):
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
+    if not user:
+        return False
+    if not await verify_password_async(password, user.hashed_password):
+        return False
+    return user
+
+# Function to check if a user (or token principal) is an administrator
+def is_admin(user):
+    return bool(user.type) and user.type.lower() in ADMIN_TYPES
+
+# Claims embedded in access tokens so authorization can skip the database
+def user_claims(user: User) -> dict:
+    return {
+        "sub": user.id,
+        "type": user.type,
+        "active": bool(user.is_active),
+        "name": user.name,
+        "email": user.email,
+    }
+
 # Function to create access token
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -49,12 +117,27 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": str(uuid.uuid4()), "token_use": "access"})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-# Function to get current user
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# Function to create refresh token
+def create_refresh_token(user_id: str, expires_delta: Optional[timedelta] = None):
+    expire = datetime.utcnow() + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    to_encode = {"sub": user_id, "exp": expire, "iat": datetime.utcnow(), "token_use": "refresh", "jti": str(uuid.uuid4())}
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+# Function to build the token part of a login/register/refresh response
+def create_user_tokens(user: User) -> dict:
+    return {
+        "access_token": create_access_token(data=user_claims(user)),
+        "refresh_token": create_refresh_token(user.id),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+# Function to decode and validate a token of the expected kind
+def decode_token(token: str, token_use: str = "access") -> TokenData:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -62,19 +145,71 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     )
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        token_data = TokenData(user_id=user_id)
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user_id: str = payload.get("sub")
+    # Tokens issued before token_use existed are access tokens
+    if user_id is None or payload.get("token_use", "access") != token_use:
+        raise credentials_exception
+    issued_at = payload.get("iat")
+    return TokenData(
+        user_id=user_id,
+        type=payload.get("type"),
+        is_active=payload.get("active"),
+        name=payload.get("name"),
+        email=payload.get("email"),
+        jti=payload.get("jti"),
+        issued_at=datetime.fromtimestamp(issued_at, timezone.utc) if issued_at is not None else None,
+        expires_at=datetime.fromtimestamp(payload["exp"], timezone.utc) if "exp" in payload else None,
+    )
+
+# Function to get current user.
+# Tokens with role claims resolve without reading the users table: revocation
+# (deactivation, role change, logout) is checked against the in-memory filter.
+# Returns a transient User carrying id, type, is_active, name and email.
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    token_data = decode_token(token)
+    # Lets the session record who wrote, for read-your-writes replica routing
+    db.info["user_id"] = token_data.user_id
+    if token_data.type is not None and token_data.is_active is not None:
+        # The filter answers from memory; only a sync or a filter hit needs the database
+        if revocation_filter.needs_database(token_data.user_id, token_data.jti):
+            revoked = await run_in_threadpool(
+                revocation_filter.is_revoked, db, token_data.user_id, token_data.issued_at, token_data.jti
+            )
+            if revoked:
+                raise credentials_exception
+        return User(
+            id=token_data.user_id,
+            type=token_data.type,
+            is_active=token_data.is_active,
+            name=token_data.name,
+            email=token_data.email,
+        )
+    # Tokens issued before claims existed: serve the principal from the
+    # in-process cache when possible
+    user = principal_cache.get(token_data.user_id)
+    if user is not None:
+        return user
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.id == token_data.user_id).first())
     if user is None:
         raise credentials_exception
+    principal_cache.put(user)
     return user
 
 # Function to get current active user
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+# Function to require an administrator, resolved from token claims
+async def get_current_admin(current_user: User = Depends(get_current_active_user)):
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
     return current_user
\ No newline at end of file
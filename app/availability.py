@@ -0,0 +1,204 @@
+"""
+Appointment availability and double-booking protection.
+
+A clinic is one bookable resource: it sees one patient at a time. The day
+is divided into SLOT_MINUTES blocks, and an appointment occupies its service
+duration rounded up to whole blocks, starting on a block boundary.
+
+Free slots for a clinic, service and day are computed from the clinic's
+opening hours and its active appointments that day. The appointments are
+merged into a sorted interval index, so checking each candidate start is a
+binary search. Clinics that have not set opening hours are open
+DEFAULT_OPENING_HOURS on DEFAULT_OPEN_WEEKDAYS.
+
+Checking availability before inserting is not enough under concurrent
+requests: two bookings can both see a slot as free. Each booking therefore
+also claims its blocks in appointment_slots, whose primary key is
+(clinic_id, date, start), in the same transaction. Whichever booking
+commits second fails on the key, so overlapping bookings are rejected by
+the database itself.
+"""
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+import os
+
+from app.models.appointments import Appointment, AppointmentSlot
+from app.models.clinics import ClinicOpeningHours, ClinicService
+from app.models.types import to_date, to_time
+
+SLOT_MINUTES = int(os.environ.get("SLOT_MINUTES", "15"))
+DEFAULT_OPENING_HOURS = os.environ.get("DEFAULT_OPENING_HOURS", "09:00-17:00")
+DEFAULT_OPEN_WEEKDAYS = os.environ.get("DEFAULT_OPEN_WEEKDAYS", "0,1,2,3,4")  # Monday to Friday
+
+MINUTES_PER_DAY = 24 * 60
+SLOT_TAKEN = "That time is no longer available"
+
+
+# Day from an ISO date string; malformed dates are a client error
+def parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid date, expected YYYY-MM-DD")
+
+
+# Minutes since midnight from "HH:MM"; "24:00" is allowed as an end of day
+def parse_minutes(value: str, allow_end_of_day: bool = False) -> int:
+    try:
+        hours, minutes = value.split(":")
+        if len(minutes) != 2:
+            raise ValueError(value)
+        total = int(hours) * 60 + int(minutes)
+        if not 0 <= int(minutes) < 60 or not 0 <= total <= MINUTES_PER_DAY:
+            raise ValueError(value)
+        if total == MINUTES_PER_DAY and not allow_end_of_day:
+            raise ValueError(value)
+    except (AttributeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid time {value!r}, expected HH:MM")
+    return total
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def time_of(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+# Minutes since midnight of a stored appointment time (a time, or a legacy string)
+def minutes_of(value) -> int:
+    try:
+        value = to_time(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid time {value!r}, expected HH:MM")
+    return value.hour * 60 + value.minute
+
+
+# Minutes an appointment blocks out: the service duration in whole slots
+def service_span(duration) -> int:
+    try:
+        duration = int(duration or 0)
+    except (TypeError, ValueError):
+        duration = 0
+    slots = max(1, -(-duration // SLOT_MINUTES))
+    return slots * SLOT_MINUTES
+
+
+# Slot start times ("HH:MM") covered by an appointment at start for span minutes
+def slot_starts(start: int, span: int) -> list:
+    return [format_minutes(minute) for minute in range(start, start + span, SLOT_MINUTES)]
+
+
+class IntervalIndex:
+    """Disjoint, sorted [start, end) minute intervals with O(log n) overlap checks."""
+
+    def __init__(self, intervals=()):
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        # The only candidate is the last interval starting before end
+        position = bisect_right(self._starts, end - 1) - 1
+        return position >= 0 and self._ends[position] > start
+
+    def __len__(self):
+        return len(self._starts)
+
+
+# Default weekly hours as {weekday: [(opens, closes)]}
+def _default_hours() -> dict:
+    opens, closes = DEFAULT_OPENING_HOURS.split("-")
+    interval = (parse_minutes(opens), parse_minutes(closes, allow_end_of_day=True))
+    return {int(weekday): [interval] for weekday in DEFAULT_OPEN_WEEKDAYS.split(",") if weekday.strip()}
+
+
+# The clinic's weekly hours as {weekday: [(opens, closes)]}, in minutes
+def weekly_hours(db: Session, clinic_id: str) -> dict:
+    rows = db.query(ClinicOpeningHours.weekday, ClinicOpeningHours.opens, ClinicOpeningHours.closes).filter(
+        ClinicOpeningHours.clinic_id == clinic_id
+    ).all()
+    if not rows:
+        return _default_hours()
+    hours = {}
+    for weekday, opens, closes in rows:
+        hours.setdefault(weekday, []).append((parse_minutes(opens), parse_minutes(closes, allow_end_of_day=True)))
+    return {weekday: sorted(intervals) for weekday, intervals in hours.items()}
+
+
+# Interval index of the clinic's active appointments on day: one range scan
+# of the (clinic_id, start_at) index
+def booked_intervals(db: Session, clinic_id: str, day: date, exclude_appointment_id: str = None) -> IntervalIndex:
+    midnight = datetime.combine(day, time.min)
+    query = db.query(Appointment.time, ClinicService.duration).outerjoin(
+        ClinicService, ClinicService.id == Appointment.service_id
+    ).filter(
+        Appointment.clinic_id == clinic_id,
+        Appointment.start_at >= midnight,
+        Appointment.start_at < midnight + timedelta(days=1),
+        Appointment.status != "cancelled"
+    )
+    if exclude_appointment_id is not None:
+        query = query.filter(Appointment.id != exclude_appointment_id)
+    intervals = []
+    for start_time, duration in query:
+        start = minutes_of(start_time)
+        intervals.append((start, start + service_span(duration)))
+    return IntervalIndex(intervals)
+
+
+# Start times (minutes) on day at which span minutes fit within opening hours
+# and clear of booked; today's past times are left out
+def free_slots(opening: list, booked: IntervalIndex, span: int, day: date, now: datetime = None) -> list:
+    now = now or datetime.now()
+    if day < now.date():
+        return []
+    earliest = now.hour * 60 + now.minute if day == now.date() else 0
+    slots = []
+    for opens, closes in opening:
+        # Slots start on the clinic-wide grid even if a clinic opens off it
+        start = -(-opens // SLOT_MINUTES) * SLOT_MINUTES
+        while start + span <= closes:
+            if start >= earliest and not booked.overlaps(start, start + span):
+                slots.append(start)
+            start += SLOT_MINUTES
+    return slots
+
+
+# Raise unless service can be booked at start on day
+def check_bookable(db: Session, service: ClinicService, day: date, start: int,
+                   exclude_appointment_id: str = None, now: datetime = None):
+    now = now or datetime.now()
+    if (day, start) < (now.date(), now.hour * 60 + now.minute):
+        raise HTTPException(status_code=400, detail="Appointments cannot be booked in the past")
+    if start % SLOT_MINUTES:
+        raise HTTPException(status_code=400, detail=f"Appointments start on {SLOT_MINUTES}-minute boundaries")
+    span = service_span(service.duration)
+    opening = weekly_hours(db, service.clinic_id).get(day.weekday(), [])
+    if not any(opens <= start and start + span <= closes for opens, closes in opening):
+        raise HTTPException(status_code=400, detail="The clinic is not open for this service at that time")
+    if booked_intervals(db, service.clinic_id, day, exclude_appointment_id).overlaps(start, start + span):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_TAKEN)
+
+
+# Claim the slots of an active appointment, replacing any it held before.
+# A slot held by another appointment fails the flush with IntegrityError.
+def claim_slots(db: Session, appointment: Appointment, service: ClinicService):
+    release_slots(db, appointment.id)
+    day, start = to_date(appointment.date).isoformat(), minutes_of(appointment.time)
+    db.add_all(
+        AppointmentSlot(clinic_id=appointment.clinic_id, date=day, start=slot, appointment_id=appointment.id)
+        for slot in slot_starts(start, service_span(service.duration))
+    )
+
+
+def release_slots(db: Session, appointment_id: str):
+    db.query(AppointmentSlot).filter(AppointmentSlot.appointment_id == appointment_id).delete(synchronize_session=False)
@@ -0,0 +1,165 @@
+"""
+One-shot database bootstrap: schema migrations, the admin account and the
+sample data.
+
+Web workers used to run Base.metadata.create_all at import and re-seed the
+database (several bcrypt hashes) on every start. That work now happens here,
+once per database, and is recorded in the bootstrap_markers table. At startup
+a worker looks the marker up and compares the database's alembic_version
+with the newest migration:
+
+    python -m app.bootstrap [--no-sample-data] [--force]
+
+With AUTO_BOOTSTRAP set (the default, for local development) a worker that
+finds no marker, or a schema behind the migrations, bootstraps the database
+itself. Otherwise it refuses to start. Deployments with several workers
+should run the command once before starting them (again after each upgrade)
+and set AUTO_BOOTSTRAP=0, so workers never race to migrate or seed.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+import argparse
+import glob
+import logging
+import os
+import re
+
+from app.database import engine
+from app.models.bootstrap import BootstrapMarker
+from app.principal_cache import invalidate_principal
+from app.sample_data import create_initial_data
+from app.search import index_clinics, index_products
+from app.updates.add_admin_user import add_admin_user
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(ROOT, "alembic.ini")
+MIGRATION_VERSIONS = os.path.join(ROOT, "migrations", "versions")
+AUTO_BOOTSTRAP = os.environ.get("AUTO_BOOTSTRAP", "1").lower() in ("1", "true", "yes")
+SEED_SAMPLE_DATA = os.environ.get("SEED_SAMPLE_DATA", "1").lower() in ("1", "true", "yes")
+
+# Marker written once the admin account (and sample data, if requested) exist
+BOOTSTRAP_MARKER = "initial-data"
+
+
+# Alembic configuration for migrations/.
+# Alembic is imported here so modules that never migrate never load it.
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+# Upgrade the schema to the latest migration
+def run_migrations(bind=None):
+    from alembic import command
+
+    config = alembic_config()
+    with (bind or engine).connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        connection.commit()
+
+
+# True if the bootstrap marker exists; a database without the table is not bootstrapped
+def is_bootstrapped(db: Session) -> bool:
+    try:
+        return db.get(BootstrapMarker, BOOTSTRAP_MARKER) is not None
+    except (OperationalError, ProgrammingError):
+        db.rollback()
+        return False
+
+
+_REVISION = re.compile(r"^revision\b[^=]*=\s*['\"](\w+)['\"]", re.M)
+_DOWN_REVISION = re.compile(r"^down_revision\b[^=]*=(.*)$", re.M)
+
+
+# The newest migration in migrations/versions: the revision no other revises.
+# Read from the files' revision lines, since loading them through Alembic
+# would add over 100ms to every worker's startup.
+def migrations_head() -> str:
+    revisions, revised = set(), set()
+    for path in glob.glob(os.path.join(MIGRATION_VERSIONS, "*.py")):
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        revision = _REVISION.search(source)
+        if revision:
+            revisions.add(revision.group(1))
+            down_revision = _DOWN_REVISION.search(source)
+            revised.update(re.findall(r"['\"](\w+)['\"]", down_revision.group(1)) if down_revision else ())
+    heads = revisions - revised
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one migration head, found {sorted(heads)}")
+    return heads.pop()
+
+
+# The migration the database was last upgraded to; None if it was never migrated
+def schema_version(db: Session):
+    try:
+        return db.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except (OperationalError, ProgrammingError):
+        db.rollback()
+        return None
+
+
+# Migrate, create the admin account and optionally the sample data, then set the marker.
+# Returns False if the database was already bootstrapped (and force is not set).
+def bootstrap(bind=None, sample_data: bool = SEED_SAMPLE_DATA, force: bool = False) -> bool:
+    run_migrations(bind)
+    db = Session(bind=bind or engine)
+    try:
+        if is_bootstrapped(db) and not force:
+            logger.info("Database already bootstrapped")
+            return False
+        admin = add_admin_user(db)
+        # Older databases stored other spellings of the admin type
+        if admin.type != "admin":
+            admin.type = "admin"
+            db.commit()
+            invalidate_principal(admin.id)
+        if sample_data:
+            create_initial_data(db)
+            index_clinics(db)
+            index_products(db)
+        db.merge(BootstrapMarker(name=BOOTSTRAP_MARKER, completed_at=datetime.now(timezone.utc)))
+        db.commit()
+        logger.info("Database bootstrapped")
+        return True
+    finally:
+        db.close()
+
+
+# Startup check: the marker and the schema version, two single-row reads when
+# the database is bootstrapped and up to date
+def ensure_bootstrapped(bind=None):
+    head = migrations_head()
+    db = Session(bind=bind or engine)
+    try:
+        bootstrapped = is_bootstrapped(db)
+        version = schema_version(db)
+    finally:
+        db.close()
+    if bootstrapped and version == head:
+        return
+    if bootstrapped:
+        problem = f"Database schema is at migration {version}, but the newest migration is {head}"
+    else:
+        problem = "Database is not bootstrapped"
+    if not AUTO_BOOTSTRAP:
+        raise RuntimeError(f"{problem}; run `python -m app.bootstrap` first")
+    logger.warning(f"{problem}; bootstrapping now (set AUTO_BOOTSTRAP=0 to disable)")
+    bootstrap(bind)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Migrate and seed the database once.")
+    parser.add_argument("--no-sample-data", action="store_true", help="only create the admin account")
+    parser.add_argument("--force", action="store_true", help="run even if the marker is already set")
+    args = parser.parse_args()
+    bootstrap(sample_data=SEED_SAMPLE_DATA and not args.no_sample_data, force=args.force)
@@ -1,10 +1,20 @@
+from fastapi import Request
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
+from collections import OrderedDict
+from contextvars import ContextVar
+import asyncio
+import hashlib
+import hmac
 import os
-import time
+import sqlite3
 import logging
+import threading
+import time
+
+from app.slow_queries import SLOW_QUERY_LOG, slow_query_log
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -15,71 +25,247 @@ logger = logging.getLogger(__name__)
 #setting the default to SQLite for local development
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./test.db")
 
-# Create SQLAlchemy engine with improved connection settings
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,  # Detect stale connections
-        pool_recycle=3600,   # Recycle connections every hour to avoid stale connections
-        pool_size=10,        # Increase connection pool size 
-        max_overflow=20,     # Allow up to 20 overflow connections
-        connect_args={"connect_timeout": 10}  # Timeout for new connections
-    )
+# Optional read replica. Read-only endpoints (catalog, clinic directory, admin
+# counts) take their session from get_read_db, which uses this URL when set and
+# the primary otherwise.
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL")
+
+# After a user commits a write, their replica reads go to the primary for this
+# many seconds so they see their own changes despite replication lag. The
+# response to the write carries a signed marker (a cookie, and a header for
+# clients without cookies) so the window holds on whichever worker serves the
+# next read (see ReadYourWritesMiddleware).
+READ_YOUR_WRITES_SECONDS = float(os.environ.get("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "read_your_writes"
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+# Pre-pinging costs a round trip on every pool checkout. By default connections are
+# validated only when they fail: SQLAlchemy recognises disconnect errors and
+# invalidates the pool, so the next checkout gets a fresh connection.
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+
+# Opt-in SQLite tuning for deployments (e.g. edge clinics) that run on SQLite.
+# SQLITE_PROFILE=tuned switches to WAL so readers no longer block behind writers,
+# relaxes fsyncs to WAL checkpoints, and sizes the page cache and mmap window.
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "default").lower()
+SQLITE_TUNED_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),  # bytes
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB, i.e. 64 MiB
+    "temp_store": "MEMORY",
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),  # wait for locks instead of failing
+}
+
+# Apply the tuned pragmas to a new SQLite DBAPI connection
+def apply_sqlite_profile(dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_TUNED_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
 
-# Set up event listener for checkout to handle potential connection failures
-@event.listens_for(engine, "connect")
+# Create an SQLAlchemy engine with improved connection settings
+def create_database_engine(url: str):
+    if url.startswith("sqlite"):
+        new_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False}
+        )
+    else:
+        new_engine = create_engine(
+            url,
+            pool_pre_ping=DB_POOL_PRE_PING,  # Opt-in checkout ping; disconnects are detected on error otherwise
+            pool_recycle=3600,   # Recycle connections every hour to avoid stale connections
+            pool_size=10,        # Increase connection pool size 
+            max_overflow=20,     # Allow up to 20 overflow connections
+            connect_args={"connect_timeout": 10}  # Timeout for new connections
+        )
+    event.listen(new_engine, "connect", connect)
+    event.listen(new_engine, "checkout", checkout)
+    if SLOW_QUERY_LOG:
+        slow_query_log.attach(new_engine)
+    return new_engine
+
+# Event listeners attached to every engine
 def connect(dbapi_connection, connection_record):
+    if SQLITE_PROFILE == "tuned" and isinstance(dbapi_connection, sqlite3.Connection):
+        apply_sqlite_profile(dbapi_connection)
     logger.info("Database connection established")
 
-@event.listens_for(engine, "checkout")
 def checkout(dbapi_connection, connection_record, connection_proxy):
     logger.debug("Database connection retrieved from pool")
 
-# Create session factory
+engine = create_database_engine(DATABASE_URL)
+read_engine = create_database_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Users who committed a write in the last READ_YOUR_WRITES_SECONDS, oldest first.
+# Kept per process, for clients that drop the marker; routes record the user
+# on the session (db.info["user_id"]).
+_recent_writers = OrderedDict()
+_recent_writers_lock = threading.Lock()
+
+def note_write(user_id: str):
+    now = time.monotonic()
+    with _recent_writers_lock:
+        _recent_writers[user_id] = now
+        _recent_writers.move_to_end(user_id)
+        while _recent_writers:
+            oldest_user, written_at = next(iter(_recent_writers.items()))
+            if now - written_at < READ_YOUR_WRITES_SECONDS:
+                break
+            del _recent_writers[oldest_user]
+
+def wrote_recently(user_id: str) -> bool:
+    written_at = _recent_writers.get(user_id)
+    return written_at is not None and time.monotonic() - written_at < READ_YOUR_WRITES_SECONDS
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+# Users whose writes the current request committed (the request's own user);
+# None outside ReadYourWritesMiddleware
+_request_writers: ContextVar = ContextVar("request_writers", default=None)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_writer(session):
+    if session.info.pop("wrote", False) and session.info.get("user_id"):
+        note_write(session.info["user_id"])
+        writers = _request_writers.get()
+        if writers is not None:
+            writers.add(session.info["user_id"])
+
+def _marker_signature(user_id: str, expires_ms: int) -> str:
+    # Imported lazily: app.auth imports this module
+    from app.auth import SECRET_KEY
+    message = f"read-your-writes:{user_id}:{expires_ms}".encode()
+    return hmac.new(SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+# Signed "user_id:expiry:signature" marker for a user who just wrote
+def write_marker(user_id: str, now: float = None) -> str:
+    expires_ms = int(((now or time.time()) + READ_YOUR_WRITES_SECONDS) * 1000)
+    return f"{user_id}:{expires_ms}:{_marker_signature(user_id, expires_ms)}"
+
+# True if marker was issued to user_id and has not expired
+def marker_is_valid(marker: str, user_id: str) -> bool:
+    try:
+        marked_user, expires_ms, signature = marker.rsplit(":", 2)
+        expires_ms = int(expires_ms)
+    except ValueError:
+        return False
+    return (
+        marked_user == user_id
+        and expires_ms > time.time() * 1000
+        and hmac.compare_digest(signature, _marker_signature(marked_user, expires_ms))
+    )
+
+# The marker a request carries: the header (Cordova app) or the cookie (web app)
+def _request_marker(request: Request):
+    return request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware that hands a signed read-your-writes marker to users whose request wrote."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writers = set()
+        token = _request_writers.set(writers)
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and writers:
+                marker = write_marker(next(iter(writers)))
+                cookie = (f"{READ_YOUR_WRITES_COOKIE}={marker}; Max-Age={max(1, round(READ_YOUR_WRITES_SECONDS))}; "
+                          "Path=/; HttpOnly; SameSite=Lax")
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode()))
+                headers.append((READ_YOUR_WRITES_HEADER.lower().encode(), marker.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            _request_writers.reset(token)
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _forget_rolled_back_write(session, previous_transaction):
+    session.info.pop("wrote", None)
+
+# Replica sessions must never write
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_replica_writes(session, flush_context, instances):
+    raise RuntimeError("Read replica sessions are read-only; use get_db for writes")
 
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get database session with retry mechanism
+# Dependency to get database session.
+# The session connects lazily on its first query, so no liveness check is done
+# here. FastAPI caches dependencies per request, so the route and its auth
+# dependencies share this one session.
 def get_db():
-    max_retries = 3
-    retry_count = 0
-    
-    while retry_count < max_retries:
-        db = None
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        logger.debug("Closing database connection")
+        db.close()
+
+# The bearer token's user, if any (only needed while someone has recent writes)
+def _request_user_id(request: Request):
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    # Imported lazily: app.auth imports this module
+    from fastapi import HTTPException
+    from app.auth import decode_token
+    try:
+        return decode_token(token).user_id
+    except HTTPException:
+        return None
+
+# Dependency to get a session for read-only endpoints. Uses the read replica
+# unless the requesting user has just written, in which case the primary
+# serves the read (read-your-writes): either this worker served the write, or
+# the request carries a valid marker issued for the user's write.
+def get_read_db(request: Request):
+    marker = _request_marker(request)
+    user_id = _request_user_id(request) if marker or _recent_writers else None
+    if user_id and (wrote_recently(user_id) or (marker and marker_is_valid(marker, user_id))):
+        db = SessionLocal()
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Wait for the database to accept connections, with exponential backoff.
+# Used at startup; backs off with asyncio.sleep so the event loop keeps running.
+async def wait_for_database(max_retries: int = 5, base_delay: float = 0.5):
+    for attempt in range(1, max_retries + 1):
         try:
-            db = SessionLocal()
-            # Test connection
-            db.execute(text("SELECT 1"))
-            logger.debug("Database connection successful")
-            try:
-                yield db
-            finally:
-                if db:
-                    logger.debug("Closing database connection")
-                    db.close()
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
             return
         except OperationalError as e:
-            retry_count += 1
-            logger.warning(f"Database connection error (attempt {retry_count}/{max_retries}): {e}")
-            # Close potentially stale connection
-            if db:
-                try:
-                    db.close()
-                except Exception as close_error:
-                    logger.error(f"Error closing database connection: {close_error}")
-            
-            if retry_count < max_retries:
-                # Wait before retrying (exponential backoff)
-                backoff_time = 0.5 * (2 ** retry_count)
-                logger.info(f"Retrying database connection in {backoff_time} seconds")
-                time.sleep(backoff_time)
-            else:
+            logger.warning(f"Database connection error (attempt {attempt}/{max_retries}): {e}")
+            if attempt == max_retries:
                 logger.error("Failed to connect to database after multiple attempts")
-                raise
\ No newline at end of file
+                raise
+            backoff_time = base_delay * (2 ** (attempt - 1))
+            logger.info(f"Retrying database connection in {backoff_time} seconds")
+            await asyncio.sleep(backoff_time)
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Featured clinics for the homepage.
+
+Clinics are ranked by recent traffic: appointments booked and order lines
+placed for their products within the last FEATURED_WINDOW_DAYS, cancelled
+ones excluded. Clinics without traffic follow, newest first, so a fresh
+install still features someone. The top FEATURED_COUNT, with their
+services, are rendered once into a JSON snapshot held in memory with its
+ETag.
+
+A background task (started in main.py) refreshes the snapshot every
+FEATURED_REFRESH_SECONDS, so homepage views read memory only and never touch
+the appointments table. A worker that serves the route before its first
+refresh (tests, a cold start) builds the snapshot inline once.
+"""
+from datetime import datetime, timedelta, timezone
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import desc, func, literal, select, union_all
+from sqlalchemy.orm import Session
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from app.models.appointments import Appointment
+from app.models.clinics import Clinic, ClinicService
+from app.models.products import Order, OrderItem
+from app.models.users import User
+from app.schemas.clinic import ClinicResponse
+
+logger = logging.getLogger(__name__)
+
+FEATURED_COUNT = int(os.environ.get("FEATURED_COUNT", "3"))
+FEATURED_WINDOW_DAYS = int(os.environ.get("FEATURED_WINDOW_DAYS", "30"))
+FEATURED_REFRESH_SECONDS = float(os.environ.get("FEATURED_REFRESH_SECONDS", "300"))
+# How long browsers and proxies may reuse a response before revalidating its ETag
+FEATURED_MAX_AGE_SECONDS = int(os.environ.get("FEATURED_MAX_AGE_SECONDS", "60"))
+# An appointment is worth this many order lines
+APPOINTMENT_WEIGHT = 2
+
+
+class FeaturedSnapshot:
+    """A rendered featured-clinics response: JSON body, ETag and build time."""
+
+    def __init__(self, body: bytes, clinic_ids: list):
+        self.body = body
+        self.clinic_ids = clinic_ids
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.built_at = time.monotonic()
+
+
+# Traffic score per clinic within the window, as a subquery (clinic_id, score)
+def _traffic_scores(since: datetime):
+    appointments = select(Appointment.clinic_id.label("clinic_id"), literal(APPOINTMENT_WEIGHT).label("weight")).where(
+        Appointment.created_at >= since, Appointment.status != "cancelled"
+    )
+    order_lines = select(OrderItem.clinic_id.label("clinic_id"), literal(1).label("weight")).join(
+        Order, Order.id == OrderItem.order_id
+    ).where(
+        Order.created_at >= since, Order.status != "cancelled"
+    )
+    events = union_all(appointments, order_lines).subquery()
+    return select(events.c.clinic_id, func.sum(events.c.weight).label("score")).group_by(events.c.clinic_id).subquery()
+
+
+# Rank clinics and render the top ones: one ranking query plus one for their services
+def build_snapshot(db: Session, count: int = FEATURED_COUNT, now: datetime = None) -> FeaturedSnapshot:
+    now = now or datetime.now(timezone.utc)
+    scores = _traffic_scores(now - timedelta(days=FEATURED_WINDOW_DAYS))
+    score = func.coalesce(scores.c.score, 0)
+    rows = db.execute(
+        select(Clinic, User.name, User.email)
+        .join(User, User.id == Clinic.id)
+        .outerjoin(scores, scores.c.clinic_id == Clinic.id)
+        .where(User.is_active.is_(True))
+        .order_by(desc(score), desc(Clinic.created_at), Clinic.id)
+        .limit(count)
+    ).all()
+    clinic_ids = [clinic.id for clinic, _, _ in rows]
+    services = {}
+    if clinic_ids:
+        for service in db.query(ClinicService).filter(ClinicService.clinic_id.in_(clinic_ids)).order_by(ClinicService.id):
+            services.setdefault(service.clinic_id, []).append(service)
+    featured = [
+        ClinicResponse.model_validate({
+            **{column: getattr(clinic, column) for column in Clinic.__table__.columns.keys()},
+            "name": name,
+            "email": email,
+            "services": services.get(clinic.id, []),
+        }).model_dump(mode="json")
+        for clinic, name, email in rows
+    ]
+    body = json.dumps(featured, separators=(",", ":")).encode()
+    return FeaturedSnapshot(body, clinic_ids)
+
+
+class FeaturedClinics:
+    """Per-process holder of the current snapshot."""
+
+    def __init__(self, refresh_seconds: float = FEATURED_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session) -> FeaturedSnapshot:
+        """Rebuild the snapshot from the database and publish it."""
+        snapshot = build_snapshot(db)
+        with self._lock:
+            self._snapshot = snapshot
+        logger.info(f"Featured clinics refreshed: {', '.join(snapshot.clinic_ids) or 'none'}")
+        return snapshot
+
+    def get(self, db: Session) -> FeaturedSnapshot:
+        """The current snapshot; built with db only if there is none yet."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = build_snapshot(db)
+            return self._snapshot
+
+    def clear(self):
+        with self._lock:
+            self._snapshot = None
+
+    async def refresh_periodically(self, session_factory):
+        """Refresh forever; a failed refresh keeps serving the previous snapshot."""
+        while True:
+            db = session_factory()
+            try:
+                await run_in_threadpool(self.refresh, db)
+            except Exception:
+                logger.exception("Featured clinics refresh failed")
+            finally:
+                db.close()
+            await asyncio.sleep(self.refresh_seconds)
+
+
+# Process-wide snapshot served by GET /api/clinics/featured
+featured_clinics = FeaturedClinics()
@@ -0,0 +1,94 @@
+"""
+Geohash grid helpers for "clinics near me".
+
+Each clinic with coordinates stores its geohash (GEOHASH_PRECISION
+characters, about 5m). Geohash cells nest by prefix, so "every clinic in
+cell c" is the index range [c, c + "~"). A nearby query picks the finest
+precision whose cells are at least as large as the search radius. The 3x3
+block of cells around the caller then contains the whole search circle, and
+only clinics in those nine ranges are read. They are ranked by exact
+haversine distance in Python.
+"""
+import math
+
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+# Geohash of a point
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+# Cell size in degrees (latitude, longitude) at a precision
+def cell_degrees(precision: int):
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+# Great-circle distance in kilometres
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# Bounding box (min lat, max lat, min lng, max lng) of a circle; longitudes
+# are not wrapped, so callers near the antimeridian see a box past +/-180
+def bounding_box(latitude: float, longitude: float, radius_km: float):
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    max_abs_lat = min(90.0, abs(latitude) + d_lat)
+    cos_lat = math.cos(math.radians(max_abs_lat))
+    d_lng = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (KM_PER_DEGREE_LAT * cos_lat))
+    return latitude - d_lat, latitude + d_lat, longitude - d_lng, longitude + d_lng
+
+
+# Finest precision whose cells are at least radius_km tall and wide around latitude
+def search_precision(latitude: float, radius_km: float) -> int:
+    min_lat, max_lat, _, _ = bounding_box(latitude, 0.0, radius_km)
+    cos_lat = math.cos(math.radians(min(90.0, max(abs(min_lat), abs(max_lat)))))
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_degrees, lng_degrees = cell_degrees(precision)
+        if lat_degrees * KM_PER_DEGREE_LAT >= radius_km and lng_degrees * KM_PER_DEGREE_LAT * cos_lat >= radius_km:
+            return precision
+    return 0
+
+
+# Geohash prefixes of the 3x3 block of cells around a point. An empty prefix
+# means the radius is too large for any cell and the whole index is searched.
+def covering_cells(latitude: float, longitude: float, radius_km: float):
+    precision = search_precision(latitude, radius_km)
+    if precision == 0:
+        return [""]
+    lat_degrees, lng_degrees = cell_degrees(precision)
+    cells = set()
+    for d_lat in (-lat_degrees, 0.0, lat_degrees):
+        cell_lat = latitude + d_lat
+        if not -90.0 <= cell_lat <= 90.0:
+            continue
+        for d_lng in (-lng_degrees, 0.0, lng_degrees):
+            cell_lng = (longitude + d_lng + 180.0) % 360.0 - 180.0
+            cells.add(encode(cell_lat, cell_lng, precision))
+    return sorted(cells)
@@ -1,11 +1,13 @@
 # Import models
 from app.models.users import User
-from app.models.clinics import Clinic, ClinicService
+from app.models.clinics import Clinic, ClinicService, ClinicOpeningHours
 from app.models.patients import Patient
-from app.models.appointments import Appointment
+from app.models.appointments import Appointment, AppointmentSlot
 from app.models.products import Product, Order, OrderItem
 from app.models.prescriptions import Prescription, Medication
 from app.models.rewards import RewardPoint, RewardCard, PartnerShop, PartnerShopCategory
+from app.models.revocations import TokenRevocation
+from app.models.bootstrap import BootstrapMarker
 
 # Function to create initial data
 def create_initial_data():
@@ -1,18 +1,26 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, event, func
 from sqlalchemy.orm import relationship
+from datetime import datetime
 import uuid
 
 from app.database import Base
+from app.models.types import CoercedDate, CoercedTime, to_date, to_time
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Calendar views read one clinic's or patient's appointments in a time range
+        Index("ix_appointments_clinic_id_start_at", "clinic_id", "start_at"),
+        Index("ix_appointments_patient_id_start_at", "patient_id", "start_at"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    patient_id = Column(String, ForeignKey("patients.id"))
-    clinic_id = Column(String, ForeignKey("clinics.id"))
+    patient_id = Column(String, ForeignKey("patients.id"), index=True)
+    clinic_id = Column(String, ForeignKey("clinics.id"), index=True)
     service_id = Column(String, ForeignKey("clinic_services.id"))
-    date = Column(String)  # ISO format date string
-    time = Column(String)  # Time string in 24h format (HH:MM)
+    date = Column(CoercedDate)
+    time = Column(CoercedTime)
+    start_at = Column(DateTime)  # date + time, the clinic's wall-clock time; set from them on every write
     status = Column(String, default="pending")  # pending, confirmed, cancelled, completed
     notes = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -21,4 +29,22 @@ class Appointment(Base):
     # Relationships
     patient = relationship("Patient", back_populates="appointments")
     clinic = relationship("Clinic", back_populates="appointments")
-    service = relationship("ClinicService")
\ No newline at end of file
+    service = relationship("ClinicService")
+
+# Keep start_at in step with date and time on every ORM insert and update
+@event.listens_for(Appointment, "before_insert")
+@event.listens_for(Appointment, "before_update")
+def _set_start_at(mapper, connection, target):
+    day, start = to_date(target.date), to_time(target.time)
+    target.start_at = datetime.combine(day, start) if day is not None and start is not None else None
+
+# One row per SLOT_MINUTES block an active appointment occupies (see
+# app/availability.py). The primary key makes overlapping bookings of a clinic
+# fail at insert time, however many requests race for the same block.
+class AppointmentSlot(Base):
+    __tablename__ = "appointment_slots"
+
+    clinic_id = Column(String, ForeignKey("clinics.id"), primary_key=True)
+    date = Column(String, primary_key=True)  # ISO format date string
+    start = Column(String, primary_key=True)  # HH:MM, 24h
+    appointment_id = Column(String, ForeignKey("appointments.id", ondelete="CASCADE"), nullable=False, index=True)
\ No newline at end of file
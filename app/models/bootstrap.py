@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime
+
+from app.database import Base
+
+class BootstrapMarker(Base):
+    __tablename__ = "bootstrap_markers"
+
+    # One row per completed one-shot step (see app/bootstrap.py)
+    name = Column(String, primary_key=True)
+    completed_at = Column(DateTime(timezone=True))
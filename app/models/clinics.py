@@ -1,16 +1,31 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Index, Integer, event, func
 from sqlalchemy.orm import relationship
+import uuid
+
+from app.geo import encode as geohash_encode
 
 from app.database import Base
+from app.models.types import CoercedBoolean, CoercedInteger, CoercedNumeric
 
 class Clinic(Base):
     __tablename__ = "clinics"
+    __table_args__ = (
+        # The clinic directory pages through clinics in (created_at, id) order
+        Index("ix_clinics_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String, ForeignKey("users.id"), primary_key=True, index=True)
     phone = Column(String, nullable=True)
     address = Column(String, nullable=True)
     location = Column(String, nullable=True)
     specialization = Column(String, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    # Derived from latitude/longitude (see app/geo.py). /nearby reads geohash cells as
+    # [cell, cell + "~") ranges, which needs byte order: PostgreSQL's default collation
+    # (e.g. en_US) sorts "~" before letters, so the column uses collation "C" there.
+    # SQLite already compares with BINARY.
+    geohash = Column(String().with_variant(String(collation="C"), "postgresql"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -20,19 +35,42 @@ class Clinic(Base):
     products = relationship("Product", back_populates="clinic")
     appointments = relationship("Appointment", back_populates="clinic")
     prescriptions = relationship("Prescription", back_populates="clinic")
+    opening_hours = relationship("ClinicOpeningHours", back_populates="clinic", cascade="all, delete-orphan")
+
+# Keep the geohash in step with the coordinates on every ORM insert and update
+@event.listens_for(Clinic, "before_insert")
+@event.listens_for(Clinic, "before_update")
+def _set_geohash(mapper, connection, target):
+    if target.latitude is None or target.longitude is None:
+        target.geohash = None
+    else:
+        target.geohash = geohash_encode(target.latitude, target.longitude)
 
 class ClinicService(Base):
     __tablename__ = "clinic_services"
 
     id = Column(String, primary_key=True, index=True)
-    clinic_id = Column(String, ForeignKey("clinics.id"))
+    clinic_id = Column(String, ForeignKey("clinics.id"), index=True)
     name = Column(String)
     description = Column(String, nullable=True)
-    price = Column(String)  # Stored as string for floating-point precision
-    duration = Column(String)  # Minutes, stored as string
-    available = Column(String, default="true")  # Boolean stored as string "true"/"false"
+    price = Column(CoercedNumeric(10, 2))
+    duration = Column(CoercedInteger)  # Minutes
+    available = Column(CoercedBoolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    clinic = relationship("Clinic", back_populates="services")
\ No newline at end of file
+    clinic = relationship("Clinic", back_populates="services")
+
+# Weekly opening hours: one row per open interval, so a day can have a lunch break
+class ClinicOpeningHours(Base):
+    __tablename__ = "clinic_opening_hours"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    clinic_id = Column(String, ForeignKey("clinics.id", ondelete="CASCADE"), nullable=False, index=True)
+    weekday = Column(Integer, nullable=False)  # 0 = Monday ... 6 = Sunday
+    opens = Column(String, nullable=False)  # HH:MM, 24h
+    closes = Column(String, nullable=False)  # HH:MM, 24h
+
+    # Relationships
+    clinic = relationship("Clinic", back_populates="opening_hours")
\ No newline at end of file
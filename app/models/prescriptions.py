@@ -3,15 +3,16 @@ from sqlalchemy.orm import relationship
 import uuid
 
 from app.database import Base
+from app.models.types import CoercedDate
 
 class Prescription(Base):
     __tablename__ = "prescriptions"
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    patient_id = Column(String, ForeignKey("patients.id"))
-    clinic_id = Column(String, ForeignKey("clinics.id"))
-    issue_date = Column(String)  # ISO format date string
-    valid_until = Column(String, nullable=True)  # ISO format date string
+    patient_id = Column(String, ForeignKey("patients.id"), index=True)
+    clinic_id = Column(String, ForeignKey("clinics.id"), index=True)
+    issue_date = Column(CoercedDate)
+    valid_until = Column(CoercedDate, nullable=True)
     notes = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -25,7 +26,7 @@ class Medication(Base):
     __tablename__ = "medications"
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    prescription_id = Column(String, ForeignKey("prescriptions.id"))
+    prescription_id = Column(String, ForeignKey("prescriptions.id"), index=True)
     name = Column(String)
     dosage = Column(String, nullable=True)
     frequency = Column(String, nullable=True)
@@ -1,18 +1,28 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, func, Boolean
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, func, Boolean
 from sqlalchemy.orm import relationship
 import uuid
 
 from app.database import Base
+from app.models.types import CoercedInteger, CoercedNumeric
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # The catalog pages in (sort column, id) order, across all products or within a category
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_name_id", "name", "id"),
+        Index("ix_products_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_products_category_price_id", "category", "price", "id"),
+        Index("ix_products_category_name_id", "category", "name", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    clinic_id = Column(String, ForeignKey("clinics.id"))
+    clinic_id = Column(String, ForeignKey("clinics.id"), index=True)
     name = Column(String)
     description = Column(String, nullable=True)
-    price = Column(String)  # Stored as string for floating-point precision
-    category = Column(String, nullable=True)
+    price = Column(CoercedNumeric(10, 2))
+    category = Column(String, nullable=True, index=True)
     in_stock = Column(Boolean, default=True)
     image_url = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -24,14 +34,19 @@ class Product(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Order history pages through one patient's orders newest first
+        Index("ix_orders_patient_id_created_at_id", "patient_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    patient_id = Column(String, ForeignKey("patients.id"))
+    patient_id = Column(String, ForeignKey("patients.id"), index=True)
     prescription_id = Column(String, ForeignKey("prescriptions.id"), nullable=True)
-    total = Column(String)  # Stored as string for floating-point precision
+    total = Column(CoercedNumeric(10, 2))
     status = Column(String, default="processing")  # processing, shipped, delivered, cancelled
-    points_earned = Column(String, default="0")  # Points earned from this order
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    points_earned = Column(CoercedInteger, default=0)  # Points earned from this order
+    clinic_name = Column(String, nullable=True)  # Prescribing clinic's name at the time of order
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
@@ -43,10 +58,14 @@ class OrderItem(Base):
     __tablename__ = "order_items"
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    order_id = Column(String, ForeignKey("orders.id"))
+    order_id = Column(String, ForeignKey("orders.id"), index=True)
     product_id = Column(String, ForeignKey("products.id"))
-    quantity = Column(String, default="1")
-    price = Column(String)  # Price at time of order
+    quantity = Column(CoercedInteger, default=1)
+    price = Column(CoercedNumeric(10, 2))  # Price at time of order
+    # Product details at the time of order, kept after the product changes or is deleted
+    product_name = Column(String, nullable=True)
+    product_category = Column(String, nullable=True)
+    clinic_id = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+
+from app.database import Base
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+
+    # Monotonic id lets workers sync incrementally (see app/revocation.py)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, index=True)
+    jti = Column(String, nullable=True, index=True)  # Set when a single token is revoked (logout, refresh)
+    reason = Column(String)  # deactivated, role_changed, logout, refreshed
+    revoked_at = Column(DateTime(timezone=True))  # Tokens for user_id issued at or before this are revoked
+    expires_at = Column(DateTime(timezone=True), index=True)  # Row can be purged after this
@@ -1,15 +1,20 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 import uuid
 
 from app.database import Base
+from app.models.types import CoercedInteger
 
 class RewardPoint(Base):
     __tablename__ = "reward_points"
+    __table_args__ = (
+        # Balances filter on patient and type together
+        Index("ix_reward_points_patient_id_type", "patient_id", "type"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     patient_id = Column(String, ForeignKey("patients.id"))
-    points = Column(String)  # Number of points earned/redeemed
+    points = Column(CoercedInteger)  # Number of points earned/redeemed
     description = Column(String)
     source_id = Column(String, nullable=True)  # ID of the source (appointment, order, etc.)
     type = Column(String, default="earned")  # earned or redeemed
@@ -0,0 +1,87 @@
+from sqlalchemy import Boolean, Date, Integer, Numeric, Time
+from sqlalchemy.types import TypeDecorator
+from datetime import date, datetime, time
+from decimal import Decimal
+import re
+
+# Money, quantity and points columns used to be strings, and callers (request
+# schemas, sample data, older scripts) still pass values like "12.99", "2" or
+# "true". These column types accept that string form on write and return real
+# Decimal / int / bool values on read, so SQL can aggregate them.
+
+TRUE_STRINGS = ("true", "1", "yes", "y", "t", "on")
+FALSE_STRINGS = ("false", "0", "no", "n", "f", "off", "")
+
+class CoercedNumeric(TypeDecorator):
+    """Numeric column that also accepts decimal strings."""
+    impl = Numeric
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return Decimal(value.strip())
+        return value
+
+class CoercedInteger(TypeDecorator):
+    """Integer column that also accepts integer strings (e.g. "2" or "2.0")."""
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return int(Decimal(value.strip()))
+        return value
+
+class CoercedBoolean(TypeDecorator):
+    """Boolean column that also accepts "true"/"false" strings."""
+    impl = Boolean
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            normalized = value.strip().lower()
+            if normalized in TRUE_STRINGS:
+                return True
+            if normalized in FALSE_STRINGS:
+                return False
+            raise ValueError(f"Not a boolean value: {value!r}")
+        return value
+
+# Dates and times were ISO strings too ("2025-01-01", "09:00"), and are now
+# Date and Time columns. They accept the string form the same way.
+
+TIME_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?$")
+
+# A date from a date, datetime or ISO "YYYY-MM-DD" string
+def to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date) or value is None:
+        return value
+    return date.fromisoformat(str(value).strip())
+
+# A time from a time or an "HH:MM" / "HH:MM:SS" string
+def to_time(value):
+    if isinstance(value, time) or value is None:
+        return value
+    match = TIME_PATTERN.match(str(value).strip())
+    if not match:
+        raise ValueError(f"Not a time value: {value!r}")
+    hour, minute, second = match.groups()
+    return time(int(hour), int(minute), int(second or 0))
+
+class CoercedDate(TypeDecorator):
+    """Date column that also accepts ISO date strings."""
+    impl = Date
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return to_date(value)
+
+class CoercedTime(TypeDecorator):
+    """Time column that also accepts "HH:MM" strings."""
+    impl = Time
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return to_time(value)
@@ -0,0 +1,133 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are ordered by a timestamp column and the primary key. The cursor
+handed to clients encodes the (timestamp, id) of the last row of a page, and
+the next page starts strictly after it (or before it, for newest-first
+pages). Each page is one index range scan no
+matter how deep the client pages, and rows inserted meanwhile never shift
+later pages, which OFFSET cannot offer.
+
+List endpoints keep returning a plain JSON array. The next page is advertised
+in the X-Next-Cursor header and as a Link: rel="next" URL; neither is sent
+on the last page. Ranked search results, whose order is not a column, page
+by offset and only send the Link header.
+
+SQLite stores DateTime columns as text, and rows written by the server
+default ("2026-01-01 09:00:00") and from Python ("2026-01-01 09:00:00.000000")
+use different formats. A datetime bound back into the query would not equal
+the stored text of its own row, and ties would be skipped, so on SQLite the
+timestamp is read and compared as its stored text.
+
+Paged listings can also advertise a total in X-Total-Count. It is an
+estimate: CountEstimates counts each filter combination at most once every
+COUNT_CACHE_SECONDS, so following pages never run COUNT(*).
+"""
+from datetime import datetime
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import String, tuple_, type_coerce
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+
+DEFAULT_PAGE_SIZE = int(os.environ.get("DEFAULT_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", "100"))
+# Offset-paged results stop here; deeper pages are not worth ranking every match for
+MAX_OFFSET = int(os.environ.get("MAX_OFFSET", "1000"))
+# How long a total-count estimate is reused before it is counted again
+COUNT_CACHE_SECONDS = int(os.environ.get("COUNT_CACHE_SECONDS", "60"))
+COUNT_CACHE_ENTRIES = int(os.environ.get("COUNT_CACHE_ENTRIES", "1024"))
+
+
+# The timestamp expression to select, order and compare on for a dialect
+def timestamp_key(column, dialect_name: str):
+    if dialect_name == "sqlite":
+        return type_coerce(column, String)
+    return column
+
+
+# Opaque cursor for the row a page ended on
+def encode_cursor(timestamp, row_id: str) -> str:
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    elif not isinstance(timestamp, str):
+        timestamp = str(timestamp)
+    payload = json.dumps([timestamp, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+# (timestamp, id) from a cursor; malformed cursors are a client error.
+# Pages ordered by another column pass `parse` to read its value back.
+def decode_cursor(cursor: str, dialect_name: str, parse=None):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(payload)
+        if not isinstance(timestamp, str) or not isinstance(row_id, str):
+            raise ValueError("cursor values must be strings")
+        if parse is not None:
+            timestamp = parse(timestamp)
+        elif dialect_name != "sqlite":
+            timestamp = datetime.fromisoformat(timestamp)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return timestamp, row_id
+
+
+# Filter for rows strictly after the cursor in (timestamp, id) order
+def after_cursor(timestamp_column, id_column, cursor_values):
+    return tuple_(timestamp_column, id_column) > tuple_(*cursor_values)
+
+
+# Filter for rows strictly before the cursor, for pages in descending order
+def before_cursor(timestamp_column, id_column, cursor_values):
+    return tuple_(timestamp_column, id_column) < tuple_(*cursor_values)
+
+
+# Advertise the next page, if any, in the response headers
+def set_next_cursor(request: Request, response: Response, cursor: str):
+    if cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = cursor
+    set_next_link(request, response, cursor=cursor)
+
+
+# Link to the next page: the current URL with params replaced
+def set_next_link(request: Request, response: Response, **params):
+    response.headers["Link"] = f'<{request.url.include_query_params(**params)}>; rel="next"'
+
+
+# Total row counts per filter combination, each reused for COUNT_CACHE_SECONDS
+class CountEstimates:
+    def __init__(self, ttl: float = COUNT_CACHE_SECONDS, max_entries: int = COUNT_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    # The cached count for key, running count() when it is missing or stale
+    def get(self, key, count) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get(key)
+        if cached and now - cached[1] < self.ttl:
+            return cached[0]
+        total = count()
+        with self._lock:
+            self._counts.pop(key, None)
+            self._counts[key] = (total, now)
+            # Drop the oldest entries once there are too many filter combinations
+            while len(self._counts) > self.max_entries:
+                self._counts.pop(next(iter(self._counts)))
+        return total
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+# Advertise the (estimated) total number of matching rows
+def set_total_count(response: Response, total: int):
+    response.headers["X-Total-Count"] = str(total)
@@ -0,0 +1,99 @@
+"""
+In-process cache of authenticated principals.
+
+get_current_user resolves the JWT subject to a User row on every
+authenticated request. This module keeps a bounded, TTL-limited LRU of the
+user columns the routes actually read so that lookup is served from memory.
+Entries are invalidated explicitly whenever a user row changes; the TTL
+bounds staleness across worker processes, which do not share this cache.
+"""
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import os
+import threading
+import time
+
+from app.models.users import User
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.environ.get("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+# Columns copied out of the User row; routes only read these from current_user
+PRINCIPAL_FIELDS = ("id", "email", "name", "type", "is_active")
+
+
+class PrincipalCache:
+    """Thread-safe LRU mapping user id -> user column snapshot, with a TTL."""
+
+    def __init__(self, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS, max_size: int = PRINCIPAL_CACHE_MAX_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str):
+        """Return a detached User for user_id, or None on a miss or expired entry."""
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Hand out a fresh transient instance so callers never share state
+        return User(**values)
+
+    def put(self, user: User):
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+        values = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Process-wide cache used by app.auth.get_current_user
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id: str):
+    """Drop the cached principal for user_id so the next request re-reads the row."""
+    principal_cache.invalidate(user_id)
+
+
+# Any ORM flush that updates a User row (e.g. an is_active change) invalidates
+# its cached principal once the transaction commits.
+@event.listens_for(User, "after_update")
+def _track_updated_user(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("updated_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_updated_users(session):
+    for user_id in session.info.pop("updated_user_ids", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_updated_users(session):
+    session.info.pop("updated_user_ids", None)
@@ -0,0 +1,114 @@
+"""
+Per-request SQL statement counting.
+
+Every statement executed through any engine is counted, together with its
+time on the database, against the request that issued it. The request is
+tracked with a context variable, which FastAPI's threadpool copies into the
+worker thread running a sync route, so the counts include route, dependency
+and auth queries. QueryStatsMiddleware reports them as the X-DB-Queries and
+X-DB-Time-ms response headers.
+
+For tests, query_budget() counts statements across all threads and fails
+when a block exceeds its budget, so an N+1 regression breaks the build.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import os
+import threading
+import time
+
+# Set SQL_STATS_HEADERS=false to stop adding the headers to responses
+SQL_STATS_HEADERS = os.environ.get("SQL_STATS_HEADERS", "true").lower() in ("1", "true", "yes")
+
+
+class QueryStats:
+    """Statement count and total database time for one request."""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_current_stats: ContextVar = ContextVar("query_stats", default=None)
+
+
+def current_query_stats():
+    """Stats of the request being handled, or None outside a request."""
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None or context is None:
+        return
+    stats.queries += 1
+    stats.seconds += time.perf_counter() - context._query_stats_start
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that reports a request's SQL statement count and time in headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_STATS_HEADERS:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.queries).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.seconds * 1000:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """Count statements run on any engine in the block; fail if there are more than max_queries.
+
+        with query_budget(3) as statements:
+            client.get("/api/products/all")
+
+    The yielded list holds the statements, for the failure message or closer checks.
+    """
+    statements = []
+    lock = threading.Lock()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        with lock:
+            statements.append(statement)
+
+    event.listen(Engine, "after_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "after_cursor_execute", count)
+    if len(statements) > max_queries:
+        listing = "\n".join(f"  {statement}" for statement in statements)
+        raise QueryBudgetExceeded(f"{len(statements)} queries, budget {max_queries}:\n{listing}")
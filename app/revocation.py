@@ -0,0 +1,198 @@
+"""
+Token revocation for claim-based authentication.
+
+Access tokens carry the caller's role and active state, so get_current_user no
+longer reads the users table. Deactivating a user, changing their role or
+logging out writes a row to token_revocations instead. Each worker keeps a
+Bloom filter of revoked user ids and token ids, so the per-request check is
+O(1) in memory. Only a filter hit (a real revocation or a rare false
+positive) is confirmed against the table.
+
+Workers rebuild the filter from the table at startup and pull newer rows at
+most every REVOCATION_SYNC_SECONDS. A revocation made in one worker reaches
+the others within that interval.
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, inspect, insert, or_
+from sqlalchemy.orm import Session
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
+from app.models.users import User
+from app.models.revocations import TokenRevocation
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_FILTER_CAPACITY = int(os.environ.get("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_FILTER_ERROR_RATE = float(os.environ.get("REVOCATION_FILTER_ERROR_RATE", "0.001"))
+REVOCATION_SYNC_SECONDS = float(os.environ.get("REVOCATION_SYNC_SECONDS", "5"))
+# Rows committed slightly out of id order are picked up by re-reading this many ids
+REVOCATION_SYNC_OVERLAP = 100
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def _user_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def _jti_key(jti: str) -> str:
+    return f"jti:{jti}"
+
+
+class RevocationFilter:
+    """Per-process Bloom filter mirroring the token_revocations table."""
+
+    def __init__(self, capacity: int = REVOCATION_FILTER_CAPACITY, error_rate: float = REVOCATION_FILTER_ERROR_RATE,
+                 sync_seconds: float = REVOCATION_SYNC_SECONDS):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_id = 0
+        self._last_sync = None
+        self._lock = threading.Lock()
+
+    def _add_row(self, row):
+        if row.jti:
+            self._bloom.add(_jti_key(row.jti))
+        else:
+            self._bloom.add(_user_key(row.user_id))
+
+    def rebuild(self, db: Session):
+        """Purge expired rows and reload the filter from the table."""
+        now = datetime.now(timezone.utc)
+        db.query(TokenRevocation).filter(TokenRevocation.expires_at < now).delete(synchronize_session=False)
+        db.commit()
+        rows = db.query(TokenRevocation).all()
+        with self._lock:
+            self._bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+            for row in rows:
+                self._add_row(row)
+            self._last_id = max((row.id for row in rows), default=0)
+            self._last_sync = time.monotonic()
+        logger.info(f"Token revocation filter rebuilt with {len(rows)} entries")
+
+    def sync(self, db: Session, force: bool = False):
+        """Pull rows written by other workers since the last sync."""
+        if self._last_sync is None:
+            self.rebuild(db)
+            return
+        if not force and time.monotonic() - self._last_sync < self.sync_seconds:
+            return
+        rows = db.query(TokenRevocation).filter(
+            TokenRevocation.id > self._last_id - REVOCATION_SYNC_OVERLAP
+        ).all()
+        with self._lock:
+            for row in rows:
+                self._add_row(row)
+                self._last_id = max(self._last_id, row.id)
+            self._last_sync = time.monotonic()
+
+    def clear(self):
+        """Forget all entries; the next check rebuilds from the table."""
+        with self._lock:
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+            self._last_id = 0
+            self._last_sync = None
+
+    def note(self, user_id: str = None, jti: str = None):
+        """Record a revocation made by this worker without waiting for a sync."""
+        with self._lock:
+            if jti:
+                self._bloom.add(_jti_key(jti))
+            elif user_id:
+                self._bloom.add(_user_key(user_id))
+
+    def needs_database(self, user_id: str, jti: str = None) -> bool:
+        """True if a check for this token must touch the table (sync due or filter hit)."""
+        if self._last_sync is None or time.monotonic() - self._last_sync >= self.sync_seconds:
+            return True
+        return _user_key(user_id) in self._bloom or (jti is not None and _jti_key(jti) in self._bloom)
+
+    def is_revoked(self, db: Session, user_id: str, issued_at: datetime = None, jti: str = None) -> bool:
+        """True if the token (or every token of user_id issued by issued_at) is revoked."""
+        self.sync(db)
+        user_hit = _user_key(user_id) in self._bloom
+        jti_hit = jti is not None and _jti_key(jti) in self._bloom
+        if not user_hit and not jti_hit:
+            return False
+        # Filter hit: confirm against the table (rules out false positives and
+        # user revocations that predate this token)
+        conditions = []
+        if user_hit:
+            user_condition = (TokenRevocation.user_id == user_id) & (TokenRevocation.jti.is_(None))
+            if issued_at is not None:
+                user_condition = user_condition & (TokenRevocation.revoked_at >= issued_at)
+            conditions.append(user_condition)
+        if jti_hit:
+            conditions.append(TokenRevocation.jti == jti)
+        return db.query(TokenRevocation.id).filter(or_(*conditions)).first() is not None
+
+
+# Process-wide filter used by app.auth.get_current_user
+revocation_filter = RevocationFilter()
+
+
+def revoke_token(db: Session, user_id: str, jti: str, expires_at: datetime, reason: str = "logout"):
+    """Revoke a single token (by jti) until it would have expired anyway."""
+    db.add(TokenRevocation(
+        user_id=user_id,
+        jti=jti,
+        reason=reason,
+        revoked_at=datetime.now(timezone.utc),
+        expires_at=expires_at
+    ))
+    revocation_filter.note(jti=jti)
+
+
+def _user_revocation_lifetime() -> timedelta:
+    # Imported lazily: app.auth imports this module
+    from app.auth import ACCESS_TOKEN_EXPIRE_MINUTES
+    return timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+# Deactivating a user or changing their role invalidates the claims in every
+# access token already issued to them. The row is written in the same
+# transaction as the user update.
+@event.listens_for(User, "after_update")
+def _revoke_on_user_change(mapper, connection, target):
+    state = inspect(target)
+    deactivated = state.attrs.is_active.history.has_changes() and not target.is_active
+    role_changed = state.attrs.type.history.has_changes()
+    if not (deactivated or role_changed):
+        return
+    now = datetime.now(timezone.utc)
+    connection.execute(insert(TokenRevocation).values(
+        user_id=target.id,
+        jti=None,
+        reason="deactivated" if deactivated else "role_changed",
+        revoked_at=now,
+        expires_at=now + _user_revocation_lifetime()
+    ))
+    revocation_filter.note(user_id=target.id)
@@ -1,42 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+import os
 import uuid
 import logging # Added logging
 
-from app.database import get_db
+from app.availability import (
+    SLOT_TAKEN,
+    booked_intervals,
+    check_bookable,
+    claim_slots,
+    format_minutes,
+    free_slots,
+    minutes_of,
+    parse_date,
+    parse_minutes,
+    release_slots,
+    service_span,
+    time_of,
+    weekly_hours
+)
+from app.database import get_db, get_read_db
 from app.models.users import User
-from app.models.appointments import Appointment
+from app.models.appointments import Appointment, AppointmentSlot
 from app.models.clinics import Clinic, ClinicService # Clinic already imported, User for clinic.user
 from app.models.patients import Patient # Patient for patient.user
 from app.models.rewards import RewardPoint
 from app.schemas.appointment import (
     AppointmentCreate,
     AppointmentResponse,
+    AppointmentBatchUpdate,
     AppointmentUpdate, # Renamed from AppointmentUpdateStatus for consistency if schema changes
+    AvailabilityResponse,
     # AppointmentStats # Not used in current refactoring scope but keep if used elsewhere
 )
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_current_admin
 
 router = APIRouter()
 logger = logging.getLogger(__name__) # Added logger
 
-# Helper function to check if user is admin (if not already available globally)
-# Assuming this helper is defined or imported appropriately.
-# For this refactor, let's define it if not present from a shared module.
-def is_admin(user: User):
-    admin_types = ['admin', 'administrator', 'system']
-    return user.type and user.type.lower() in admin_types
+# Largest number of appointments PUT /batch accepts
+MAX_BATCH_APPOINTMENTS = int(os.environ.get("MAX_BATCH_APPOINTMENTS", "200"))
+# Reward points per dollar of a confirmed appointment's service price
+SERVICE_POINTS_PER_DOLLAR = 5
 
 
 # Get all appointments (admin only)
 @router.get("/all", response_model=List[AppointmentResponse])
-async def get_all_appointments(
+def get_all_appointments(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_admin)
 ):
-    if not is_admin(current_user):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this resource")
 
     appointments = db.query(Appointment).options(
         joinedload(Appointment.patient).joinedload(Patient.user), # patient.user.name
@@ -51,8 +68,8 @@ async def get_all_appointments(
             patient_id=appt.patient_id,
             clinic_id=appt.clinic_id,
             service_id=appt.service_id,
-            date=str(appt.date), # Ensure string format if model stores as Date object
-            time=str(appt.time), # Ensure string format if model stores as Time object
+            date=appt.date,
+            time=appt.time,
             notes=appt.notes,
             status=appt.status,
             created_at=appt.created_at,
@@ -63,9 +80,49 @@ async def get_all_appointments(
         ))
     return response
 
-# Book an appointment
+# Free start times for a clinic service on a day, from the clinic's opening
+# hours and its existing appointments (see app/availability.py)
+@router.get("/availability", response_model=AvailabilityResponse)
+def get_availability(
+    clinic_id: str,
+    service_id: str,
+    date: str = Query(..., description="YYYY-MM-DD"),
+    db: Session = Depends(get_read_db)
+):
+    day = parse_date(date)
+    service = db.query(ClinicService).filter(
+        ClinicService.id == service_id,
+        ClinicService.clinic_id == clinic_id
+    ).first()
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    span = service_span(service.duration)
+    slots = []
+    if service.available:
+        opening = weekly_hours(db, clinic_id).get(day.weekday(), [])
+        if opening:
+            slots = free_slots(opening, booked_intervals(db, clinic_id, day), span, day)
+    return AvailabilityResponse(
+        clinic_id=clinic_id,
+        service_id=service_id,
+        date=day.isoformat(),
+        duration=span,
+        slots=[format_minutes(start) for start in slots]
+    )
+
+# Commit an appointment's slot claims; losing a race for a slot is a 409
+def _commit_claims(db: Session):
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_TAKEN)
+
+# Book an appointment. The slot must be free within the clinic's opening
+# hours; its slot claims make concurrent bookings of overlapping times fail.
 @router.post("/", response_model=AppointmentResponse)
-async def create_appointment(
+def create_appointment(
     appointment_data: AppointmentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -75,7 +132,7 @@ async def create_appointment(
         raise HTTPException(status_code=403, detail="Only patients can book appointments")
     
     # Check if clinic exists
-    clinic = db.query(Clinic).filter(Clinic.id == appointment_data.clinic_id).first()
+    clinic = db.query(Clinic).options(joinedload(Clinic.user)).filter(Clinic.id == appointment_data.clinic_id).first()
     if not clinic:
         raise HTTPException(status_code=404, detail="Clinic not found")
     
@@ -86,6 +143,13 @@ async def create_appointment(
     ).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
+    if not service.available:
+        raise HTTPException(status_code=400, detail="Service is not available for booking")
+    
+    # Check the slot is open and free
+    day = parse_date(appointment_data.date)
+    start = parse_minutes(appointment_data.time)
+    check_bookable(db, service, day, start)
     
     # Create appointment
     appointment = Appointment(
@@ -93,55 +157,50 @@ async def create_appointment(
         patient_id=current_user.id,
         clinic_id=appointment_data.clinic_id,
         service_id=appointment_data.service_id,
-        date=appointment_data.date,
-        time=appointment_data.time,
+        date=day,
+        time=time_of(start),
         notes=appointment_data.notes,
         status="pending"
     )
     
     db.add(appointment)
-    db.commit()
+    claim_slots(db, appointment, service)
+    _commit_claims(db)
     db.refresh(appointment)
     
-    # Construct AppointmentResponse
-    # Clinic name: from clinic.user.name (assuming clinic users store the clinic's public name)
-    # or clinic.name if Clinic model has its own name field.
-    # Based on previous patterns (e.g. products.py for OrderResponse.clinic_name), it's often clinic.user.name
-    # Let's assume Clinic model itself has a 'name' field for the clinic's name for now.
-    # If clinic.user.name is the source of truth, that needs to be fetched.
-    # For simplicity and consistency with AppointmentResponse schema, let's assume Clinic has a name.
-    # If User model should provide clinic name:
-    # clinic_user_for_name = db.query(User).filter(User.id == clinic.id).first()
-    # clinic_display_name = clinic_user_for_name.name if clinic_user_for_name else clinic.id # Fallback
-    
-    # Fetching user for clinic name if Clinic model doesn't have a direct name field
-    # For this refactor, we'll assume Clinic model has a 'name' field as per existing ClinicService.clinic.name usage.
-    # If clinic.user.name is needed, the query for 'clinic' needs to be options(joinedload(Clinic.user))
-    
-    # For patient_name, current_user.name is correct.
-    # For service_name, service.name is correct.
-    # For clinic_name, assuming clinic.name (if not, clinic.user.name)
-    
     return AppointmentResponse(
         id=appointment.id,
         patient_id=appointment.patient_id,
         clinic_id=appointment.clinic_id,
         service_id=appointment.service_id,
-        date=str(appointment.date),
-        time=str(appointment.time),
+        date=appointment.date,
+        time=appointment.time,
         notes=appointment.notes,
         status=appointment.status,
         created_at=appointment.created_at,
         updated_at=appointment.updated_at,
         patient_name=current_user.name, # current_user is the patient
-        clinic_name=clinic.name, # Assuming Clinic model has a name
+        clinic_name=clinic.user.name if clinic.user else None, # The clinic's public name lives on its user
         service_name=service.name
     )
 
-# Get patient appointments
+# Restrict an appointment query to [from_, to) on start_at, soonest first.
+# Times are the clinic's wall-clock times; a UTC offset in the query is ignored.
+def _in_range(query, from_: Optional[datetime], to: Optional[datetime]):
+    if from_ is not None and to is not None and from_ >= to:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    if from_ is not None:
+        query = query.filter(Appointment.start_at >= from_.replace(tzinfo=None))
+    if to is not None:
+        query = query.filter(Appointment.start_at < to.replace(tzinfo=None))
+    return query.order_by(Appointment.start_at, Appointment.id)
+
+# Get patient appointments, optionally only those starting in [from, to)
 @router.get("/patient/{patient_id}", response_model=List[AppointmentResponse])
-async def get_patient_appointments(
+def get_patient_appointments(
     patient_id: str,
+    from_: Optional[datetime] = Query(None, alias="from", description="Start of the range (YYYY-MM-DD or ISO timestamp)"),
+    to: Optional[datetime] = Query(None, description="End of the range, exclusive"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -149,7 +208,7 @@ async def get_patient_appointments(
     if current_user.id != patient_id and current_user.type != "clinic":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view these appointments")
     
-    appointments = db.query(Appointment).filter(Appointment.patient_id == patient_id).options(
+    appointments = _in_range(db.query(Appointment).filter(Appointment.patient_id == patient_id), from_, to).options(
         joinedload(Appointment.clinic).joinedload(Clinic.user), # clinic.user.name for clinic_name
         joinedload(Appointment.service)
     ).all()
@@ -167,8 +226,8 @@ async def get_patient_appointments(
             patient_id=appt.patient_id,
             clinic_id=appt.clinic_id,
             service_id=appt.service_id,
-            date=str(appt.date),
-            time=str(appt.time),
+            date=appt.date,
+            time=appt.time,
             notes=appt.notes,
             status=appt.status,
             created_at=appt.created_at,
@@ -179,10 +238,13 @@ async def get_patient_appointments(
         ))
     return response
 
-# Get clinic appointments
+# Get clinic appointments, optionally only those starting in [from, to). A
+# week view is one range scan of the (clinic_id, start_at) index.
 @router.get("/clinic/{clinic_id}", response_model=List[AppointmentResponse])
-async def get_clinic_appointments(
+def get_clinic_appointments(
     clinic_id: str,
+    from_: Optional[datetime] = Query(None, alias="from", description="Start of the range (YYYY-MM-DD or ISO timestamp)"),
+    to: Optional[datetime] = Query(None, description="End of the range, exclusive"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -190,7 +252,7 @@ async def get_clinic_appointments(
     if current_user.id != clinic_id and current_user.type != "clinic": # Only clinic itself or another clinic (if admin access for clinics is ever added)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view these appointments")
     
-    appointments = db.query(Appointment).filter(Appointment.clinic_id == clinic_id).options(
+    appointments = _in_range(db.query(Appointment).filter(Appointment.clinic_id == clinic_id), from_, to).options(
         joinedload(Appointment.patient).joinedload(Patient.user), # patient.user.name for patient_name
         joinedload(Appointment.service)
     ).all()
@@ -214,8 +276,8 @@ async def get_clinic_appointments(
             patient_id=appt.patient_id,
             clinic_id=appt.clinic_id,
             service_id=appt.service_id,
-            date=str(appt.date),
-            time=str(appt.time),
+            date=appt.date,
+            time=appt.time,
             notes=appt.notes,
             status=appt.status,
             created_at=appt.created_at,
@@ -226,9 +288,117 @@ async def get_clinic_appointments(
         ))
     return response
 
+# Response for an appointment loaded with its patient's and clinic's users and its service
+def _appointment_response(appt: Appointment) -> AppointmentResponse:
+    return AppointmentResponse(
+        id=appt.id,
+        patient_id=appt.patient_id,
+        clinic_id=appt.clinic_id,
+        service_id=appt.service_id,
+        date=appt.date,
+        time=appt.time,
+        notes=appt.notes,
+        status=appt.status,
+        created_at=appt.created_at,
+        updated_at=appt.updated_at,
+        patient_name=appt.patient.user.name if appt.patient and appt.patient.user else None,
+        clinic_name=appt.clinic.user.name if appt.clinic and appt.clinic.user else None,
+        service_name=appt.service.name if appt.service else None
+    )
+
+# Responses for appointment_ids, in that order, from one joined load
+def _load_responses(db: Session, appointment_ids: List[str]) -> List[AppointmentResponse]:
+    appointments = db.query(Appointment).filter(Appointment.id.in_(appointment_ids)).options(
+        joinedload(Appointment.patient).joinedload(Patient.user),
+        joinedload(Appointment.clinic).joinedload(Clinic.user),
+        joinedload(Appointment.service)
+    ).all()
+    by_id = {appt.id: appt for appt in appointments}
+    return [_appointment_response(by_id[appointment_id]) for appointment_id in appointment_ids]
+
+# Reward points for confirming an appointment for a service at price
+def _service_points(price) -> int:
+    return int(price * SERVICE_POINTS_PER_DOLLAR)
+
+# Move many of a clinic's appointments to one status (e.g. confirm a day's
+# list). A fixed number of statements however many ids: one to load and check
+# them, one UPDATE, one bulk insert of reward points, one joined load for the
+# response. All-or-nothing: any unknown or foreign id fails the whole batch.
+@router.put("/batch", response_model=List[AppointmentResponse])
+def update_appointment_status_batch(
+    batch: AppointmentBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if current_user.type != "clinic":
+        raise HTTPException(status_code=403, detail="Only clinics can update appointments in bulk")
+    appointment_ids = list(dict.fromkeys(batch.ids))
+    if len(appointment_ids) > MAX_BATCH_APPOINTMENTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_APPOINTMENTS} appointments per batch")
+
+    rows = db.query(
+        Appointment.id, Appointment.clinic_id, Appointment.patient_id, Appointment.status,
+        ClinicService.name.label("service_name"), ClinicService.price
+    ).outerjoin(ClinicService, ClinicService.id == Appointment.service_id).filter(
+        Appointment.id.in_(appointment_ids)
+    ).all()
+    missing = set(appointment_ids) - {row.id for row in rows}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Appointments not found: {', '.join(sorted(missing))}")
+    if any(row.clinic_id != current_user.id for row in rows):
+        raise HTTPException(status_code=403, detail="Not authorized to update these appointments")
+    # Reinstating needs the slots to be free again; that is checked one appointment at a time
+    if batch.status != "cancelled" and any(row.status == "cancelled" for row in rows):
+        raise HTTPException(status_code=400, detail="Cancelled appointments can only be reinstated one at a time")
+
+    changed = [row for row in rows if row.status != batch.status]
+    if changed:
+        # The UPDATE re-checks the status, so when two batches race for the same
+        # appointments only one changes each of them (and credits its points);
+        # RETURNING says which ones this request changed
+        still_changing = Appointment.status != batch.status
+        if batch.status != "cancelled":
+            still_changing &= Appointment.status != "cancelled"
+        changed_ids = set(db.execute(
+            update(Appointment)
+            .where(Appointment.id.in_([row.id for row in changed]), still_changing)
+            .values(status=batch.status)
+            .returning(Appointment.id),
+            execution_options={"synchronize_session": False}
+        ).scalars())
+        changed = [row for row in changed if row.id in changed_ids]
+        if batch.status == "cancelled" and changed_ids:
+            db.query(AppointmentSlot).filter(AppointmentSlot.appointment_id.in_(changed_ids)).delete(
+                synchronize_session=False
+            )
+        if batch.status == "confirmed":
+            # Only appointments newly confirmed earn points
+            rewards = []
+            for row in changed:
+                if not row.price:
+                    continue
+                try:
+                    points_earned = _service_points(row.price)
+                except (ValueError, TypeError):
+                    logger.warning(f"Could not calculate reward points for appointment {row.id} due to invalid service price: {row.price}")
+                    continue
+                rewards.append({
+                    "id": str(uuid.uuid4()),
+                    "patient_id": row.patient_id,
+                    "points": points_earned,
+                    "description": f"Appointment: {row.service_name or 'Unknown service'}",
+                    "source_id": row.id,
+                    "type": "earned"
+                })
+            if rewards:
+                db.execute(insert(RewardPoint), rewards)
+        db.commit()
+
+    return _load_responses(db, appointment_ids)
+
 # Update appointment status
 @router.put("/{appointment_id}", response_model=AppointmentResponse)
-async def update_appointment_status(
+def update_appointment_status(
     appointment_id: str,
     appointment_data: AppointmentUpdate, # Using AppointmentUpdate which now includes status
     db: Session = Depends(get_db),
@@ -251,9 +421,27 @@ async def update_appointment_status(
         raise HTTPException(status_code=403, detail="Patients can only cancel appointments")
     
     # Update appointment
-    for key, value in appointment_data.dict(exclude_unset=True).items():
+    was_cancelled = appointment.status == "cancelled"
+    update_data = appointment_data.dict(exclude_unset=True)
+    if "date" in update_data:
+        update_data["date"] = parse_date(update_data["date"])
+    if "time" in update_data:
+        update_data["time"] = time_of(parse_minutes(update_data["time"]))
+    for key, value in update_data.items():
         setattr(appointment, key, value)
     
+    # Keep the slot claims in step: cancelling frees the slots, moving or
+    # reinstating an appointment needs its new slots to be free
+    if appointment.status == "cancelled":
+        release_slots(db, appointment.id)
+    elif was_cancelled or "date" in update_data or "time" in update_data:
+        booked_service = db.query(ClinicService).filter(ClinicService.id == appointment.service_id).first()
+        if not booked_service:
+            raise HTTPException(status_code=404, detail="Service not found")
+        check_bookable(db, booked_service, appointment.date, minutes_of(appointment.time),
+                       exclude_appointment_id=appointment.id)
+        claim_slots(db, appointment, booked_service)
+    
     # If confirmed by clinic, add reward points
     if is_clinic and appointment_data.status == "confirmed":
         # Get service price
@@ -262,11 +450,11 @@ async def update_appointment_status(
         if service and service.price:
             # Add reward points (5 points per dollar for services)
             try:
-                points_earned = int(float(service.price) * 5) # Assuming 5 points per dollar
+                points_earned = _service_points(service.price)
                 reward_point = RewardPoint(
                     id=str(uuid.uuid4()),
                     patient_id=appointment.patient_id,
-                    points=str(points_earned),
+                    points=points_earned,
                     description=f"Appointment: {service.name if service else 'Unknown service'}", # Use service name
                     source_id=appointment.id, # Link to appointment
                     type="earned" # Type of reward
@@ -275,45 +463,5 @@ async def update_appointment_status(
             except (ValueError, TypeError):
                 logger.warning(f"Could not calculate reward points for appointment {appointment.id} due to invalid service price: {service.price}")
     
-    db.commit()
-    db.refresh(appointment)
-    
-    # Re-fetch related entities for the response after potential updates
-    # Use joinedload for efficiency if these were not already loaded or might have changed
-    # However, for constructing response, a simple query is also fine if IDs are known.
-    
-    # To ensure accurate names, especially if they could change (though not typical for clinic/service names here)
-    # or if not loaded initially with appointment object.
-    # The appointment object itself is refreshed. Patient/Clinic/Service are static context here.
-    
-    # For response construction, it's better to query them to ensure data consistency,
-    # especially if a more complex setup allowed clinic/service details to change.
-    # Or, ensure they are part of the 'appointment' object via relationships after refresh.
-    # Simplified: load them again or ensure eager loading on 'appointment' if it's re-queried.
-    # For now, let's assume the 'appointment' object has refreshed relationships or we fetch them.
-    
-    # To populate AppointmentResponse, we need patient_name, clinic_name, service_name.
-    # These are best fetched using the IDs from the 'appointment' object.
-    
-    patient_user = db.query(User).filter(User.id == appointment.patient_id).first()
-    # Clinic name from Clinic.user.name or Clinic.name
-    # Assuming Clinic model has a 'name' attribute directly or via 'user' relationship
-    # For consistency with /all, let's assume clinic.user.name
-    clinic_obj = db.query(Clinic).options(joinedload(Clinic.user)).filter(Clinic.id == appointment.clinic_id).first()
-    service_obj = db.query(ClinicService).filter(ClinicService.id == appointment.service_id).first()
-
-    return AppointmentResponse(
-        id=appointment.id,
-        patient_id=appointment.patient_id,
-        clinic_id=appointment.clinic_id,
-        service_id=appointment.service_id,
-        date=str(appointment.date),
-        time=str(appointment.time),
-        notes=appointment.notes,
-        status=appointment.status, # This is the updated status
-        created_at=appointment.created_at,
-        updated_at=appointment.updated_at,
-        patient_name=patient_user.name if patient_user else None,
-        clinic_name=clinic_obj.user.name if clinic_obj and clinic_obj.user else (clinic_obj.name if clinic_obj else None), # Prioritize user.name if exists
-        service_name=service_obj.name if service_obj else None
-    )
\ No newline at end of file
+    _commit_claims(db)
+    return _load_responses(db, [appointment.id])[0]
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
+from typing import Optional
 import uuid
 
 from app.database import get_db
@@ -9,26 +11,23 @@ from app.models.users import User
 from app.models.clinics import Clinic
 from app.models.patients import Patient
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.token import Token, UserInfo # Import UserInfo
+from app.schemas.token import Token, UserInfo, RefreshRequest, LogoutRequest # Import UserInfo
 from app.auth import (
-    authenticate_user,
-    create_access_token,
-    get_password_hash,
+    authenticate_user_async,
+    create_user_tokens,
+    decode_token,
+    get_password_hash_async,
     get_current_active_user,
+    oauth2_scheme,
 )
+from app.revocation import revocation_filter, revoke_token
+from app.search import index_clinics
 
 router = APIRouter()
 
-@router.post("/register", response_model=Token)
-async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
-    # Check if user with this email already exists
-    db_user = db.query(User).filter(User.email == user_data.email).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create new user
+# Create the user and its type-specific profile (runs in the threadpool)
+def _create_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
     user_id = str(uuid.uuid4())
-    hashed_password = get_password_hash(user_data.password)
     
     db_user = User(
         id=user_id,
@@ -47,10 +46,14 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             phone=user_data.phone,
             address=user_data.address,
             location=user_data.location,
-            specialization=user_data.specialization
+            specialization=user_data.specialization,
+            latitude=user_data.latitude,
+            longitude=user_data.longitude
         )
         db.add(db_clinic)
-    elif user_data.type == "patient":
+        db.flush()
+        index_clinics(db, [user_id])
+    else:
         db_patient = Patient(
             id=user_id,
             phone=user_data.phone,
@@ -58,14 +61,29 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             date_of_birth=user_data.date_of_birth
         )
         db.add(db_patient)
-    else:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Invalid user type")
     
     db.commit()
+    db.refresh(db_user)
+    return db_user
+
+# Registration stays async so hashing can await the bounded hash pool;
+# its database work is handed to the threadpool instead of blocking the loop.
+@router.post("/register", response_model=Token)
+async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+    # Check if user with this email already exists
+    db_user = await run_in_threadpool(lambda: db.query(User).filter(User.email == user_data.email).first())
+    if db_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Create access token
-    access_token = create_access_token(data={"sub": user_id})
+    if user_data.type not in ("clinic", "patient"):
+        raise HTTPException(status_code=400, detail="Invalid user type")
+    
+    # Create new user
+    hashed_password = await get_password_hash_async(user_data.password)
+    db_user = await run_in_threadpool(_create_user, db, user_data, hashed_password)
+    
+    # Create access and refresh tokens
+    tokens = create_user_tokens(db_user)
     
     # Construct UserInfo for the response
     user_info = UserInfo(
@@ -75,14 +93,14 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         type=db_user.type
     )
     
-    return {"access_token": access_token, "token_type": "bearer", "user": user_info}
+    return {**tokens, "user": user_info}
 
 @router.post("/token", response_model=Token)  # Keep the old endpoint for backwards compatibility
 async def login_for_access_token_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -90,12 +108,11 @@ async def login_for_access_token_form(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(data={"sub": user.id})
+    tokens = create_user_tokens(user)
     
     # Return with user data for frontend
     return {
-        "access_token": access_token, 
-        "token_type": "bearer",
+        **tokens,
         "user": {
             "id": user.id,
             "name": user.name,
@@ -114,7 +131,7 @@ async def login_json(
     login_data: LoginData,
     db: Session = Depends(get_db)
 ):
-    user = authenticate_user(db, login_data.email, login_data.password)
+    user = await authenticate_user_async(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -122,12 +139,11 @@ async def login_json(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(data={"sub": user.id})
+    tokens = create_user_tokens(user)
     
     # Return with user data for frontend
     return {
-        "access_token": access_token, 
-        "token_type": "bearer",
+        **tokens,
         "user": {
             "id": user.id,
             "name": user.name,
@@ -136,6 +152,61 @@ async def login_json(
         }
     }
 
+# Exchange a refresh token for a new access token and a rotated refresh token;
+# the presented refresh token is revoked, so it cannot be replayed
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(
+    refresh_data: RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    token_data = decode_token(refresh_data.refresh_token, token_use="refresh")
+    
+    # Re-read the user so role and active-state claims are current
+    user = db.query(User).filter(User.id == token_data.user_id).first()
+    revoked = revocation_filter.is_revoked(db, token_data.user_id, jti=token_data.jti)
+    if not user or not user.is_active or revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Refresh tokens are single use: retire this one before issuing its replacement
+    if token_data.jti:
+        revoke_token(db, token_data.user_id, token_data.jti, token_data.expires_at, reason="refreshed")
+        db.commit()
+    
+    tokens = create_user_tokens(user)
+    
+    return {
+        **tokens,
+        "user": {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "type": user.type
+        }
+    }
+
+# Log out: revoke the presented access token and, if given, the refresh token
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    token_data = decode_token(token)
+    if token_data.jti:
+        revoke_token(db, token_data.user_id, token_data.jti, token_data.expires_at)
+    
+    if logout_data and logout_data.refresh_token:
+        refresh_data = decode_token(logout_data.refresh_token, token_use="refresh")
+        if refresh_data.user_id == token_data.user_id and refresh_data.jti:
+            revoke_token(db, refresh_data.user_id, refresh_data.jti, refresh_data.expires_at)
+    
+    db.commit()
+    return None
+
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: User = Depends(get_current_active_user)):
     return current_user
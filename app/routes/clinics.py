@@ -1,133 +1,182 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict
+from sqlalchemy import and_, func, or_
+from typing import List, Dict, Optional
+import os
 import uuid
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.users import User
-from app.models.clinics import Clinic, ClinicService
+from app.models.clinics import Clinic, ClinicOpeningHours, ClinicService
 from app.schemas.clinic import (
     ClinicResponse,
     ClinicUpdate,
     ClinicServiceCreate,
     ClinicServiceResponse,
-    ClinicServiceUpdate
+    ClinicServiceUpdate,
+    OpeningHours
 )
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_current_admin, is_admin
+from app.availability import format_minutes, parse_minutes, weekly_hours
+from app.featured import FEATURED_MAX_AGE_SECONDS, featured_clinics
+from app.geo import bounding_box, covering_cells, haversine_km
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_OFFSET,
+    MAX_PAGE_SIZE,
+    after_cursor,
+    decode_cursor,
+    encode_cursor,
+    set_next_cursor,
+    set_next_link,
+    timestamp_key
+)
+from app.principal_cache import invalidate_principal
+from app.search import index_clinics, search_clinics
 
 router = APIRouter()
 
-# Helper function to check if user is admin
-def is_admin(user):
-    admin_types = ['admin', 'administrator', 'system']
-    return user.type and user.type.lower() in [t.lower() for t in admin_types]
+# Largest radius /nearby accepts, in kilometres
+NEARBY_MAX_RADIUS_KM = float(os.environ.get("NEARBY_MAX_RADIUS_KM", "100"))
+
+# Columns behind directory_entry(): the clinic plus its user's name, email and active flag
+DIRECTORY_COLUMNS = (
+    Clinic.id, User.name, User.email, Clinic.phone, Clinic.address, Clinic.location, Clinic.specialization,
+    Clinic.latitude, Clinic.longitude, User.is_active, Clinic.created_at, Clinic.updated_at
+)
 
 # Get clinics count for admin dashboard
 @router.get("/count", response_model=Dict[str, int])
-async def get_clinics_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+def get_clinics_count(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
     
     count = db.query(func.count(Clinic.id)).scalar()
     return {"count": count}
 
-# Get all clinics
+# Get all clinics, oldest first, with their user's name, email and active flag.
+# One joined query per page. Without limit or cursor the whole directory is
+# returned as before; with them, pages are keyset-paginated on (created_at, id)
+# and the next page's cursor is sent in the X-Next-Cursor and Link headers.
 @router.get("/all") # Consider adding response_model=List[ClinicResponse] or a custom schema
-async def get_all_clinics(db: Session = Depends(get_db)):
-    clinics = db.query(Clinic).all()
-    response_data = []
-    
-    for clinic in clinics:
-        user = db.query(User).filter(User.id == clinic.id).first()
-        if user: # Only include clinic if its associated user exists
-            clinic_data = {
-                "id": clinic.id,
-                "name": user.name, # Name from User model
-                "email": user.email, # Email from User model
-                "phone": clinic.phone,
-                "address": clinic.address,
-                "location": clinic.location,
-                "specialization": clinic.specialization,
-                "is_active": user.is_active, # is_active from User model
-                "created_at": clinic.created_at.isoformat() if clinic.created_at else None,
-                "updated_at": clinic.updated_at.isoformat() if clinic.updated_at else None,
-                # Assuming ClinicResponse schema expects a nested user object for user details
-                # or the main fields are directly part of ClinicResponse.
-                # The current ClinicResponse seems to expect user details flattened.
-                # For now, creating a structure that can be mapped by Pydantic if it expects flattened user fields.
-                # If ClinicResponse expects a nested user, this needs adjustment.
-                # "user": {
-                #     "id": user.id,
-                #     "name": user.name,
-                #     "email": user.email,
-                #     "is_active": user.is_active
-                # }
-                # The provided ClinicResponse schema has name, email directly.
-                # It also has `services: List[ClinicServiceResponse]` which this route is not populating.
-                # For simplicity, this fix focuses on removing sample data and direct DB query.
-                # The original sample data had a nested user, but ClinicResponse doesn't.
-            }
-            # This structure is closer to what ClinicResponse seems to imply
-            # by having 'name' and 'email' at the top level.
-            # Let's create a dictionary matching ClinicResponse fields
-            # This will require ClinicResponse to be able to handle these fields.
-            # The provided ClinicResponse in schemas/clinic.py is:
-            # class ClinicResponse(ClinicBase):
-            # id: str
-            # name: str  <-- from User
-            # email: str <-- from User
-            # services: List[ClinicServiceResponse] = []
-            # created_at: datetime
-            # updated_at: Optional[datetime] = None
-            # class Config: orm_mode = True
-            # So, the constructed dict should be usable by ClinicResponse
-            
-            response_data.append({
-                "id": clinic.id,
-                "name": user.name,
-                "email": user.email,
-                "phone": clinic.phone,
-                "address": clinic.address,
-                "location": clinic.location,
-                "specialization": clinic.specialization,
-                "is_active": user.is_active,
-                "created_at": clinic.created_at, # Pydantic will format it
-                "updated_at": clinic.updated_at, # Pydantic will format it
-                "services": [] # Services are not loaded here, default to empty list
-            })
-            
-    return response_data
+def get_all_clinics(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    location: Optional[str] = None,
+    specialization: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    dialect_name = db.get_bind().dialect.name
+    created_key = timestamp_key(Clinic.created_at, dialect_name)
+    query = db.query(
+        *DIRECTORY_COLUMNS, created_key.label("created_key")
+    ).join(User, User.id == Clinic.id)  # Only clinics whose user exists
+    if location:
+        query = query.filter(Clinic.location == location)
+    if specialization:
+        query = query.filter(Clinic.specialization == specialization)
+    if cursor:
+        query = query.filter(after_cursor(created_key, Clinic.id, decode_cursor(cursor, dialect_name)))
+        limit = limit or DEFAULT_PAGE_SIZE
+    query = query.order_by(created_key, Clinic.id)
+    # One extra row tells whether another page follows
+    rows = query.limit(limit + 1).all() if limit else query.all()
+
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        set_next_cursor(request, response, encode_cursor(rows[-1].created_key, rows[-1].id))
+
+    return [directory_entry(row) for row in rows]
+
+# Search active clinics by name, specialization, location and address, best match first.
+# Every word must match (as a prefix). Pages are `limit` long; the Link header
+# points at the next one.
+@router.get("/search")
+def search_clinic_directory(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    db: Session = Depends(get_read_db)
+):
+    rows = search_clinics(db, q, limit + 1, offset)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        set_next_link(request, response, offset=offset + limit)
+    return [directory_entry(row) for row in rows]
+
+# Active clinics within radius km of (lat, lng), nearest first, with their distance.
+# Only clinics in the geohash cells around the point are read (see app/geo.py);
+# those are ranked by exact haversine distance.
+@router.get("/nearby")
+def get_nearby_clinics(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(5.0, gt=0, le=NEARBY_MAX_RADIUS_KM),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    cells = covering_cells(lat, lng, radius)
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+    query = db.query(*DIRECTORY_COLUMNS).join(User, User.id == Clinic.id).filter(
+        User.is_active.is_(True),
+        Clinic.latitude.between(min_lat, max_lat)
+    )
+    if cells == [""]:
+        query = query.filter(Clinic.geohash.isnot(None))
+    else:
+        # Each cell is a range of the geohash index; the column's byte-order
+        # collation (see Clinic.geohash) puts "~" after every geohash character
+        query = query.filter(or_(*(and_(Clinic.geohash >= cell, Clinic.geohash < cell + "~") for cell in cells)))
+    # A box crossing the antimeridian wraps around; skip the longitude filter there
+    if min_lng >= -180 and max_lng <= 180:
+        query = query.filter(Clinic.longitude.between(min_lng, max_lng))
+
+    nearby = []
+    for row in query.all():
+        distance = haversine_km(lat, lng, row.latitude, row.longitude)
+        if distance <= radius:
+            nearby.append((distance, row))
+    nearby.sort(key=lambda item: (item[0], item[1].id))
+    return [{**directory_entry(row), "distance_km": round(distance, 3)} for distance, row in nearby[:limit]]
+
+# Directory fields of a clinic row (clinic columns plus its user's name, email and active flag)
+def directory_entry(row):
+    return {
+        "id": row.id,
+        "name": row.name,
+        "email": row.email,
+        "phone": row.phone,
+        "address": row.address,
+        "location": row.location,
+        "specialization": row.specialization,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "is_active": row.is_active,
+        "created_at": row.created_at, # Pydantic will format it
+        "updated_at": row.updated_at, # Pydantic will format it
+        "services": [] # Services are not loaded here, default to empty list
+    }
 
-# Get featured clinics (for homepage)
+# Get featured clinics (for homepage), ranked by recent traffic. Served from
+# the in-memory snapshot in app/featured.py, with an ETag so repeat views
+# revalidate to a 304.
 @router.get("/featured", response_model=List[ClinicResponse])
-async def get_featured_clinics(db: Session = Depends(get_db)):
-    # In a real app, this might use criteria like ratings, etc.
-    # For now, just return the first 3 clinics
-    clinics = db.query(Clinic).limit(3).all()
-    result = []
-    
-    for clinic in clinics:
-        # Get the corresponding user to get email and name
-        user = db.query(User).filter(User.id == clinic.id).first()
-        if user:
-            clinic_data = {
-                **clinic.__dict__,
-                "name": user.name,
-                "email": user.email,
-                "services": clinic.services
-            }
-            result.append(clinic_data)
-    
-    return result
+def get_featured_clinics(request: Request, db: Session = Depends(get_read_db)):
+    snapshot = featured_clinics.get(db)
+    headers = {"ETag": snapshot.etag, "Cache-Control": f"public, max-age={FEATURED_MAX_AGE_SECONDS}"}
+    client_etags = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if snapshot.etag in client_etags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 # Get a specific clinic
 @router.get("/{clinic_id}", response_model=ClinicResponse)
-async def get_clinic(clinic_id: str, db: Session = Depends(get_db)):
+def get_clinic(clinic_id: str, db: Session = Depends(get_db)):
     clinic = db.query(Clinic).filter(Clinic.id == clinic_id).first()
     if not clinic:
         raise HTTPException(status_code=404, detail="Clinic not found")
@@ -148,7 +197,7 @@ async def get_clinic(clinic_id: str, db: Session = Depends(get_db)):
 
 # Update clinic
 @router.put("/{clinic_id}", response_model=ClinicResponse)
-async def update_clinic(
+def update_clinic(
     clinic_id: str,
     clinic_data: ClinicUpdate,
     db: Session = Depends(get_db),
@@ -176,7 +225,11 @@ async def update_clinic(
         # Update directly in database
         db.query(User).filter(User.id == clinic_id).update({"name": clinic_data.name})
     
+    # Keep the search index in step, in the same transaction
+    db.flush()
+    index_clinics(db, [clinic_id])
     db.commit()
+    invalidate_principal(clinic_id)
     db.refresh(clinic)
     
     # Create response with both user and clinic data
@@ -195,7 +248,7 @@ async def update_clinic(
 
 # Get clinic services
 @router.get("/{clinic_id}/services", response_model=List[ClinicServiceResponse])
-async def get_clinic_services(clinic_id: str, db: Session = Depends(get_db)):
+def get_clinic_services(clinic_id: str, db: Session = Depends(get_db)):
     clinic = db.query(Clinic).filter(Clinic.id == clinic_id).first()
     if not clinic:
         raise HTTPException(status_code=404, detail="Clinic not found")
@@ -203,9 +256,53 @@ async def get_clinic_services(clinic_id: str, db: Session = Depends(get_db)):
     services = db.query(ClinicService).filter(ClinicService.clinic_id == clinic_id).all()
     return services
 
+# Get clinic opening hours; clinics that never set theirs get the defaults
+@router.get("/{clinic_id}/hours", response_model=List[OpeningHours])
+def get_clinic_hours(clinic_id: str, db: Session = Depends(get_read_db)):
+    if not db.query(Clinic.id).filter(Clinic.id == clinic_id).first():
+        raise HTTPException(status_code=404, detail="Clinic not found")
+    return [
+        OpeningHours(weekday=weekday, opens=format_minutes(opens), closes=format_minutes(closes))
+        for weekday, intervals in sorted(weekly_hours(db, clinic_id).items())
+        for opens, closes in intervals
+    ]
+
+# Replace clinic opening hours (clinic owner or admin). Days without an
+# interval are closed. Existing appointments are kept.
+@router.put("/{clinic_id}/hours", response_model=List[OpeningHours])
+def set_clinic_hours(
+    clinic_id: str,
+    hours: List[OpeningHours],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if not ((current_user.type == "clinic" and current_user.id == clinic_id) or is_admin(current_user)):
+        raise HTTPException(status_code=403, detail="Not authorized to update this clinic")
+    if not db.query(Clinic.id).filter(Clinic.id == clinic_id).first():
+        raise HTTPException(status_code=404, detail="Clinic not found")
+
+    intervals = sorted(
+        (interval.weekday, parse_minutes(interval.opens), parse_minutes(interval.closes, allow_end_of_day=True))
+        for interval in hours
+    )
+    for i, (weekday, opens, closes) in enumerate(intervals):
+        if opens >= closes:
+            raise HTTPException(status_code=400, detail="Opening hours must close after they open")
+        if i and intervals[i - 1][0] == weekday and intervals[i - 1][2] > opens:
+            raise HTTPException(status_code=400, detail="Opening hours overlap")
+
+    db.query(ClinicOpeningHours).filter(ClinicOpeningHours.clinic_id == clinic_id).delete(synchronize_session=False)
+    rows = [
+        ClinicOpeningHours(clinic_id=clinic_id, weekday=weekday, opens=format_minutes(opens), closes=format_minutes(closes))
+        for weekday, opens, closes in intervals
+    ]
+    db.add_all(rows)
+    db.commit()
+    return [OpeningHours.model_validate(row) for row in rows]
+
 # Add a clinic service
 @router.post("/services", response_model=ClinicServiceResponse)
-async def add_clinic_service(
+def add_clinic_service(
     service_data: ClinicServiceCreate, # clinic_id removed from parameters
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -236,7 +333,7 @@ async def add_clinic_service(
 
 # Update a clinic service
 @router.put("/services/{service_id}", response_model=ClinicServiceResponse)
-async def update_clinic_service(
+def update_clinic_service(
     service_id: str,
     service_data: ClinicServiceUpdate,
     db: Session = Depends(get_db),
@@ -262,7 +359,7 @@ async def update_clinic_service(
 
 # Delete a clinic service
 @router.delete("/services/{service_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_clinic_service(
+def delete_clinic_service(
     service_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
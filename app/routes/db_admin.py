@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import List, Dict, Any
+
+from app.models.users import User
+from app.auth import get_current_admin
+from app.slow_queries import SLOW_QUERY_LOG, slow_query_log
+
+router = APIRouter()
+
+REPORT_ORDERS = ("total_ms", "max_ms", "mean_ms", "calls", "slow_calls")
+
+# Slow-query report: statement fingerprints with latency histograms and captured plans
+@router.get("/slow-queries", response_model=List[Dict[str, Any]])
+def get_slow_queries(
+    order_by: str = "total_ms",
+    limit: int = 50,
+    current_user: User = Depends(get_current_admin)
+):
+    if not SLOW_QUERY_LOG:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slow query log is disabled (set SLOW_QUERY_LOG=true)")
+    if order_by not in REPORT_ORDERS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"order_by must be one of {', '.join(REPORT_ORDERS)}")
+    return slow_query_log.report(order_by=order_by, limit=limit)
+
+# The full report as JSON lines, one fingerprint per line
+@router.get("/slow-queries.jsonl", response_class=PlainTextResponse)
+def dump_slow_queries(current_user: User = Depends(get_current_admin)):
+    if not SLOW_QUERY_LOG:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slow query log is disabled (set SLOW_QUERY_LOG=true)")
+    return PlainTextResponse(slow_query_log.dump_jsonl(), media_type="application/x-ndjson")
+
+# Clear the collected statistics
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def reset_slow_queries(current_user: User = Depends(get_current_admin)):
+    slow_query_log.reset()
+    return None
@@ -3,35 +3,28 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Dict
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.users import User
 from app.models.patients import Patient
 from app.schemas.patient import PatientResponse, PatientUpdate
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_current_admin, is_admin
+from app.principal_cache import invalidate_principal
 
 router = APIRouter()
 
-# Helper function to check if user is admin
-def is_admin(user):
-    admin_types = ['admin', 'administrator', 'system']
-    return user.type.lower() in [t.lower() for t in admin_types]
-
 # Get patients count for admin dashboard
 @router.get("/count", response_model=Dict[str, int])
-async def get_patients_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+def get_patients_count(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
     
     count = db.query(func.count(Patient.id)).scalar()
     return {"count": count}
 
 # Get all patients (admin only in a real app)
 @router.get("/all")
-async def get_patients(
+def get_patients(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -62,7 +55,7 @@ async def get_patients(
 
 # Get a specific patient
 @router.get("/{patient_id}", response_model=PatientResponse)
-async def get_patient(
+def get_patient(
     patient_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -97,7 +90,7 @@ async def get_patient(
 
 # Update patient
 @router.put("/{patient_id}", response_model=PatientResponse)
-async def update_patient(
+def update_patient(
     patient_id: str,
     patient_data: PatientUpdate,
     db: Session = Depends(get_db),
@@ -128,6 +121,7 @@ async def update_patient(
         user.name = patient_data.name
     
     db.commit()
+    invalidate_principal(patient_id)
     db.refresh(patient)
     if patient_data.name is not None: # If user was changed, refresh user too
         db.refresh(user)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased, selectinload
 from typing import List
 import uuid
 
@@ -20,32 +20,36 @@ router = APIRouter()
 
 # Get all prescriptions (admin only in a real app)
 @router.get("/all", response_model=List[PrescriptionResponse])
-async def get_all_prescriptions(
+def get_all_prescriptions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     # In a real app, check if admin
-    prescriptions = db.query(Prescription).all()
-    
-    # Enrich with related data
-    result = []
-    for prescription in prescriptions:
-        clinic = db.query(Clinic).filter(Clinic.id == prescription.clinic_id).first()
-        patient = db.query(Patient).filter(Patient.id == prescription.patient_id).first()
-        
-        prescription_dict = {
+    return prescription_entries(db)
+
+# Prescriptions matching filters, with their clinic's and patient's names and
+# their medications: two queries however many prescriptions there are
+def prescription_entries(db: Session, *filters):
+    clinic_user = aliased(User)
+    patient_user = aliased(User)
+    rows = db.query(Prescription, clinic_user.name, patient_user.name).outerjoin(
+        clinic_user, clinic_user.id == Prescription.clinic_id
+    ).outerjoin(
+        patient_user, patient_user.id == Prescription.patient_id
+    ).options(selectinload(Prescription.medications)).filter(*filters).all()
+    return [
+        {
             **prescription.__dict__,
-            "clinic_name": clinic.name if clinic else None,
-            "patient_name": patient.name if patient else None,
+            "clinic_name": clinic_name,
+            "patient_name": patient_name,
             "medications": prescription.medications
         }
-        result.append(prescription_dict)
-    
-    return result
+        for prescription, clinic_name, patient_name in rows
+    ]
 
 # Create a prescription
 @router.post("/", response_model=PrescriptionResponse)
-async def create_prescription(
+def create_prescription(
     prescription_data: PrescriptionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -105,7 +109,7 @@ async def create_prescription(
 
 # Get patient prescriptions
 @router.get("/patient/{patient_id}", response_model=List[PrescriptionResponse])
-async def get_patient_prescriptions(
+def get_patient_prescriptions(
     patient_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -114,27 +118,11 @@ async def get_patient_prescriptions(
     if current_user.id != patient_id and current_user.type != "clinic":
         raise HTTPException(status_code=403, detail="Not authorized to view these prescriptions")
     
-    prescriptions = db.query(Prescription).filter(Prescription.patient_id == patient_id).all()
-    
-    # Enrich with related data
-    result = []
-    for prescription in prescriptions:
-        clinic = db.query(Clinic).filter(Clinic.id == prescription.clinic_id).first()
-        patient = db.query(Patient).filter(Patient.id == prescription.patient_id).first()
-        
-        prescription_dict = {
-            **prescription.__dict__,
-            "clinic_name": clinic.name if clinic else None,
-            "patient_name": patient.name if patient else None,
-            "medications": prescription.medications
-        }
-        result.append(prescription_dict)
-    
-    return result
+    return prescription_entries(db, Prescription.patient_id == patient_id)
 
 # Get clinic prescriptions
 @router.get("/clinic/{clinic_id}", response_model=List[PrescriptionResponse])
-async def get_clinic_prescriptions(
+def get_clinic_prescriptions(
     clinic_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -143,26 +131,11 @@ async def get_clinic_prescriptions(
     if current_user.id != clinic_id and current_user.type != "clinic":
         raise HTTPException(status_code=403, detail="Not authorized to view these prescriptions")
     
-    prescriptions = db.query(Prescription).filter(Prescription.clinic_id == clinic_id).all()
-    
-    # Enrich with related data
-    result = []
-    for prescription in prescriptions:
-        patient = db.query(Patient).filter(Patient.id == prescription.patient_id).first()
-        
-        prescription_dict = {
-            **prescription.__dict__,
-            "clinic_name": current_user.name,
-            "patient_name": patient.name if patient else None,
-            "medications": prescription.medications
-        }
-        result.append(prescription_dict)
-    
-    return result
+    return prescription_entries(db, Prescription.clinic_id == clinic_id)
 
 # Get a specific prescription
 @router.get("/{prescription_id}", response_model=PrescriptionResponse)
-async def get_prescription(
+def get_prescription(
     prescription_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -192,7 +165,7 @@ async def get_prescription(
 
 # Update a prescription
 @router.put("/{prescription_id}", response_model=PrescriptionResponse)
-async def update_prescription(
+def update_prescription(
     prescription_id: str,
     prescription_data: PrescriptionUpdate,
     db: Session = Depends(get_db),
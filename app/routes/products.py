@@ -1,14 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import func, distinct, desc
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional
 import uuid
 from datetime import datetime
+from decimal import Decimal
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.users import User
 from app.models.products import Product, Order, OrderItem
-from app.models.clinics import Clinic
 from app.models.patients import Patient
 from app.models.prescriptions import Prescription
 from app.models.rewards import RewardPoint
@@ -17,59 +17,63 @@ from app.schemas.product import (
     ProductResponse,
     ProductUpdate,
     ProductCategory,
+    ProductSuggestion,
     # OrderCreate, # We are using UserOrderCreate now
     UserOrderCreate, # Renamed for clarity
     OrderResponse,
     OrderItemCustomResponse
 )
-from app.auth import get_current_active_user
+from app.schemas.types import integer_str, money_str, optional_str
+from app.auth import get_current_active_user, get_current_admin
+from app.search import index_products, search_products
+from app.typeahead import MAX_SUGGESTION_LIMIT, SUGGESTION_LIMIT, product_suggestions
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_OFFSET,
+    MAX_PAGE_SIZE,
+    CountEstimates,
+    after_cursor,
+    before_cursor,
+    decode_cursor,
+    encode_cursor,
+    set_next_cursor,
+    set_next_link,
+    set_total_count,
+    timestamp_key
+)
 
 router = APIRouter()
 
-# Helper function to check if user is admin
-def is_admin(user):
-    admin_types = ['admin', 'administrator', 'system']
-    return user.type and user.type.lower() in [t.lower() for t in admin_types]
-
 # Get products count for admin dashboard
 @router.get("/count", response_model=Dict[str, int])
-async def get_products_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+def get_products_count(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
     
     count = db.query(func.count(Product.id)).scalar()
     return {"count": count}
 
 # Get orders count for admin dashboard
 @router.get("/orders/count", response_model=Dict[str, int])
-async def get_orders_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+def get_orders_count(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
     
     count = db.query(func.count(Order.id)).scalar()
     return {"count": count}
 
 # Get all orders for admin dashboard
 @router.get("/orders/all")
-async def get_admin_orders(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+def get_admin_orders(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
 
     db_orders = db.query(Order).options(
         joinedload(Order.patient).joinedload(Patient.user),
-        joinedload(Order.items).joinedload(OrderItem.product)
+        joinedload(Order.items)
     ).order_by(Order.created_at.desc()).all()
 
     response_orders = []
@@ -78,18 +82,18 @@ async def get_admin_orders(
         for item in order.items:
             order_items_data.append({
                 "id": item.id,
-                "name": item.product.name if item.product else "Unknown Product",
-                "quantity": item.quantity,
-                "price": item.price
+                "name": item.product_name or "Unknown Product",
+                "quantity": optional_str(integer_str, item.quantity),
+                "price": optional_str(money_str, item.price)
             })
         
         response_orders.append({
             "id": order.id,
             "patient_id": order.patient_id,
             "patient_name": order.patient.user.name if order.patient and order.patient.user else "Unknown Patient",
-            "total": order.total,
+            "total": optional_str(money_str, order.total),
             "status": order.status,
-            "points_earned": order.points_earned,
+            "points_earned": optional_str(integer_str, order.points_earned),
             "created_at": order.created_at.isoformat() if order.created_at else None,
             "items": order_items_data
         })
@@ -98,18 +102,15 @@ async def get_admin_orders(
 
 # Get recent orders for admin dashboard
 @router.get("/orders/recent")
-async def get_recent_orders(
+def get_recent_orders(
     limit: int = 5,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
 
     db_orders = db.query(Order).options(
         joinedload(Order.patient).joinedload(Patient.user),
-        joinedload(Order.items).joinedload(OrderItem.product)
+        joinedload(Order.items)
     ).order_by(Order.created_at.desc()).limit(limit).all()
 
     response_orders = []
@@ -118,9 +119,9 @@ async def get_recent_orders(
         for item in order.items:
             order_items_data.append({
                 "id": item.id,
-                "name": item.product.name if item.product else "Unknown Product",
-                "quantity": item.quantity,
-                "price": item.price
+                "name": item.product_name or "Unknown Product",
+                "quantity": optional_str(integer_str, item.quantity),
+                "price": optional_str(money_str, item.price)
             })
         
         response_orders.append({
@@ -129,9 +130,9 @@ async def get_recent_orders(
                 "id": order.patient_id,
                 "name": order.patient.user.name if order.patient and order.patient.user else "Unknown Patient"
             },
-            "total": order.total,
+            "total": optional_str(money_str, order.total),
             "status": order.status,
-            "points_earned": order.points_earned,
+            "points_earned": optional_str(integer_str, order.points_earned),
             "created_at": order.created_at.isoformat() if order.created_at else None,
             "items": order_items_data
         })
@@ -140,35 +141,18 @@ async def get_recent_orders(
 
 # Get all orders for admin
 @router.get("/orders/all", response_model=List[OrderResponse])
-async def get_all_orders(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+def get_all_orders(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
     
     db_orders = db.query(Order).options(
-        joinedload(Order.patient).joinedload(Patient.user), # For patient_name if needed by OrderResponse indirectly or future use
-        joinedload(Order.items).joinedload(OrderItem.product), # For items
-        joinedload(Order.prescription).joinedload(Prescription.clinic).joinedload(Clinic.user) # For clinic_name
+        selectinload(Order.items) # Items carry their product details
     ).order_by(Order.created_at.desc()).all()
 
     response_orders = []
     for order in db_orders:
-        items_response = []
-        for item in order.items:
-            items_response.append(OrderItemCustomResponse(
-                id=item.id,
-                product_id=item.product_id,
-                name=item.product.name if item.product else "Unknown Product",
-                quantity=item.quantity,
-                price=item.price
-            ))
-
-        clinic_name = None
-        if order.prescription and order.prescription.clinic and order.prescription.clinic.user:
-            clinic_name = order.prescription.clinic.user.name
+        items_response = [OrderItemCustomResponse(**order_item_entry(item)) for item in order.items]
         
         response_orders.append(OrderResponse(
             id=order.id,
@@ -179,16 +163,46 @@ async def get_all_orders(
             points_earned=order.points_earned,
             date=order.created_at.isoformat() if order.created_at else None,
             items=items_response,
-            clinic_name=clinic_name
+            clinic_name=order.clinic_name
         ))
         
     return response_orders
 
-# Get patient orders
+# Order line as shown in order listings, from the details snapshotted at purchase
+def order_item_entry(item: OrderItem) -> Dict[str, Any]:
+    return {
+        "id": item.id,
+        "product_id": item.product_id,
+        "name": item.product_name or "Unknown Product",
+        "quantity": item.quantity,
+        "price": item.price
+    }
+
+# Order history entry: the order with its items and the prescribing clinic's name
+def patient_order_entry(order: Order) -> Dict[str, Any]:
+    return {
+        "id": order.id,
+        "patient_id": order.patient_id,
+        "total": order.total,
+        "status": order.status,
+        "date": order.created_at.isoformat(),
+        "points_earned": order.points_earned,
+        "items": [order_item_entry(item) for item in order.items],
+        "clinic_name": order.clinic_name
+    }
+
+# Get patient orders, newest first. Two single-table queries however long the
+# history: the orders, then every item of those orders. Without limit or cursor the whole history is returned; with
+# them, pages are keyset-paginated on (created_at, id) descending and the next
+# page's cursor is sent in the X-Next-Cursor and Link headers.
 @router.get("/orders/patient/{patient_id}", response_model=List[OrderResponse])
 @router.get("/orders/all/patient/{patient_id}", response_model=List[OrderResponse])
-async def get_patient_orders(
+def get_patient_orders(
     patient_id: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -196,57 +210,132 @@ async def get_patient_orders(
     if current_user.id != patient_id and current_user.type != "clinic":
         raise HTTPException(status_code=403, detail="Not authorized to view this patient's orders")
     
-    # Get orders for patient
-    orders = db.query(Order).filter(Order.patient_id == patient_id).all()
-    
-    # Prepare response with additional data
-    order_responses = []
-    for order in orders:
-        # Get order items with product details
-        items = []
-        order_items = db.query(OrderItem).filter(OrderItem.order_id == order.id).all()
-        
-        for item in order_items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            if product:
-                items.append({
-                    "id": item.id,
-                    "product_id": item.product_id,
-                    "name": product.name,
-                    "quantity": item.quantity,
-                    "price": item.price
-                })
-        
-        # Get clinic name if available
-        clinic_name = None
-        if order.prescription_id:
-            prescription = db.query(Prescription).filter(Prescription.id == order.prescription_id).first()
-            if prescription and prescription.clinic_id:
-                clinic = db.query(Clinic).join(User).filter(Clinic.id == prescription.clinic_id).first()
-                if clinic and clinic.user:
-                    clinic_name = clinic.user.name
-        
-        # Format order with items and additional data
-        order_response = {
-            "id": order.id,
-            "patient_id": order.patient_id,
-            "total": order.total,
-            "status": order.status,
-            "date": order.created_at.isoformat(),
-            "points_earned": order.points_earned,
-            "items": items,
-            "clinic_name": clinic_name
-        }
-        
-        order_responses.append(order_response)
-    
-    return order_responses
+    dialect_name = db.get_bind().dialect.name
+    created_key = timestamp_key(Order.created_at, dialect_name)
+    query = db.query(Order, created_key.label("created_key")).options(
+        selectinload(Order.items)
+    ).filter(Order.patient_id == patient_id)
+    if cursor:
+        query = query.filter(before_cursor(created_key, Order.id, decode_cursor(cursor, dialect_name)))
+        limit = limit or DEFAULT_PAGE_SIZE
+    query = query.order_by(created_key.desc(), Order.id.desc())
+    # One extra row tells whether another page follows
+    rows = query.limit(limit + 1).all() if limit else query.all()
+
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        set_next_cursor(request, response, encode_cursor(rows[-1].created_key, rows[-1].Order.id))
+
+    return [patient_order_entry(row.Order) for row in rows]
+
+# Catalog orderings: sort name -> (column, descending, cursor value parser).
+# Each is backed by an index on (column, id) and (category, column, id).
+PRODUCT_SORTS = {
+    "newest": (Product.created_at, True, None),
+    "price_asc": (Product.price, False, Decimal),
+    "price_desc": (Product.price, True, Decimal),
+    "name": (Product.name, False, str),
+}
+product_counts = CountEstimates()
+
+# Browse the catalog one page at a time. Filters on category, clinic, stock and
+# a price range; sorted newest first, by price or by name. Pages are keyset-
+# paginated on (sort column, id) and the next page's cursor is sent in the
+# X-Next-Cursor and Link headers. X-Total-Count estimates the number of
+# matching products; it is counted at most once every COUNT_CACHE_SECONDS per
+# filter combination. A cursor only continues the sort it came from.
+@router.get("/", response_model=List[ProductResponse])
+@router.get("", response_model=List[ProductResponse], include_in_schema=False)
+def list_products(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    clinic_id: Optional[str] = None,
+    in_stock: Optional[bool] = None,
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    sort: Literal["newest", "price_asc", "price_desc", "name"] = "newest",
+    db: Session = Depends(get_read_db)
+):
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price must not be greater than max_price")
+
+    filters = []
+    if category:
+        filters.append(Product.category == category)
+    if clinic_id:
+        filters.append(Product.clinic_id == clinic_id)
+    if in_stock is not None:
+        filters.append(Product.in_stock == in_stock)
+    if min_price is not None:
+        filters.append(Product.price >= min_price)
+    if max_price is not None:
+        filters.append(Product.price <= max_price)
+
+    dialect_name = db.get_bind().dialect.name
+    column, descending, parse = PRODUCT_SORTS[sort]
+    sort_key = timestamp_key(column, dialect_name) if column is Product.created_at else column
+    query = db.query(Product, sort_key.label("sort_key")).filter(
+        *filters, column.is_not(None)  # A row without a sort value has no place in the keyset order
+    )
+    if cursor:
+        position = decode_cursor(cursor, dialect_name, parse)
+        keyset = before_cursor if descending else after_cursor
+        query = query.filter(keyset(sort_key, Product.id, position))
+    if descending:
+        query = query.order_by(sort_key.desc(), Product.id.desc())
+    else:
+        query = query.order_by(sort_key, Product.id)
+    # One extra row tells whether another page follows
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        set_next_cursor(request, response, encode_cursor(rows[-1].sort_key, rows[-1].Product.id))
+
+    count_key = (category, clinic_id, in_stock, min_price, max_price)
+    set_total_count(response, product_counts.get(
+        count_key, lambda: db.query(func.count(Product.id)).filter(*filters).scalar()
+    ))
+    return [row.Product for row in rows]
+
+# Search products by name, category and description, best match first.
+# Every word must match (as a prefix). Pages are `limit` long; the Link header
+# points at the next one.
+@router.get("/search", response_model=List[ProductResponse])
+def search_product_catalog(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    db: Session = Depends(get_read_db)
+):
+    rows = search_products(db, q, limit + 1, offset, category)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        set_next_link(request, response, offset=offset + limit)
+    return rows
+
+# Typeahead: products whose name has a word starting with each typed word.
+# Answered from memory (see app/typeahead.py). The session is only used to build
+# a cold index, which must read the primary like the periodic rebuild does.
+@router.get("/suggest", response_model=List[ProductSuggestion])
+def suggest_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(SUGGESTION_LIMIT, ge=1, le=MAX_SUGGESTION_LIMIT),
+    db: Session = Depends(get_db)
+):
+    return product_suggestions.suggest(db, q, limit)
 
 # Get all products
 @router.get("/all", response_model=List[ProductResponse])
-async def get_all_products(
+def get_all_products(
     category: str = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     query = db.query(Product)
     
@@ -258,7 +347,7 @@ async def get_all_products(
 
 # Get product categories
 @router.get("/categories", response_model=List[ProductCategory])
-async def get_product_categories(db: Session = Depends(get_db)):
+def get_product_categories(db: Session = Depends(get_read_db)):
     categories = (
         db.query(
             Product.category.label("name"),
@@ -273,7 +362,7 @@ async def get_product_categories(db: Session = Depends(get_db)):
 
 # Get products by clinic
 @router.get("/clinic/{clinic_id}", response_model=List[ProductResponse])
-async def get_clinic_products(
+def get_clinic_products(
     clinic_id: str,
     db: Session = Depends(get_db)
 ):
@@ -282,7 +371,7 @@ async def get_clinic_products(
 
 # Add a product
 @router.post("/", response_model=ProductResponse)
-async def add_product(
+def add_product(
     product_data: ProductCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -304,14 +393,18 @@ async def add_product(
     )
     
     db.add(product)
+    # Keep the search index in step, in the same transaction
+    db.flush()
+    index_products(db, [product.id])
     db.commit()
     db.refresh(product)
+    product_suggestions.upsert(product.id, product.name, product.category)
     
     return product
 
 # Update a product
 @router.put("/{product_id}", response_model=ProductResponse)
-async def update_product(
+def update_product(
     product_id: str,
     product_data: ProductUpdate,
     db: Session = Depends(get_db),
@@ -330,14 +423,18 @@ async def update_product(
     for key, value in product_data.dict(exclude_unset=True).items():
         setattr(product, key, value)
     
+    # Keep the search index in step, in the same transaction
+    db.flush()
+    index_products(db, [product_id])
     db.commit()
     db.refresh(product)
+    product_suggestions.upsert(product.id, product.name, product.category)
     
     return product
 
 # Delete a product
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_product(
+def delete_product(
     product_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -351,15 +448,18 @@ async def delete_product(
     if current_user.id != product.clinic_id or current_user.type != "clinic":
         raise HTTPException(status_code=403, detail="Not authorized to delete this product")
     
-    # Delete product
+    # Delete product, and its search index entry in the same transaction
     db.delete(product)
+    db.flush()
+    index_products(db, [product_id])
     db.commit()
+    product_suggestions.remove(product_id)
     
     return None
 
 # Create an order
 @router.post("/order", response_model=OrderResponse)
-async def create_order(
+def create_order(
     order_data: UserOrderCreate, # Use the new Pydantic model
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -383,7 +483,7 @@ async def create_order(
     if len(products_from_db) != len(set(product_ids)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="One or more products not found or duplicated")
 
-    total = 0.0
+    total = Decimal("0")
     order_items_to_create = []
 
     for item_data in order_data.items:
@@ -391,18 +491,14 @@ async def create_order(
         if not product: # Should not happen if previous check is done correctly
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product with id {item_data.product_id} not found")
 
-        try:
-            item_quantity = int(item_data.quantity)
-            if item_quantity <= 0:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Quantity for product {product.name} must be positive.")
-        except ValueError:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid quantity format for product {product.name}.")
+        item_quantity = int(item_data.quantity or 1)  # Validated as a whole number by the schema
+        if item_quantity <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Quantity for product {product.name} must be positive.")
 
-        try:
-            product_price = float(product.price)
-        except ValueError:
+        if product.price is None:
             # This indicates bad data in the database for product price
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Invalid price format for product {product.name} in database.")
+        product_price = Decimal(product.price)
         
         item_total = product_price * item_quantity
         total += item_total
@@ -410,19 +506,30 @@ async def create_order(
         order_items_to_create.append(OrderItem(
             id=str(uuid.uuid4()),
             product_id=item_data.product_id,
-            quantity=str(item_quantity), # Store quantity as string as per schema
-            price=str(product_price) # Store price at the time of order as string
+            quantity=item_quantity,
+            price=product_price, # Price at the time of order
+            product_name=product.name,
+            product_category=product.category,
+            clinic_id=product.clinic_id
         ))
 
+    # Name of the prescribing clinic, kept on the order for its history
+    clinic_name = None
+    if order_data.prescription_id:
+        clinic_name = db.query(User.name).join(Prescription, Prescription.clinic_id == User.id).filter(
+            Prescription.id == order_data.prescription_id
+        ).scalar()
+
     # Create the Order record
     order_id = str(uuid.uuid4())
     order = Order(
         id=order_id,
         patient_id=current_user.id,
         prescription_id=order_data.prescription_id,
-        total=str(total), # Store total as string
+        total=total,
         status="processing", # Default status
-        points_earned=str(int(total * 10)) # Ensure total is float for calculation
+        points_earned=int(total * 10),
+        clinic_name=clinic_name
     )
     db.add(order)
 
@@ -436,7 +543,7 @@ async def create_order(
     reward_point = RewardPoint(
         id=str(uuid.uuid4()),
         patient_id=current_user.id,
-        points=str(points_earned_val),
+        points=points_earned_val,
         description="Order placed successfully",
         source_id=order_id,
         type="earned"
@@ -451,16 +558,7 @@ async def create_order(
         db.refresh(oi_model)
 
     # Prepare response using Pydantic models
-    response_items = []
-    for oi_model in order_items_to_create:
-        product = products_map.get(oi_model.product_id)
-        response_items.append(OrderItemCustomResponse(
-            id=oi_model.id,
-            product_id=oi_model.product_id,
-            name=product.name if product else "Unknown Product",
-            quantity=oi_model.quantity,
-            price=oi_model.price
-        ))
+    response_items = [OrderItemCustomResponse(**order_item_entry(oi_model)) for oi_model in order_items_to_create]
 
     return OrderResponse(
         id=order.id,
@@ -471,5 +569,5 @@ async def create_order(
         points_earned=order.points_earned,
         date=order.created_at.isoformat() if order.created_at else datetime.now().isoformat(), # Populate date
         items=response_items,
-        clinic_name=None # clinic_name is not applicable here
+        clinic_name=order.clinic_name
     )
\ No newline at end of file
@@ -112,7 +112,7 @@ def calculate_reward_points(
 # Routes for reward configurations
 
 @router.post("/configurations", response_model=RewardConfigResponse)
-async def create_reward_configuration(
+def create_reward_configuration(
     config_data: RewardConfigCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -147,7 +147,7 @@ async def create_reward_configuration(
     return config
 
 @router.get("/configurations", response_model=List[RewardConfigResponse])
-async def get_reward_configurations(
+def get_reward_configurations(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -162,7 +162,7 @@ async def get_reward_configurations(
     return configs
 
 @router.get("/configurations/{config_id}", response_model=RewardConfigResponse)
-async def get_reward_configuration(
+def get_reward_configuration(
     config_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -178,7 +178,7 @@ async def get_reward_configuration(
     return config
 
 @router.put("/configurations/{config_id}", response_model=RewardConfigResponse)
-async def update_reward_configuration(
+def update_reward_configuration(
     config_id: str,
     config_data: RewardConfigUpdate,
     db: Session = Depends(get_db),
@@ -217,7 +217,7 @@ async def update_reward_configuration(
     return config
 
 @router.delete("/configurations/{config_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_reward_configuration(
+def delete_reward_configuration(
     config_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -238,7 +238,7 @@ async def delete_reward_configuration(
 # Routes for seasons
 
 @router.post("/seasons", response_model=SeasonResponse)
-async def create_season(
+def create_season(
     season_data: SeasonCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -269,7 +269,7 @@ async def create_season(
     return season
 
 @router.get("/seasons", response_model=List[SeasonResponse])
-async def get_seasons(
+def get_seasons(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -281,7 +281,7 @@ async def get_seasons(
     return seasons
 
 @router.get("/seasons/{season_id}", response_model=SeasonResponse)
-async def get_season(
+def get_season(
     season_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -297,7 +297,7 @@ async def get_season(
     return season
 
 @router.put("/seasons/{season_id}", response_model=SeasonResponse)
-async def update_season(
+def update_season(
     season_id: str,
     season_data: SeasonUpdate,
     db: Session = Depends(get_db),
@@ -336,7 +336,7 @@ async def update_season(
     return season
 
 @router.delete("/seasons/{season_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_season(
+def delete_season(
     season_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -356,7 +356,7 @@ async def delete_season(
 
 # Calculate reward points
 @router.post("/calculate", response_model=RewardCalculationResponse)
-async def calculate_rewards(
+def calculate_rewards(
     calculation_data: RewardCalculationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import case, func
 from typing import List
 import uuid
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.users import User
-from app.models.rewards import RewardPoint, RewardCard, PartnerShop, PartnerShopCategory
+from app.models.rewards import RewardPoint, RewardCard, PartnerShop
 from app.schemas.reward import (
     RewardPointCreate,
     RewardPointResponse,
@@ -23,17 +23,15 @@ router = APIRouter()
 
 # Get rewards information
 @router.get("/info", response_model=RewardsInfoResponse)
-async def get_rewards_info(db: Session = Depends(get_db)):
-    # Get partner shops
-    partner_shops = db.query(PartnerShop).all()
+def get_rewards_info(db: Session = Depends(get_read_db)):
+    # Get partner shops, with all their categories in one more query
+    partner_shops = db.query(PartnerShop).options(selectinload(PartnerShop.categories)).all()
     
-    # For each partner shop, get categories
     shops_with_categories = []
     for shop in partner_shops:
-        categories = db.query(PartnerShopCategory).filter(PartnerShopCategory.partner_shop_id == shop.id).all()
         shop_dict = {
             **shop.__dict__,
-            "categories": categories
+            "categories": shop.categories
         }
         shops_with_categories.append(shop_dict)
     
@@ -50,7 +48,7 @@ async def get_rewards_info(db: Session = Depends(get_db)):
 
 # Get patient rewards
 @router.get("/patient/{patient_id}", response_model=PatientRewardsResponse)
-async def get_patient_rewards(
+def get_patient_rewards(
     patient_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -59,33 +57,13 @@ async def get_patient_rewards(
     if current_user.id != patient_id:
         raise HTTPException(status_code=403, detail="Not authorized to view these rewards")
     
-    # Get point transactions
-    earned_transactions = db.query(RewardPoint).filter(
-        RewardPoint.patient_id == patient_id,
-        RewardPoint.type == "earned"
-    ).all()
-    
-    redeemed_transactions = db.query(RewardPoint).filter(
-        RewardPoint.patient_id == patient_id,
-        RewardPoint.type == "redeemed"
-    ).all()
-    
-    # Manually sum up the points since they are stored as strings
-    earned_points = 0
-    for transaction in earned_transactions:
-        try:
-            earned_points += int(transaction.points)
-        except (ValueError, TypeError):
-            pass  # Skip invalid values
-    
-    redeemed_points = 0
-    for transaction in redeemed_transactions:
-        try:
-            redeemed_points += int(transaction.points)
-        except (ValueError, TypeError):
-            pass  # Skip invalid values
-    
-    total_points = earned_points - redeemed_points
+    # Sum earned and redeemed points in one aggregate query
+    earned_points, redeemed_points = db.query(
+        func.coalesce(func.sum(case((RewardPoint.type == "earned", RewardPoint.points), else_=0)), 0),
+        func.coalesce(func.sum(case((RewardPoint.type == "redeemed", RewardPoint.points), else_=0)), 0)
+    ).filter(RewardPoint.patient_id == patient_id).one()
+    
+    total_points = int(earned_points) - int(redeemed_points)
     
     # Get points history
     history = db.query(RewardPoint).filter(
@@ -103,7 +81,7 @@ async def get_patient_rewards(
 
 # Request a rewards card
 @router.post("/card", response_model=RewardCardResponse)
-async def request_rewards_card(
+def request_rewards_card(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -136,7 +114,7 @@ async def request_rewards_card(
 
 # Add reward points
 @router.post("/points", response_model=RewardPointResponse)
-async def add_reward_points(
+def add_reward_points(
     point_data: RewardPointCreate,
     patient_id: str,
     db: Session = Depends(get_db),
@@ -175,16 +153,13 @@ def generate_card_number():
             
 # Get partner shops for rewards
 @router.get("/partners", response_model=List[PartnerShopResponse])
-async def get_partner_shops(db: Session = Depends(get_db)):
+def get_partner_shops(db: Session = Depends(get_read_db)):
     """Get all partner shops where reward points can be redeemed."""
-    partner_shops = db.query(PartnerShop).all()
+    partner_shops = db.query(PartnerShop).options(selectinload(PartnerShop.categories)).all()
     
-    # For each partner shop, get categories
     result = []
     for shop in partner_shops:
-        categories = db.query(PartnerShopCategory).filter(
-            PartnerShopCategory.partner_shop_id == shop.id
-        ).all()
+        categories = shop.categories
         
         shop_data = {
             "id": shop.id,
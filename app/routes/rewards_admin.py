@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import case, func, desc
 from typing import List, Dict, Any
 import uuid
 from datetime import datetime
@@ -9,65 +9,55 @@ from app.database import get_db
 from app.models.users import User
 from app.models.patients import Patient
 from app.models.rewards import RewardPoint, RewardCard, PartnerShop, PartnerShopCategory
-from app.auth import get_current_active_user
+from app.auth import get_current_admin
 
 router = APIRouter()
 
-# Helper function to check if user is admin
-def is_admin(user):
-    admin_types = ['admin', 'administrator', 'system']
-    return user.type and user.type.lower() in [t.lower() for t in admin_types]
-
 # Get top reward earners for admin dashboard
 @router.get("/top-earners", response_model=List[Dict[str, Any]])
-async def get_top_earners(
+def get_top_earners(
     limit: int = 10,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
-    
-    # Get patients with their reward points
-    # Using a simpler query due to string vs numeric type issues
-    patients = (
+    # Sum each patient's earned and redeemed points in one aggregate query
+    earned = func.coalesce(func.sum(case((RewardPoint.type == "earned", RewardPoint.points), else_=0)), 0)
+    redeemed = func.coalesce(func.sum(case((RewardPoint.type == "redeemed", RewardPoint.points), else_=0)), 0)
+    earners = (
         db.query(
             Patient.id.label("patientId"),
-            User.name
+            User.name,
+            earned.label("earned"),
+            redeemed.label("redeemed")
         )
+        .join(RewardPoint, RewardPoint.patient_id == Patient.id)
         .join(User, User.id == Patient.id)
+        .group_by(Patient.id, User.name)
+        .order_by(desc("earned"), Patient.id)
         .limit(limit)
         .all()
     )
-    
-    # Use sample data for now to avoid type conversion issues
+
     result = []
-    for patient in patients:
-        # Create sample reward data for admin dashboard
-        earned_points = 1000 + (hash(patient.patientId) % 9000)  # Between 1000-10000
-        redeemed_points = int(earned_points * 0.3)  # About 30% redeemed
-        current_balance = earned_points - redeemed_points
-        
+    for earner in earners:
+        earned_points = int(earner.earned)
+        redeemed_points = int(earner.redeemed)
         result.append({
-            "patientId": patient.patientId,
-            "name": patient.name,
+            "patientId": earner.patientId,
+            "name": earner.name,
             "totalPoints": earned_points,
             "redeemedPoints": redeemed_points,
-            "currentBalance": current_balance
+            "currentBalance": earned_points - redeemed_points
         })
-    
+
     return result
 
 # Get all partner shops for admin
 @router.get("/partner-shops", response_model=List[Dict[str, Any]])
-async def get_partner_shops(
+def get_partner_shops(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_admin)
 ):
-    # Check if admin
-    if not is_admin(current_user):
-        raise HTTPException(status_code=403, detail="Not authorized to access this resource")
     
     # Use sample data for partner shops
     result = [
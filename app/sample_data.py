@@ -11,15 +11,21 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 
-# Function to create initial data
-def create_initial_data():
+# Function to create initial data.
+# Run once by app.bootstrap, not on every startup. Pass a session to seed
+# a database other than the default one.
+def create_initial_data(session: Session = None):
     """Create initial data for the healthcare marketplace."""
-    db = SessionLocal()
+    db = session or SessionLocal()
     # Check if sample data already exists (by unique clinic email)
     if db.query(User).filter_by(email="cityhealthclinic@example.com").first():
-        db.close()
+        if session is None:
+            db.close()
         return
     try:
+        # Every sample account shares one password, so bcrypt runs once
+        sample_password_hash = get_password_hash("password123")
+
         # Create clinic users
         clinic_ids = [str(uuid.uuid4()) for _ in range(3)]
         
@@ -29,7 +35,7 @@ def create_initial_data():
                 email="cityhealthclinic@example.com",
                 name="City Health Clinic",
                 type="clinic",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=sample_password_hash,
                 is_active=True
             ),
             User(
@@ -37,7 +43,7 @@ def create_initial_data():
                 email="familymedical@example.com",
                 name="Family Medical Center",
                 type="clinic",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=sample_password_hash,
                 is_active=True
             ),
             User(
@@ -45,7 +51,7 @@ def create_initial_data():
                 email="cardiohealth@example.com",
                 name="Cardio Health Specialists",
                 type="clinic",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=sample_password_hash,
                 is_active=True
             )
         ]
@@ -59,6 +65,8 @@ def create_initial_data():
                 phone="123-456-7890",
                 address="123 Main St, City Center",
                 location="City Center",
+                latitude=40.7128,
+                longitude=-74.0060,
                 specialization="General Practice"
             ),
             Clinic(
@@ -66,6 +74,8 @@ def create_initial_data():
                 phone="234-567-8901",
                 address="456 Oak Ave, Westside",
                 location="Westside",
+                latitude=40.7870,
+                longitude=-73.9754,
                 specialization="Family Medicine"
             ),
             Clinic(
@@ -73,6 +83,8 @@ def create_initial_data():
                 phone="345-678-9012",
                 address="789 Heart Blvd, Northend",
                 location="Northend",
+                latitude=40.8448,
+                longitude=-73.8648,
                 specialization="Cardiology"
             )
         ]
@@ -130,7 +142,7 @@ def create_initial_data():
                 email="johndoe@example.com",
                 name="John Doe",
                 type="patient",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=sample_password_hash,
                 is_active=True
             ),
             User(
@@ -138,7 +150,7 @@ def create_initial_data():
                 email="janesmith@example.com",
                 name="Jane Smith",
                 type="patient",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=sample_password_hash,
                 is_active=True
             )
         ]
@@ -303,4 +315,5 @@ def create_initial_data():
         db.rollback()
         print(f"Error creating initial data: {e}")
     finally:
-        db.close()
\ No newline at end of file
+        if session is None:
+            db.close()
\ No newline at end of file
@@ -1,7 +1,9 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, List
 from datetime import datetime
 
+from app.schemas.types import DateStr, TimeStr
+
 class AppointmentBase(BaseModel):
     clinic_id: str
     service_id: str
@@ -20,7 +22,13 @@ class AppointmentUpdate(BaseModel):
     notes: Optional[str] = None
     status: Optional[str] = None
 
+class AppointmentBatchUpdate(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+    status: Literal["pending", "confirmed", "cancelled", "completed"]
+
 class AppointmentResponse(AppointmentBase):
+    date: DateStr
+    time: TimeStr
     id: str
     patient_id: str
     status: str
@@ -40,4 +48,11 @@ class AppointmentStats(BaseModel):
     pending: int
     confirmed: int
     cancelled: int
-    completed: int
\ No newline at end of file
+    completed: int
+
+class AvailabilityResponse(BaseModel):
+    clinic_id: str
+    service_id: str
+    date: str
+    duration: int  # Minutes each slot blocks out: the service duration in whole slots
+    slots: List[str]  # Free start times, HH:MM
@@ -1,13 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.types import FlagStr, IntegerStr, MoneyStr
+
 class ClinicServiceBase(BaseModel):
     name: str
     description: Optional[str] = None
-    price: str
-    duration: str
-    available: Optional[str] = "true"
+    price: MoneyStr
+    duration: IntegerStr  # Minutes
+    available: Optional[FlagStr] = "true"
 
 class ClinicServiceCreate(ClinicServiceBase):
     pass
@@ -15,11 +17,14 @@ class ClinicServiceCreate(ClinicServiceBase):
 class ClinicServiceUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    price: Optional[str] = None
-    duration: Optional[str] = None
-    available: Optional[str] = None
+    price: Optional[MoneyStr] = None
+    duration: Optional[IntegerStr] = None
+    available: Optional[FlagStr] = None
 
 class ClinicServiceResponse(ClinicServiceBase):
+    # None for legacy services whose price or duration was blank
+    price: Optional[MoneyStr] = None
+    duration: Optional[IntegerStr] = None
     id: str
     clinic_id: str
     created_at: datetime
@@ -28,6 +33,14 @@ class ClinicServiceResponse(ClinicServiceBase):
     class Config:
         from_attributes = True
 
+class OpeningHours(BaseModel):
+    weekday: int = Field(..., ge=0, le=6)  # 0 = Monday ... 6 = Sunday
+    opens: str  # HH:MM, 24h
+    closes: str  # HH:MM, 24h; "24:00" for midnight
+
+    class Config:
+        from_attributes = True
+
 class ClinicBase(BaseModel):
     name: str
     email: str
@@ -35,6 +48,8 @@ class ClinicBase(BaseModel):
     address: Optional[str] = None
     location: Optional[str] = None
     phone: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class ClinicCreate(ClinicBase):
     pass
@@ -45,6 +60,8 @@ class ClinicUpdate(BaseModel):
     address: Optional[str] = None
     location: Optional[str] = None
     phone: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class ClinicResponse(ClinicBase):
     id: str
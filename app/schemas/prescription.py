@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.types import DateStr
+
 class MedicationBase(BaseModel):
     name: str
     dosage: Optional[str] = None
@@ -23,16 +25,16 @@ class MedicationResponse(MedicationBase):
 
 class PrescriptionBase(BaseModel):
     patient_id: str
-    issue_date: str
-    valid_until: Optional[str] = None
+    issue_date: DateStr
+    valid_until: Optional[DateStr] = None
     notes: Optional[str] = None
 
 class PrescriptionCreate(PrescriptionBase):
     medications: List[MedicationCreate]
 
 class PrescriptionUpdate(BaseModel):
-    issue_date: Optional[str] = None
-    valid_until: Optional[str] = None
+    issue_date: Optional[DateStr] = None
+    valid_until: Optional[DateStr] = None
     notes: Optional[str] = None
 
 class PrescriptionResponse(PrescriptionBase):
@@ -2,10 +2,12 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.types import IntegerStr, MoneyStr
+
 class ProductBase(BaseModel):
     name: str
     description: Optional[str] = None
-    price: str
+    price: MoneyStr
     category: Optional[str] = None
     in_stock: bool = True
     image_url: Optional[str] = None
@@ -16,12 +18,13 @@ class ProductCreate(ProductBase):
 class ProductUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    price: Optional[str] = None
+    price: Optional[MoneyStr] = None
     category: Optional[str] = None
     in_stock: Optional[bool] = None
     image_url: Optional[str] = None
 
 class ProductResponse(ProductBase):
+    price: Optional[MoneyStr] = None  # None for legacy products whose price was blank
     id: str
     clinic_id: str
     created_at: datetime
@@ -30,22 +33,27 @@ class ProductResponse(ProductBase):
     class Config:
         orm_mode = True
 
+class ProductSuggestion(BaseModel):
+    id: str
+    name: str
+    category: Optional[str] = None
+
 class ProductCategory(BaseModel):
     name: str
     count: int
 
 class OrderItemBase(BaseModel):
     product_id: str
-    quantity: str = "1"
+    quantity: IntegerStr = "1"
 
 class OrderItemCreate(BaseModel):
     product_id: str
-    quantity: Optional[str] = "1"
+    quantity: Optional[IntegerStr] = "1"
 
 class OrderItemResponse(OrderItemBase):
     id: str
     order_id: str
-    price: str
+    price: MoneyStr
     product_name: Optional[str] = None
     created_at: datetime
 
@@ -67,18 +75,18 @@ class UserOrderCreate(BaseModel):
 
 class OrderItemCustomResponse(BaseModel):
     id: str
-    product_id: str
-    name: str # Should be product.name
-    quantity: str
-    price: str # Price of the product at the time of order
+    product_id: Optional[str] = None # None once the product is deleted
+    name: str # Product name at the time of order
+    quantity: Optional[IntegerStr] = None
+    price: Optional[MoneyStr] = None # Price of the product at the time of order; None if it was blank
 
 class OrderResponse(BaseModel):
     id: str
     patient_id: str
     prescription_id: Optional[str] = None
-    total: str
+    total: Optional[MoneyStr] = None # None for legacy orders whose total was blank
     status: str
-    points_earned: str
+    points_earned: Optional[IntegerStr] = None
     # Provide date with default value to prevent validation error
     date: Optional[str] = None 
     items: List[OrderItemCustomResponse] = []
@@ -2,8 +2,10 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.types import IntegerStr
+
 class RewardPointBase(BaseModel):
-    points: str
+    points: IntegerStr
     description: str
     source_id: Optional[str] = None
     type: str = "earned"  # "earned" or "redeemed"
@@ -2,11 +2,13 @@ from pydantic import BaseModel
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 
+from app.schemas.types import DateStr, MoneyStr, RateStr
+
 class SeasonBase(BaseModel):
     name: str
-    start_date: str
-    end_date: str
-    multiplier: str
+    start_date: DateStr
+    end_date: DateStr
+    multiplier: RateStr
     description: Optional[str] = None
     is_active: bool = False
 
@@ -15,9 +17,9 @@ class SeasonCreate(SeasonBase):
 
 class SeasonUpdate(BaseModel):
     name: Optional[str] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
-    multiplier: Optional[str] = None
+    start_date: Optional[DateStr] = None
+    end_date: Optional[DateStr] = None
+    multiplier: Optional[RateStr] = None
     description: Optional[str] = None
     is_active: Optional[bool] = None
 
@@ -33,8 +35,8 @@ class RewardConfigBase(BaseModel):
     name: str
     description: Optional[str] = None
     is_active: bool = False
-    base_rate: str
-    season_multiplier: str = "1.0"
+    base_rate: MoneyStr
+    season_multiplier: RateStr = "1.0"
     product_category_rules: str  # JSON string of rules by product category
 
 class RewardConfigCreate(RewardConfigBase):
@@ -44,8 +46,8 @@ class RewardConfigUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     is_active: Optional[bool] = None
-    base_rate: Optional[str] = None
-    season_multiplier: Optional[str] = None
+    base_rate: Optional[MoneyStr] = None
+    season_multiplier: Optional[RateStr] = None
     product_category_rules: Optional[str] = None
 
 class RewardConfigResponse(RewardConfigBase):
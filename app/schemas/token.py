@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 class UserInfo(BaseModel):
     id: str
@@ -10,7 +11,23 @@ class UserInfo(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
     user: Optional[UserInfo] = None
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
 class TokenData(BaseModel):
-    user_id: Optional[str] = None
\ No newline at end of file
+    user_id: Optional[str] = None
+    # Claims carried by access tokens; None for tokens issued before they existed
+    type: Optional[str] = None
+    is_active: Optional[bool] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    jti: Optional[str] = None
+    issued_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
\ No newline at end of file
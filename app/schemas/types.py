@@ -0,0 +1,73 @@
+from pydantic import BeforeValidator
+from typing import Annotated
+from decimal import Decimal, InvalidOperation
+
+from app.models.types import TRUE_STRINGS, FALSE_STRINGS, to_date, to_time
+
+# The API has always sent and accepted money, quantities, points, flags, dates
+# and times as strings ("12.99", "2", "true", "2025-01-01", "09:00"). The
+# columns behind them are now typed; these annotated types keep the wire
+# format, validate input and format values read from the database.
+
+def _to_decimal(value) -> Decimal:
+    if isinstance(value, bool):
+        raise ValueError("must be a number")
+    try:
+        number = Decimal(value.strip() if isinstance(value, str) else str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError("must be a number")
+    if not number.is_finite():
+        raise ValueError("must be a finite number")
+    return number
+
+# Format a money amount with two decimals ("12.99")
+def money_str(value) -> str:
+    return f"{_to_decimal(value):.2f}"
+
+# Format a whole number ("2"); "2.0" is accepted, "2.5" is not
+def integer_str(value) -> str:
+    number = _to_decimal(value)
+    if number != number.to_integral_value():
+        raise ValueError("must be a whole number")
+    return str(int(number))
+
+# Format value with formatter, passing None through: blank legacy values were
+# migrated to NULL, and nullable columns read back as None
+def optional_str(formatter, value):
+    return None if value is None else formatter(value)
+
+# Format a rate or multiplier the way it was stored as a string ("1.0", "1.25")
+def rate_str(value) -> str:
+    return str(float(_to_decimal(value)))
+
+# Format a flag as "true" or "false"
+def flag_str(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    normalized = str(value).strip().lower()
+    if normalized in TRUE_STRINGS:
+        return "true"
+    if normalized in FALSE_STRINGS:
+        return "false"
+    raise ValueError("must be true or false")
+
+# Format a date as "YYYY-MM-DD"
+def date_str(value) -> str:
+    try:
+        return to_date(value).isoformat()
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("must be a date (YYYY-MM-DD)")
+
+# Format a time of day as "HH:MM"
+def time_str(value) -> str:
+    try:
+        return to_time(value).strftime("%H:%M")
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("must be a time (HH:MM)")
+
+MoneyStr = Annotated[str, BeforeValidator(money_str)]
+IntegerStr = Annotated[str, BeforeValidator(integer_str)]
+RateStr = Annotated[str, BeforeValidator(rate_str)]
+FlagStr = Annotated[str, BeforeValidator(flag_str)]
+DateStr = Annotated[str, BeforeValidator(date_str)]
+TimeStr = Annotated[str, BeforeValidator(time_str)]
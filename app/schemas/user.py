@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 
 class UserBase(BaseModel):
@@ -12,6 +12,8 @@ class UserCreate(UserBase):
     address: Optional[str] = None
     specialization: Optional[str] = None  # For clinics
     location: Optional[str] = None  # For clinics
+    latitude: Optional[float] = Field(None, ge=-90, le=90)  # For clinics
+    longitude: Optional[float] = Field(None, ge=-180, le=180)  # For clinics
     date_of_birth: Optional[str] = None  # For patients
 
 class UserUpdate(BaseModel):
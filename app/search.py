@@ -0,0 +1,242 @@
+"""
+Full-text clinic and product search.
+
+The clinic_search table indexes each clinic's name (from its user), plus its
+specialization, location and address. On SQLite it is an FTS5 virtual table
+ranked with bm25. On PostgreSQL it holds one weighted tsvector per clinic
+under a GIN index and is ranked with ts_rank_cd. Neither index can follow a
+join to users, so the application writes the rows: index_clinics() is called
+in the same transaction as every write that changes an indexed field
+(registration, update_clinic, seeding). Called without ids, it rebuilds
+the whole index.
+
+product_search indexes each product's name, category and description the
+same way. index_products() is called by add_product, update_product and
+delete_product in the transaction that writes the product.
+
+Queries are split into words and every word must match, as a prefix, so
+"card nor" finds "Cardio Health Specialists" in "Northend". Search syntax
+is never passed through from the client.
+"""
+from sqlalchemy import Boolean, DateTime, bindparam, event, text
+import re
+
+from app.database import Base
+
+# Relative weight of name, specialization, location and address matches
+CLINIC_SEARCH_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+# Relative weight of product name, category and description matches
+PRODUCT_SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+MAX_SEARCH_TERMS = 8
+# Tables managed here rather than by the models; FTS5 adds shadow tables
+# (clinic_search_data, ...) with the same prefix
+SEARCH_TABLES = ("clinic_search", "product_search")
+
+WORD = re.compile(r"[^\W_]+")
+
+
+# Words of a search query, lowercased; anything that is not a letter or digit separates words
+def search_terms(query: str) -> list:
+    return WORD.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+
+# Dialect of a Session or Connection
+def _dialect_name(bind) -> str:
+    return bind.get_bind().dialect.name if hasattr(bind, "get_bind") else bind.dialect.name
+
+
+# Create the index for the connection's dialect (used by migration 0008)
+def create_clinic_search(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS clinic_search ("
+            "clinic_id VARCHAR PRIMARY KEY REFERENCES clinics (id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_clinic_search_document ON clinic_search USING GIN (document)"
+        ))
+    else:
+        # Prefix indexes keep search-as-you-type queries ("car*") off a full term scan
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS clinic_search USING fts5("
+            "clinic_id UNINDEXED, name, specialization, location, address, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+
+
+def drop_clinic_search(connection):
+    connection.execute(text("DROP TABLE IF EXISTS clinic_search"))
+
+
+# Create the product index for the connection's dialect (used by migration 0018)
+def create_product_search(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS product_search ("
+            "product_id VARCHAR PRIMARY KEY REFERENCES products (id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_product_search_document ON product_search USING GIN (document)"
+        ))
+    else:
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5("
+            "product_id UNINDEXED, name, category, description, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+
+
+def drop_product_search(connection):
+    connection.execute(text("DROP TABLE IF EXISTS product_search"))
+
+
+# Databases built with create_all (tests, benchmarks) get the indexes too
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_tables(metadata, connection, **kw):
+    create_clinic_search(connection)
+    create_product_search(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_tables(metadata, connection, **kw):
+    drop_product_search(connection)
+    drop_clinic_search(connection)
+
+
+# (Re)index the given clinics, or every clinic when clinic_ids is None.
+# bind is a Session or Connection; the caller commits.
+def index_clinics(bind, clinic_ids=None):
+    if clinic_ids is not None and not clinic_ids:
+        return
+    where = "" if clinic_ids is None else " WHERE clinics.id IN :clinic_ids"
+    if _dialect_name(bind) == "postgresql":
+        select_rows = (
+            "SELECT clinics.id, "
+            "setweight(to_tsvector('simple', coalesce(users.name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(clinics.specialization, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(clinics.location, '')), 'C') || "
+            "setweight(to_tsvector('simple', coalesce(clinics.address, '')), 'D') "
+            "FROM clinics JOIN users ON users.id = clinics.id"
+        )
+        insert = f"INSERT INTO clinic_search (clinic_id, document) {select_rows}{where}"
+    else:
+        insert = (
+            "INSERT INTO clinic_search (clinic_id, name, specialization, location, address) "
+            "SELECT clinics.id, users.name, clinics.specialization, clinics.location, clinics.address "
+            f"FROM clinics JOIN users ON users.id = clinics.id{where}"
+        )
+    if clinic_ids is None:
+        bind.execute(text("DELETE FROM clinic_search"))
+        bind.execute(text(insert))
+        return
+    params = {"clinic_ids": list(clinic_ids)}
+    delete = text("DELETE FROM clinic_search WHERE clinic_id IN :clinic_ids")
+    bind.execute(delete.bindparams(bindparam("clinic_ids", expanding=True)), params)
+    bind.execute(text(insert).bindparams(bindparam("clinic_ids", expanding=True)), params)
+
+
+# (Re)index the given products, or every product when product_ids is None.
+# Ids of deleted products just drop out of the index. bind is a Session or
+# Connection; the caller commits.
+def index_products(bind, product_ids=None):
+    if product_ids is not None and not product_ids:
+        return
+    where = "" if product_ids is None else " WHERE products.id IN :product_ids"
+    if _dialect_name(bind) == "postgresql":
+        insert = (
+            "INSERT INTO product_search (product_id, document) SELECT products.id, "
+            "setweight(to_tsvector('simple', coalesce(products.name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(products.category, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(products.description, '')), 'D') "
+            f"FROM products{where}"
+        )
+    else:
+        insert = (
+            "INSERT INTO product_search (product_id, name, category, description) "
+            f"SELECT products.id, products.name, products.category, products.description FROM products{where}"
+        )
+    if product_ids is None:
+        bind.execute(text("DELETE FROM product_search"))
+        bind.execute(text(insert))
+        return
+    params = {"product_ids": list(product_ids)}
+    delete = text("DELETE FROM product_search WHERE product_id IN :product_ids")
+    bind.execute(delete.bindparams(bindparam("product_ids", expanding=True)), params)
+    bind.execute(text(insert).bindparams(bindparam("product_ids", expanding=True)), params)
+
+
+# Active clinics matching every word of query, best match first.
+# Returns rows with the same columns as the clinic directory.
+def search_clinics(db, query: str, limit: int, offset: int = 0):
+    terms = search_terms(query)
+    if not terms:
+        return []
+    columns = (
+        "clinics.id, users.name, users.email, clinics.phone, clinics.address, clinics.location, "
+        "clinics.specialization, clinics.latitude, clinics.longitude, users.is_active, "
+        "clinics.created_at, clinics.updated_at"
+    )
+    if _dialect_name(db) == "postgresql":
+        match = " & ".join(f"{term}:*" for term in terms)
+        statement = (
+            f"SELECT {columns}, ts_rank_cd('{{0.1, 0.3, 0.5, 1.0}}', clinic_search.document, q.query) AS score "
+            "FROM clinic_search, to_tsquery('simple', :match) AS q(query), clinics, users "
+            "WHERE clinic_search.document @@ q.query AND clinics.id = clinic_search.clinic_id "
+            "AND users.id = clinics.id AND users.is_active "
+            "ORDER BY score DESC, clinics.id LIMIT :limit OFFSET :offset"
+        )
+    else:
+        # Terms are quoted, so FTS5 operators in user input are plain text
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in (0.0,) + CLINIC_SEARCH_WEIGHTS)
+        # bm25 scores are negative; lower is better
+        statement = (
+            f"SELECT {columns}, bm25(clinic_search, {weights}) AS score "
+            "FROM clinic_search JOIN clinics ON clinics.id = clinic_search.clinic_id "
+            "JOIN users ON users.id = clinics.id "
+            "WHERE clinic_search MATCH :match AND users.is_active "
+            "ORDER BY score, clinics.id LIMIT :limit OFFSET :offset"
+        )
+    statement = text(statement).columns(
+        is_active=Boolean, created_at=DateTime(timezone=True), updated_at=DateTime(timezone=True)
+    )
+    return db.execute(statement, {"match": match, "limit": limit, "offset": offset}).all()
+
+
+# Products matching every word of query, best match first, optionally within a category.
+# Returns rows with the same columns as ProductResponse.
+def search_products(db, query: str, limit: int, offset: int = 0, category: str = None):
+    terms = search_terms(query)
+    if not terms:
+        return []
+    columns = (
+        "products.id, products.clinic_id, products.name, products.description, products.price, "
+        "products.category, products.in_stock, products.image_url, products.created_at, products.updated_at"
+    )
+    in_category = " AND products.category = :category" if category else ""
+    if _dialect_name(db) == "postgresql":
+        match = " & ".join(f"{term}:*" for term in terms)
+        statement = (
+            f"SELECT {columns}, ts_rank_cd('{{0.1, 0.3, 0.5, 1.0}}', product_search.document, q.query) AS score "
+            "FROM product_search, to_tsquery('simple', :match) AS q(query), products "
+            "WHERE product_search.document @@ q.query AND products.id = product_search.product_id"
+            f"{in_category} ORDER BY score DESC, products.id LIMIT :limit OFFSET :offset"
+        )
+    else:
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in (0.0,) + PRODUCT_SEARCH_WEIGHTS)
+        statement = (
+            f"SELECT {columns}, bm25(product_search, {weights}) AS score "
+            "FROM product_search JOIN products ON products.id = product_search.product_id "
+            f"WHERE product_search MATCH :match{in_category} "
+            "ORDER BY score, products.id LIMIT :limit OFFSET :offset"
+        )
+    statement = text(statement).columns(
+        in_stock=Boolean, created_at=DateTime(timezone=True), updated_at=DateTime(timezone=True)
+    )
+    params = {"match": match, "limit": limit, "offset": offset}
+    if category:
+        params["category"] = category
+    return db.execute(statement, params).all()
@@ -0,0 +1,225 @@
+"""
+Opt-in slow-query recorder.
+
+With SLOW_QUERY_LOG=true every engine created by app.database reports each
+statement here. Statements are normalized into fingerprints (literals and
+bound parameters replaced by ?, IN lists collapsed), and each fingerprint
+keeps a call count, total and max latency and a latency histogram.
+Statements slower than SLOW_QUERY_THRESHOLD_MS also get their plan captured
+with EXPLAIN on the same connection. The last few slow samples are kept per
+fingerprint, and each one is appended to SLOW_QUERY_LOG_PATH as a JSON line
+when that path is set. Samples record only the shape of the bound parameters
+(their type names), never the values, which can hold emails and password
+hashes; the values are used only by the in-process EXPLAIN.
+
+Admins read the report at /api/admin/db/slow-queries.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import event
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_LOG = os.environ.get("SLOW_QUERY_LOG", "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "100"))
+SLOW_QUERY_LOG_PATH = os.environ.get("SLOW_QUERY_LOG_PATH")
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.environ.get("SLOW_QUERY_MAX_FINGERPRINTS", "1000"))
+SLOW_QUERY_SAMPLES = int(os.environ.get("SLOW_QUERY_SAMPLES", "5"))
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+}
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PARAMS = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so calls that differ only in values share a fingerprint."""
+    normalized = _COMMENTS.sub(" ", statement)
+    normalized = _STRINGS.sub("?", normalized)
+    normalized = _PARAMS.sub("?", normalized)
+    normalized = _NUMBERS.sub("?", normalized)
+    normalized = _IN_LISTS.sub("(?...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Type names of bound parameters, so samples never carry the values."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "shape": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None if parameters is None else type(parameters).__name__
+
+
+class FingerprintStats:
+    """Latency summary for one statement fingerprint."""
+
+    def __init__(self, normalized: str):
+        self.id = fingerprint_id(normalized)
+        self.fingerprint = normalized
+        self.calls = 0
+        self.slow_calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples = []
+
+    def record(self, elapsed_ms: float):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self) -> dict:
+        histogram = {f"le_{bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)}
+        histogram[f"gt_{LATENCY_BUCKETS_MS[-1]}ms"] = self.buckets[-1]
+        return {
+            "id": self.id,
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "slow_calls": self.slow_calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "histogram": histogram,
+            "samples": list(self.samples),
+        }
+
+
+class SlowQueryLog:
+    """Thread-safe per-fingerprint statistics with plan capture for slow statements."""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, log_path: str = SLOW_QUERY_LOG_PATH,
+                 max_fingerprints: int = SLOW_QUERY_MAX_FINGERPRINTS, samples: int = SLOW_QUERY_SAMPLES):
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        self.max_fingerprints = max_fingerprints
+        self.samples = samples
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+
+    def attach(self, engine):
+        """Start recording statements run on engine."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def detach(self, engine):
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        elapsed_ms = (time.perf_counter() - context._slow_query_start) * 1000
+        sample = None
+        if elapsed_ms >= self.threshold_ms:
+            sample = {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "duration_ms": round(elapsed_ms, 3),
+                "statement": statement,
+                "parameters": parameter_shape(parameters, executemany),
+                "plan": None if executemany else self._explain(conn, cursor, statement, parameters),
+            }
+        self.record(statement, elapsed_ms, sample)
+
+    def _explain(self, conn, cursor, statement, parameters):
+        prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if prefix is None or not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        # On PostgreSQL a failed statement aborts the transaction, so the
+        # EXPLAIN runs inside a savepoint that is rolled back on error
+        use_savepoint = conn.dialect.name == "postgresql"
+        explain_cursor = cursor.connection.cursor()
+        try:
+            if use_savepoint:
+                explain_cursor.execute("SAVEPOINT slow_query_explain")
+            explain_cursor.execute(prefix + statement, parameters)
+            plan = [" | ".join(str(value) for value in row) for row in explain_cursor.fetchall()]
+            if use_savepoint:
+                explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as e:
+            logger.debug(f"Could not explain slow statement: {e}")
+            if use_savepoint:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return None
+        finally:
+            explain_cursor.close()
+
+    def record(self, statement: str, elapsed_ms: float, sample: dict = None):
+        normalized = fingerprint(statement)
+        with self._lock:
+            stats = self._stats.get(normalized)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    return
+                stats = self._stats[normalized] = FingerprintStats(normalized)
+            stats.record(elapsed_ms)
+            if sample is not None:
+                stats.slow_calls += 1
+                stats.samples.append(sample)
+                del stats.samples[:-self.samples]
+        if sample is not None:
+            logger.warning(f"Slow query ({elapsed_ms:.1f}ms) [{stats.id}]: {normalized}")
+            if self.log_path:
+                self._append(dict(sample, id=stats.id, fingerprint=normalized))
+
+    def _append(self, entry: dict):
+        line = json.dumps(entry, default=str)
+        with self._file_lock:
+            with open(self.log_path, "a", encoding="utf-8") as log_file:
+                log_file.write(line + "\n")
+
+    def report(self, order_by: str = "total_ms", limit: int = 50) -> list:
+        """Fingerprint summaries, heaviest first."""
+        with self._lock:
+            entries = [stats.to_dict() for stats in self._stats.values()]
+        entries.sort(key=lambda entry: entry[order_by], reverse=True)
+        return entries[:limit]
+
+    def dump_jsonl(self) -> str:
+        """All fingerprint summaries, one JSON object per line."""
+        return "".join(json.dumps(entry, default=str) + "\n" for entry in self.report(limit=self.max_fingerprints))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# Process-wide recorder, attached to every engine when SLOW_QUERY_LOG is on
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,370 @@
+"""
+Synthetic dataset generator for load and performance testing.
+
+app/sample_data.py creates a handful of rows one ORM object at a time. This
+module produces production-shaped volumes with referential integrity: clinics
+with services and products, patients, appointments with the slots they
+claim, orders with their items and reward point transactions. Rows are written with bulk Core inserts,
+CHUNK_SIZE rows per statement and one commit per chunk. Every synthetic
+account shares a single password hash, so bcrypt runs once.
+
+Output is deterministic for a given seed: ids are uuid5 values derived from
+the seed, and all timestamps are relative to a fixed anchor date rather than
+the current time. Running the generator twice with the same seed into the
+same database is refused.
+
+    python -m app.synthetic_data --scale large --seed 42
+    python -m app.synthetic_data --clinics 100 --patients 10000 --orders 50000
+
+Scales: small (50 clinics, 5k patients, 20k orders), medium (1k, 100k, 1M)
+and large (10k clinics, 1M patients, 10M orders, about 25M order items).
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import insert
+import argparse
+import hashlib
+import logging
+import os
+import random
+import time
+import uuid
+
+from app.auth import get_password_hash
+from app.availability import SLOT_MINUTES, service_span, slot_starts
+from app.geo import encode as geohash_encode
+from app.models.users import User
+from app.models.clinics import Clinic, ClinicService
+from app.models.patients import Patient
+from app.models.appointments import Appointment, AppointmentSlot
+from app.models.products import Product, Order, OrderItem
+from app.models.rewards import RewardPoint
+from app.search import index_clinics, index_products
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = int(os.environ.get("SYNTHETIC_CHUNK_SIZE", "5000"))
+# Password of every synthetic account
+SYNTHETIC_PASSWORD = "password123"
+# Timestamps are spread over the period before this date
+DEFAULT_ANCHOR = datetime(2026, 1, 1, tzinfo=timezone.utc)
+HISTORY_DAYS = 365
+
+SCALES = {
+    "small": {"clinics": 50, "patients": 5_000, "orders": 20_000, "appointments": 10_000},
+    "medium": {"clinics": 1_000, "patients": 100_000, "orders": 1_000_000, "appointments": 200_000},
+    "large": {"clinics": 10_000, "patients": 1_000_000, "orders": 10_000_000, "appointments": 2_000_000},
+}
+
+# Tables in foreign-key order; buffered rows are always written in this order
+TABLES = [
+    User.__table__,
+    Clinic.__table__,
+    ClinicService.__table__,
+    Product.__table__,
+    Patient.__table__,
+    Appointment.__table__,
+    AppointmentSlot.__table__,
+    Order.__table__,
+    OrderItem.__table__,
+    RewardPoint.__table__,
+]
+
+LOCATIONS = [
+    "City Center", "Westside", "Northend", "Eastgate", "Riverside", "Old Town", "Harbor",
+    "University District", "Hillcrest", "Lakeside", "Southpark", "Midtown",
+]
+# Clinics cluster around these metro areas (latitude, longitude)
+METROS = [
+    (40.7128, -74.0060), (34.0522, -118.2437), (41.8781, -87.6298), (29.7604, -95.3698),
+    (33.4484, -112.0740), (39.9526, -75.1652), (32.7157, -117.1611), (47.6062, -122.3321),
+    (25.7617, -80.1918), (39.7392, -104.9903), (42.3601, -71.0589), (45.5152, -122.6784),
+]
+METRO_SPREAD_DEGREES = 0.15
+SPECIALIZATIONS = [
+    "General Practice", "Family Medicine", "Cardiology", "Dermatology", "Pediatrics",
+    "Orthopedics", "Physiotherapy", "Dentistry", "Ophthalmology", "Nutrition",
+]
+# (name, price, minutes)
+SERVICES = [
+    ("General Checkup", "50.00", 30), ("Consultation", "35.00", 15), ("Follow-up Visit", "25.00", 15),
+    ("Blood Test", "40.00", 20), ("Vaccination", "30.00", 15), ("Specialist Assessment", "120.00", 60),
+    ("Physical Therapy Session", "80.00", 45),
+]
+PRODUCT_CATEGORIES = ["Vitamins", "First Aid", "Devices", "Personal Care", "Supplements", "Medication"]
+PRODUCT_NOUNS = {
+    "Vitamins": ["Vitamin C", "Vitamin D3", "Multivitamin", "B Complex", "Zinc"],
+    "First Aid": ["Bandages", "Gauze Pads", "Antiseptic Wipes", "First Aid Kit", "Medical Tape"],
+    "Devices": ["Thermometer", "Blood Pressure Monitor", "Pulse Oximeter", "Glucose Meter", "Nebulizer"],
+    "Personal Care": ["Sunscreen", "Hand Sanitizer", "Moisturizer", "Lip Balm", "Eye Drops"],
+    "Supplements": ["Omega-3", "Probiotic", "Magnesium", "Iron", "Collagen"],
+    "Medication": ["Ibuprofen", "Paracetamol", "Antihistamine", "Cough Syrup", "Antacid"],
+}
+PRODUCT_ADJECTIVES = ["Essential", "Premium", "Daily", "Advanced", "Gentle", "Extra Strength", "Family Pack"]
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Wei", "Aisha",
+    "Carlos", "Yuki", "Priya", "Olga",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Nguyen", "Chen", "Patel",
+]
+ORDER_STATUSES = ["delivered"] * 6 + ["shipped"] * 2 + ["processing", "cancelled"]
+APPOINTMENT_TIMES = [(hour, minute) for hour in range(8, 18) for minute in (0, 30)]
+# Times tried for an appointment before it is generated as cancelled instead
+APPOINTMENT_ATTEMPTS = 5
+CENT = Decimal("0.01")
+
+
+# Buffers rows per table and writes them with executemany inserts
+class ChunkedInserter:
+    def __init__(self, connection, chunk_size: int = CHUNK_SIZE):
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.buffers = {table: [] for table in TABLES}
+        self.counts = {table.name: 0 for table in TABLES}
+
+    def add(self, table, row: dict):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self.flush()
+
+    # Rows are only ever added after the rows they reference, so writing the
+    # tables in foreign-key order keeps every chunk consistent
+    def flush(self):
+        for table, buffer in self.buffers.items():
+            if buffer:
+                self.connection.execute(insert(table), buffer)
+                self.counts[table.name] += len(buffer)
+                buffer.clear()
+        self.connection.commit()
+
+
+# Deterministic id for the index-th row of a kind, so rows can reference
+# each other without keeping millions of ids in memory. Same value as
+# str(uuid.uuid5(namespace, f"{kind}/{index}")), formatted directly from the
+# digest because uuid.UUID construction dominated generation time.
+def synthetic_id(namespace: uuid.UUID, kind: str, index: int) -> str:
+    h = hashlib.sha1(namespace.bytes + f"{kind}/{index}".encode()).hexdigest()
+    return f"{h[:8]}-{h[8:12]}-5{h[13:16]}-{_UUID_VARIANT[h[16]]}{h[17:20]}-{h[20:32]}"
+
+
+# RFC 4122 variant nibble for each first hex digit of clock_seq_hi
+_UUID_VARIANT = {digit: "89ab"[int(digit, 16) & 3] for digit in "0123456789abcdef"}
+
+
+# Namespace shared by every id generated for a seed
+def seed_namespace(seed: int) -> uuid.UUID:
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"medimarket-synthetic/{seed}")
+
+
+# Generate a dataset into the database behind connection; returns row counts per table
+def generate(connection, clinics: int, patients: int, orders: int, appointments: int, seed: int = 0,
+             chunk_size: int = CHUNK_SIZE, services_per_clinic: int = 5, products_per_clinic: int = 20,
+             anchor: datetime = DEFAULT_ANCHOR) -> dict:
+    if clinics < 1 or patients < 1:
+        raise ValueError("At least one clinic and one patient are required")
+    rng = random.Random(seed)
+    namespace = seed_namespace(seed)
+    if connection.execute(
+        User.__table__.select().where(User.__table__.c.id == synthetic_id(namespace, "clinic", 0))
+    ).first():
+        raise ValueError(f"A synthetic dataset with seed {seed} already exists in this database")
+
+    inserter = ChunkedInserter(connection, chunk_size)
+    services_per_clinic = min(services_per_clinic, len(SERVICES))
+    password_hash = get_password_hash(SYNTHETIC_PASSWORD)
+    history = timedelta(days=HISTORY_DAYS)
+
+    def past(span: timedelta = history) -> datetime:
+        return anchor - timedelta(seconds=rng.randrange(int(span.total_seconds())))
+
+    # Clinics, each with a fixed set of services and a product catalog
+    started = time.perf_counter()
+    service_minutes = []
+    product_prices = []
+    product_details = []  # (name, category, clinic_id), snapshotted onto order items
+    for c in range(clinics):
+        clinic_id = synthetic_id(namespace, "clinic", c)
+        location = rng.choice(LOCATIONS)
+        specialization = rng.choice(SPECIALIZATIONS)
+        metro_lat, metro_lng = rng.choice(METROS)
+        latitude = round(metro_lat + rng.gauss(0, METRO_SPREAD_DEGREES), 6)
+        longitude = round(metro_lng + rng.gauss(0, METRO_SPREAD_DEGREES), 6)
+        created_at = past(3 * history)
+        inserter.add(User.__table__, {
+            "id": clinic_id, "email": f"clinic{c}.s{seed}@synthetic.example.com",
+            "hashed_password": password_hash, "name": f"{location} {specialization} Clinic {c}",
+            "type": "clinic", "is_active": True, "created_at": created_at,
+        })
+        inserter.add(Clinic.__table__, {
+            "id": clinic_id, "phone": f"555-{rng.randrange(1000):03d}-{rng.randrange(10000):04d}",
+            "address": f"{rng.randrange(1, 2000)} {rng.choice(LAST_NAMES)} St, {location}",
+            "location": location, "specialization": specialization, "latitude": latitude,
+            "longitude": longitude, "geohash": geohash_encode(latitude, longitude), "created_at": created_at,
+        })
+        for s, (name, price, minutes) in enumerate(rng.sample(SERVICES, services_per_clinic)):
+            service_minutes.append(minutes)
+            inserter.add(ClinicService.__table__, {
+                "id": synthetic_id(namespace, "service", c * services_per_clinic + s), "clinic_id": clinic_id,
+                "name": name, "description": f"{name} at {location}", "price": Decimal(price),
+                "duration": minutes, "available": rng.random() < 0.95, "created_at": created_at,
+            })
+        for p in range(products_per_clinic):
+            category = rng.choice(PRODUCT_CATEGORIES)
+            price = Decimal(rng.randrange(199, 19999)) * CENT
+            name = f"{rng.choice(PRODUCT_ADJECTIVES)} {rng.choice(PRODUCT_NOUNS[category])}"
+            product_prices.append(price)
+            product_details.append((name, category, clinic_id))
+            inserter.add(Product.__table__, {
+                "id": synthetic_id(namespace, "product", c * products_per_clinic + p), "clinic_id": clinic_id,
+                "name": name,
+                "description": f"{category} product sold by clinic {c}", "price": price, "category": category,
+                "in_stock": rng.random() < 0.9, "created_at": created_at,
+            })
+    inserter.flush()
+    index_clinics(connection)
+    index_products(connection)
+    connection.commit()
+    logger.info(f"Generated {clinics} clinics in {time.perf_counter() - started:.1f}s")
+
+    # Patients
+    started = time.perf_counter()
+    for p in range(patients):
+        patient_id = synthetic_id(namespace, "patient", p)
+        created_at = past(3 * history)
+        inserter.add(User.__table__, {
+            "id": patient_id, "email": f"patient{p}.s{seed}@synthetic.example.com",
+            "hashed_password": password_hash, "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "type": "patient", "is_active": rng.random() < 0.98, "created_at": created_at,
+        })
+        inserter.add(Patient.__table__, {
+            "id": patient_id, "phone": f"555-{rng.randrange(1000):03d}-{rng.randrange(10000):04d}",
+            "address": f"{rng.randrange(1, 2000)} {rng.choice(LAST_NAMES)} Ave, {rng.choice(LOCATIONS)}",
+            "date_of_birth": f"{rng.randrange(1940, 2010)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "created_at": created_at,
+        })
+    inserter.flush()
+    logger.info(f"Generated {patients} patients in {time.perf_counter() - started:.1f}s")
+
+    # Order activity is skewed: a minority of patients place most orders
+    def some_patient() -> int:
+        return int(patients * rng.random() ** 2)
+
+    # Appointments, two months either side of the anchor. Every appointment that
+    # is not cancelled claims its slots, as a booking through the API would;
+    # taken[clinic * days + day] is a bitmask of the claimed slots, so none overlap.
+    # An appointment that finds no free time is generated as cancelled.
+    started = time.perf_counter()
+    days = 120
+    taken = {}
+    for a in range(appointments):
+        appointment_id = synthetic_id(namespace, "appointment", a)
+        clinic = rng.randrange(clinics)
+        service = clinic * services_per_clinic + rng.randrange(services_per_clinic)
+        day_index = rng.randrange(days)
+        day = anchor + timedelta(days=day_index - days // 2)
+        key = clinic * days + day_index
+        status = (rng.choice(["completed"] * 9 + ["cancelled"]) if day < anchor
+                  else rng.choice(["confirmed", "pending"]))
+        span = service_span(service_minutes[service]) // SLOT_MINUTES
+        for _ in range(APPOINTMENT_ATTEMPTS):
+            hour, minute = rng.choice(APPOINTMENT_TIMES)
+            start = hour * 60 + minute
+            start -= start % SLOT_MINUTES  # On the slot grid whatever SLOT_MINUTES is
+            slots = ((1 << span) - 1) << (start // SLOT_MINUTES)
+            if not taken.get(key, 0) & slots:
+                break
+        else:
+            status = "cancelled"
+        start_at = day.replace(hour=start // 60, minute=start % 60, second=0, microsecond=0, tzinfo=None)
+        inserter.add(Appointment.__table__, {
+            "id": appointment_id,
+            "patient_id": synthetic_id(namespace, "patient", some_patient()),
+            "clinic_id": synthetic_id(namespace, "clinic", clinic),
+            "service_id": synthetic_id(namespace, "service", service),
+            "date": start_at.date(), "time": start_at.time(), "start_at": start_at,
+            "status": status,
+            "created_at": day - timedelta(days=rng.randrange(1, 30)),
+        })
+        if status != "cancelled":
+            taken[key] = taken.get(key, 0) | slots
+            for slot in slot_starts(start, span * SLOT_MINUTES):
+                inserter.add(AppointmentSlot.__table__, {
+                    "clinic_id": synthetic_id(namespace, "clinic", clinic), "date": start_at.date().isoformat(),
+                    "start": slot, "appointment_id": appointment_id,
+                })
+    inserter.flush()
+    logger.info(f"Generated {appointments} appointments in {time.perf_counter() - started:.1f}s")
+
+    # Orders from a single clinic's catalog, with their items and reward points
+    started = time.perf_counter()
+    for o in range(orders):
+        order_id = synthetic_id(namespace, "order", o)
+        patient_id = synthetic_id(namespace, "patient", some_patient())
+        clinic = rng.randrange(clinics)
+        created_at = past()
+        total = Decimal("0.00")
+        for i, p in enumerate(rng.sample(range(products_per_clinic), min(products_per_clinic, rng.randint(1, 4)))):
+            product = clinic * products_per_clinic + p
+            quantity = rng.choice((1, 1, 1, 2, 3))
+            total += product_prices[product] * quantity
+            inserter.add(OrderItem.__table__, {
+                "id": synthetic_id(namespace, "order-item", o * 4 + i), "order_id": order_id,
+                "product_id": synthetic_id(namespace, "product", product), "quantity": quantity,
+                "price": product_prices[product], "product_name": product_details[product][0],
+                "product_category": product_details[product][1], "clinic_id": product_details[product][2],
+                "created_at": created_at,
+            })
+        points = int(total * 10)
+        inserter.add(Order.__table__, {
+            "id": order_id, "patient_id": patient_id, "total": total, "status": rng.choice(ORDER_STATUSES),
+            "points_earned": points, "created_at": created_at,
+        })
+        inserter.add(RewardPoint.__table__, {
+            "id": synthetic_id(namespace, "reward-earned", o), "patient_id": patient_id, "points": points,
+            "description": f"Points earned from order #{order_id[:8]}", "source_id": order_id,
+            "type": "earned", "created_at": created_at,
+        })
+        # Redeeming at most what the order earned keeps every balance non-negative
+        if rng.random() < 0.05:
+            inserter.add(RewardPoint.__table__, {
+                "id": synthetic_id(namespace, "reward-redeemed", o), "patient_id": patient_id,
+                "points": min(points, rng.choice((100, 200, 500))), "description": "Points redeemed at checkout",
+                "source_id": order_id, "type": "redeemed", "created_at": created_at + timedelta(minutes=1),
+            })
+        if o and o % (chunk_size * 20) == 0:
+            logger.info(f"{o} / {orders} orders")
+    inserter.flush()
+    logger.info(f"Generated {orders} orders in {time.perf_counter() - started:.1f}s")
+    return inserter.counts
+
+
+if __name__ == "__main__":
+    from app.bootstrap import run_migrations
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset for load testing.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--clinics", type=int, help="override the scale's clinic count")
+    parser.add_argument("--patients", type=int, help="override the scale's patient count")
+    parser.add_argument("--orders", type=int, help="override the scale's order count")
+    parser.add_argument("--appointments", type=int, help="override the scale's appointment count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    volumes = dict(SCALES[args.scale])
+    for name in volumes:
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+    run_migrations()
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        counts = generate(connection, seed=args.seed, chunk_size=args.chunk_size, **volumes)
+    for table_name, count in counts.items():
+        logger.info(f"{table_name}: {count} rows")
+    logger.info(f"Done in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,61 @@
+"""Shared fixtures: a small seeded SQLite database and an app wired to it."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db, get_read_db
+from app.featured import featured_clinics
+from app.query_stats import QueryStatsMiddleware
+from app.revocation import revocation_filter
+from app.typeahead import product_suggestions
+from app.routes import appointments, clinics, patients, products
+from app.routes.prescriptions import router as prescriptions_router
+from app.routes.rewards import router as rewards_router
+from app.routes.rewards_admin import router as rewards_admin_router
+from app.tests.seed_data import seed
+
+@pytest.fixture(scope="module")
+def seeded_engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('seeded') / 'seeded.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session)
+    # Load the revocation filter up front so its queries don't count against routes
+    revocation_filter.rebuild(session)
+    session.close()
+    # The featured snapshot, catalog counts and typeahead are per process; rebuild them from this database
+    featured_clinics.clear()
+    products.product_counts.clear()
+    product_suggestions.clear()
+    yield engine
+    revocation_filter.clear()
+    featured_clinics.clear()
+    products.product_counts.clear()
+    product_suggestions.clear()
+    engine.dispose()
+
+@pytest.fixture(scope="module")
+def seeded_client(seeded_engine):
+    TestingSession = sessionmaker(bind=seeded_engine)
+
+    def override_get_db():
+        db = TestingSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+    app.include_router(appointments.router, prefix="/api/appointments")
+    app.include_router(clinics.router, prefix="/api/clinics")
+    app.include_router(patients.router, prefix="/api/patients")
+    app.include_router(products.router, prefix="/api/products")
+    app.include_router(prescriptions_router, prefix="/api/prescriptions")
+    app.include_router(rewards_router, prefix="/api/rewards")
+    app.include_router(rewards_admin_router, prefix="/api/rewards")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return TestClient(app)
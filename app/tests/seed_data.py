@@ -0,0 +1,54 @@
+"""Seed data and helpers shared by the route-level test suites."""
+from app.auth import create_access_token
+from app.models.users import User
+from app.models.clinics import Clinic, ClinicService
+from app.models.patients import Patient
+from app.models.appointments import Appointment
+from app.models.products import Product, Order, OrderItem
+from app.models.prescriptions import Prescription, Medication
+from app.models.rewards import RewardPoint, PartnerShop, PartnerShopCategory
+from app.search import index_clinics, index_products
+
+SEED_CLINICS = 5
+SEED_PATIENTS = 20
+SEED_ORDERS_PER_PATIENT = 3
+
+def seed(session):
+    for c in range(SEED_CLINICS):
+        clinic_id = f"clinic{c}"
+        session.add(User(id=clinic_id, email=f"{clinic_id}@example.com", name=f"Clinic {c}", type="clinic"))
+        session.add(Clinic(id=clinic_id, location="City", specialization="General"))
+        session.add(ClinicService(id=f"service{c}", clinic_id=clinic_id, name="Checkup", price="50", duration="30"))
+        for p in range(3):
+            session.add(Product(id=f"product{c}_{p}", clinic_id=clinic_id, name=f"Product {p}", price="9.99",
+                                category=("Vitamins", "First Aid", "Devices")[p]))
+    for p in range(SEED_PATIENTS):
+        patient_id = f"patient{p}"
+        clinic_id = f"clinic{p % SEED_CLINICS}"
+        session.add(User(id=patient_id, email=f"{patient_id}@example.com", name=f"Patient {p}", type="patient"))
+        session.add(Patient(id=patient_id))
+        session.add(Appointment(id=f"appointment{p}", patient_id=patient_id, clinic_id=clinic_id,
+                                service_id=f"service{p % SEED_CLINICS}", date="2025-01-01", time="09:00"))
+        session.add(Prescription(id=f"prescription{p}", patient_id=patient_id, clinic_id=clinic_id, issue_date="2025-01-01"))
+        session.add(Medication(id=f"medication{p}", prescription_id=f"prescription{p}", name="Ibuprofen"))
+        for o in range(SEED_ORDERS_PER_PATIENT):
+            order_id = f"order{p}_{o}"
+            session.add(Order(id=order_id, patient_id=patient_id, total="19.98", points_earned=199, status="processing"))
+            for i in range(2):
+                session.add(OrderItem(id=f"item{p}_{o}_{i}", order_id=order_id, product_id=f"product{p % SEED_CLINICS}_{i}",
+                                      quantity=1, price="9.99", product_name=f"Product {i}",
+                                      product_category=("Vitamins", "First Aid")[i], clinic_id=clinic_id))
+        session.add(RewardPoint(id=f"points{p}", patient_id=patient_id, points=99, description="Order", type="earned"))
+    for s in range(3):
+        session.add(PartnerShop(id=f"shop{s}", name=f"Shop {s}"))
+        for c in range(2):
+            session.add(PartnerShopCategory(id=f"shop{s}_category{c}", partner_shop_id=f"shop{s}", name=f"Category {c}"))
+    session.add(User(id="admin", email="admin@example.com", name="Admin", type="admin"))
+    session.flush()
+    index_clinics(session)
+    index_products(session)
+    session.commit()
+
+def headers_for(user_id, user_type):
+    token = create_access_token({"sub": user_id, "type": user_type, "active": True, "name": user_id, "email": f"{user_id}@example.com"})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,192 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.availability import IntervalIndex, free_slots
+from app.models.appointments import Appointment, AppointmentSlot
+from app.models.clinics import Clinic, ClinicService
+from app.models.users import User
+from app.routes import appointments as appointments_routes
+from app.tests.seed_data import headers_for
+from app.updates.backfill_appointment_slots import backfill
+
+MONDAY = "2030-01-07"
+SUNDAY = "2030-01-06"
+CLINIC = headers_for("slots_clinic", "clinic")
+PATIENT = headers_for("patient1", "patient")
+
+@pytest.fixture(scope="module")
+def session_factory(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    for clinic_id in ("slots_clinic", "hours_clinic", "backfill_clinic"):
+        session.add(User(id=clinic_id, email=f"{clinic_id}@example.com", name=clinic_id, type="clinic"))
+        session.add(Clinic(id=clinic_id))
+    session.add(ClinicService(id="slots_30", clinic_id="slots_clinic", name="Checkup", price="50", duration="30"))
+    session.add(ClinicService(id="slots_50", clinic_id="slots_clinic", name="Scan", price="90", duration="50"))
+    session.add(ClinicService(id="slots_off", clinic_id="slots_clinic", name="Paused", price="10", duration="15",
+                              available=False))
+    session.add(ClinicService(id="hours_30", clinic_id="hours_clinic", name="Checkup", price="50", duration="30"))
+    session.add(ClinicService(id="backfill_30", clinic_id="backfill_clinic", name="Checkup", price="50", duration="30"))
+    session.commit()
+    session.close()
+    return sessionmaker(bind=seeded_engine)
+
+def availability(client, clinic_id, service_id, day):
+    response = client.get(f"/api/appointments/availability?clinic_id={clinic_id}&service_id={service_id}&date={day}")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def book(client, time, service_id="slots_30", day=MONDAY):
+    return client.post("/api/appointments/", headers=PATIENT,
+                       json={"clinic_id": "slots_clinic", "service_id": service_id, "date": day, "time": time})
+
+# --- Interval index ---
+
+def test_interval_index_merges_and_finds_overlaps():
+    index = IntervalIndex([(60, 90), (0, 30), (30, 45), (80, 120)])
+    assert len(index) == 2  # [0, 45) and [60, 120)
+    assert index.overlaps(40, 50)
+    assert not index.overlaps(45, 60)
+    assert index.overlaps(119, 200)
+    assert not index.overlaps(120, 200)
+
+def test_free_slots_skip_booked_and_past_times():
+    booked = IntervalIndex([(600, 630)])
+    opening = [(540, 720)]
+    assert free_slots(opening, booked, 30, date(2030, 1, 7), now=datetime(2030, 1, 1)) == [
+        540, 555, 570, 630, 645, 660, 675, 690
+    ]
+    assert free_slots(opening, booked, 30, date(2030, 1, 7), now=datetime(2030, 1, 7, 11, 0)) == [660, 675, 690]
+    assert free_slots(opening, booked, 30, date(2030, 1, 7), now=datetime(2030, 1, 8)) == []
+
+# --- Availability and opening hours ---
+
+def test_default_hours_are_weekdays_nine_to_five(session_factory, seeded_client):
+    monday = availability(seeded_client, "hours_clinic", "hours_30", MONDAY)
+    assert monday["duration"] == 30
+    assert monday["slots"][0] == "09:00"
+    assert monday["slots"][-1] == "16:30"
+    assert len(monday["slots"]) == 31
+    assert availability(seeded_client, "hours_clinic", "hours_30", SUNDAY)["slots"] == []
+
+def test_clinic_sets_opening_hours(session_factory, seeded_client):
+    hours = [
+        {"weekday": 0, "opens": "13:00", "closes": "14:00"},
+        {"weekday": 0, "opens": "08:00", "closes": "09:00"},
+        {"weekday": 6, "opens": "10:00", "closes": "10:30"},
+    ]
+    headers = headers_for("hours_clinic", "clinic")
+    response = seeded_client.put("/api/clinics/hours_clinic/hours", headers=headers, json=hours)
+    assert response.status_code == 200, response.text
+    assert seeded_client.get("/api/clinics/hours_clinic/hours").json() == sorted(hours, key=lambda h: (h["weekday"], h["opens"]))
+    assert availability(seeded_client, "hours_clinic", "hours_30", MONDAY)["slots"] == [
+        "08:00", "08:15", "08:30", "13:00", "13:15", "13:30"
+    ]
+    assert availability(seeded_client, "hours_clinic", "hours_30", SUNDAY)["slots"] == ["10:00"]
+    # Tuesday is now closed
+    assert availability(seeded_client, "hours_clinic", "hours_30", "2030-01-08")["slots"] == []
+
+@pytest.mark.parametrize("hours,status", [
+    ([{"weekday": 0, "opens": "10:00", "closes": "09:00"}], 400),
+    ([{"weekday": 0, "opens": "09:00", "closes": "12:00"}, {"weekday": 0, "opens": "11:00", "closes": "13:00"}], 400),
+    ([{"weekday": 0, "opens": "9am", "closes": "12:00"}], 400),
+    ([{"weekday": 7, "opens": "09:00", "closes": "12:00"}], 422),
+])
+def test_invalid_opening_hours_are_rejected(session_factory, seeded_client, hours, status):
+    headers = headers_for("hours_clinic", "clinic")
+    assert seeded_client.put("/api/clinics/hours_clinic/hours", headers=headers, json=hours).status_code == status
+
+def test_only_the_clinic_sets_its_hours(session_factory, seeded_client):
+    hours = [{"weekday": 0, "opens": "09:00", "closes": "12:00"}]
+    assert seeded_client.put("/api/clinics/hours_clinic/hours", headers=CLINIC, json=hours).status_code == 403
+
+def test_unavailable_service_has_no_slots(session_factory, seeded_client):
+    assert availability(seeded_client, "slots_clinic", "slots_off", MONDAY)["slots"] == []
+    assert book(seeded_client, "09:00", service_id="slots_off").status_code == 400
+
+def test_availability_validates_input(session_factory, seeded_client):
+    response = seeded_client.get("/api/appointments/availability?clinic_id=slots_clinic&service_id=slots_30&date=07/01/2030")
+    assert response.status_code == 400
+    response = seeded_client.get(f"/api/appointments/availability?clinic_id=hours_clinic&service_id=slots_30&date={MONDAY}")
+    assert response.status_code == 404
+
+# --- Booking ---
+
+def test_booking_takes_its_slots(session_factory, seeded_client):
+    response = book(seeded_client, "10:00")
+    assert response.status_code == 200, response.text
+    assert response.json()["clinic_name"] == "slots_clinic"
+    slots = availability(seeded_client, "slots_clinic", "slots_30", MONDAY)["slots"]
+    assert "09:30" in slots and "10:30" in slots
+    assert not {"09:45", "10:00", "10:15"} & set(slots)
+    # A 50 minute service blocks an hour and needs an hour free
+    scan = availability(seeded_client, "slots_clinic", "slots_50", MONDAY)
+    assert scan["duration"] == 60
+    assert "09:00" in scan["slots"] and "09:15" not in scan["slots"] and "10:30" in scan["slots"]
+
+@pytest.mark.parametrize("time,service_id,status", [
+    ("10:15", "slots_30", 409),   # inside the 10:00 booking
+    ("09:30", "slots_50", 409),   # runs into it
+    ("08:45", "slots_30", 400),   # before opening
+    ("16:45", "slots_30", 400),   # runs past closing
+    ("11:05", "slots_30", 400),   # off the slot grid
+    ("25:00", "slots_30", 400),
+])
+def test_conflicting_or_invalid_bookings_are_rejected(session_factory, seeded_client, time, service_id, status):
+    assert book(seeded_client, time, service_id=service_id).status_code == status
+
+def test_past_and_closed_days_are_rejected(session_factory, seeded_client):
+    assert book(seeded_client, "10:00", day="2020-01-06").status_code == 400
+    assert book(seeded_client, "10:00", day=SUNDAY).status_code == 400
+
+def test_cancel_and_reschedule_move_the_claims(session_factory, seeded_client):
+    appointment_id = book(seeded_client, "14:00").json()["id"]
+    assert book(seeded_client, "14:00").status_code == 409
+
+    response = seeded_client.put(f"/api/appointments/{appointment_id}", headers=PATIENT, json={"time": "15:00"})
+    assert response.status_code == 200, response.text
+    assert book(seeded_client, "15:15").status_code == 409
+    assert book(seeded_client, "14:00").status_code == 200
+
+    response = seeded_client.put(f"/api/appointments/{appointment_id}", headers=PATIENT, json={"status": "cancelled"})
+    assert response.status_code == 200
+    with session_factory() as db:
+        assert db.query(AppointmentSlot).filter(AppointmentSlot.appointment_id == appointment_id).count() == 0
+    assert book(seeded_client, "15:00").status_code == 200
+
+def test_slot_claims_reject_a_race_the_check_missed(session_factory, seeded_client, monkeypatch):
+    assert book(seeded_client, "12:00").status_code == 200
+    # Simulate a concurrent booking that checked availability before the first committed
+    monkeypatch.setattr(appointments_routes, "check_bookable", lambda *args, **kwargs: None)
+    response = book(seeded_client, "12:15")
+    assert response.status_code == 409
+    assert response.json()["detail"] == "That time is no longer available"
+
+def test_concurrent_bookings_of_one_slot(session_factory, seeded_client):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = sorted(pool.map(lambda _: book(seeded_client, "16:00", day="2030-01-08").status_code, range(8)))
+    assert statuses == [200] + [409] * 7
+
+# --- Backfill ---
+
+def test_backfill_claims_upcoming_appointments(session_factory):
+    with session_factory() as db:
+        for appointment_id, time in (("legacy_a", "09:00"), ("legacy_b", "09:15"), ("legacy_c", "11:07")):
+            db.add(Appointment(id=appointment_id, patient_id="patient1", clinic_id="backfill_clinic",
+                               service_id="backfill_30", date=MONDAY, time=time))
+        db.add(Appointment(id="legacy_old", patient_id="patient1", clinic_id="backfill_clinic",
+                           service_id="backfill_30", date="2020-01-06", time="09:00"))
+        db.commit()
+        connection = db.connection()
+        assert backfill(connection, batch_size=2, commit=False, today=date(2026, 1, 1)) == (6, 1)
+        claims = db.query(AppointmentSlot.appointment_id, AppointmentSlot.start).filter(
+            AppointmentSlot.clinic_id == "backfill_clinic"
+        ).order_by(AppointmentSlot.start).all()
+        assert claims == [
+            ("legacy_a", "09:00"), ("legacy_a", "09:15"), ("legacy_b", "09:30"),
+            ("legacy_c", "11:00"), ("legacy_c", "11:15"), ("legacy_c", "11:30"),
+        ]
+        # Re-running claims nothing new
+        assert backfill(connection, commit=False, today=date(2026, 1, 1)) == (0, 0)
+        db.rollback()
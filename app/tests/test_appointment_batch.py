@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.appointments import Appointment, AppointmentSlot
+from app.models.clinics import Clinic, ClinicService
+from app.models.rewards import RewardPoint
+from app.models.users import User
+from app.routes.appointments import update_appointment_status_batch
+from app.schemas.appointment import AppointmentBatchUpdate
+from app.tests.seed_data import headers_for
+
+CLINIC = headers_for("batch_clinic", "clinic")
+IDS = [f"batch{i}" for i in range(8)]
+
+@pytest.fixture(scope="module")
+def session_factory(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    session.add(User(id="batch_clinic", email="batch_clinic@example.com", name="Front Desk Clinic", type="clinic"))
+    session.add(Clinic(id="batch_clinic"))
+    session.add(ClinicService(id="batch_service", clinic_id="batch_clinic", name="Vaccination", price="40", duration="15"))
+    for i, appointment_id in enumerate(IDS):
+        session.add(Appointment(id=appointment_id, patient_id=f"patient{i}", clinic_id="batch_clinic",
+                                service_id="batch_service", date="2030-05-06", time=f"{9 + i:02d}:00"))
+        session.add(AppointmentSlot(clinic_id="batch_clinic", date="2030-05-06", start=f"{9 + i:02d}:00",
+                                    appointment_id=appointment_id))
+    session.commit()
+    session.close()
+    return sessionmaker(bind=seeded_engine)
+
+def batch(client, ids, status, headers=CLINIC):
+    return client.put("/api/appointments/batch", headers=headers, json={"ids": ids, "status": status})
+
+def rewards_for(db, ids):
+    return db.query(RewardPoint.source_id, RewardPoint.patient_id, RewardPoint.points).filter(
+        RewardPoint.source_id.in_(ids)
+    ).order_by(RewardPoint.source_id).all()
+
+def test_confirm_a_day_in_one_request(session_factory, seeded_client):
+    response = batch(seeded_client, IDS[:5], "confirmed")
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [appointment["id"] for appointment in body] == IDS[:5]
+    assert {appointment["status"] for appointment in body} == {"confirmed"}
+    assert body[0]["clinic_name"] == "Front Desk Clinic"
+    assert body[0]["patient_name"] == "Patient 0"
+    assert body[0]["service_name"] == "Vaccination"
+    assert body[0]["time"] == "09:00"
+    with session_factory() as db:
+        assert rewards_for(db, IDS[:5]) == [(f"batch{i}", f"patient{i}", 200) for i in range(5)]
+
+def test_reconfirming_credits_nothing_new(session_factory, seeded_client):
+    assert batch(seeded_client, IDS[:6], "confirmed").status_code == 200
+    with session_factory() as db:
+        assert len(rewards_for(db, IDS[:6])) == 6
+
+def test_racing_confirmations_credit_points_once(seeded_engine, session_factory, seeded_client):
+    race_ids = ["race0", "race1"]
+    with session_factory() as db:
+        for i, appointment_id in enumerate(race_ids):
+            db.add(Appointment(id=appointment_id, patient_id=f"patient{i}", clinic_id="batch_clinic",
+                               service_id="batch_service", date="2030-05-07", time=f"{9 + i:02d}:00"))
+        db.commit()
+
+    # Another worker confirms the same appointments after this request has read
+    # them as pending, just before its UPDATE
+    def confirm_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE appointments SET status") and not raced:
+            raced.append(True)
+            with session_factory() as other:
+                update_appointment_status_batch(AppointmentBatchUpdate(ids=race_ids, status="confirmed"), db=other,
+                                                current_user=other.get(User, "batch_clinic"))
+    raced = []
+    event.listen(seeded_engine, "before_cursor_execute", confirm_first)
+    try:
+        response = batch(seeded_client, race_ids, "confirmed")
+    finally:
+        event.remove(seeded_engine, "before_cursor_execute", confirm_first)
+    assert raced
+    assert response.status_code == 200, response.text
+    assert {appointment["status"] for appointment in response.json()} == {"confirmed"}
+    with session_factory() as db:
+        assert [source_id for source_id, _, _ in rewards_for(db, race_ids)] == race_ids
+
+def test_query_count_does_not_grow_with_the_batch(session_factory, seeded_client):
+    one = batch(seeded_client, IDS[6:7], "completed")
+    several = batch(seeded_client, IDS[:6], "completed")
+    assert one.status_code == several.status_code == 200
+    assert one.headers["X-DB-Queries"] == several.headers["X-DB-Queries"]
+    assert int(several.headers["X-DB-Queries"]) <= 4
+
+@pytest.mark.parametrize("ids,status,user,expected", [
+    (["batch0", "appointment1"], "confirmed", ("batch_clinic", "clinic"), 403),   # another clinic's appointment
+    (["batch0", "no_such_appointment"], "confirmed", ("batch_clinic", "clinic"), 404),
+    (["batch0"], "confirmed", ("patient0", "patient"), 403),
+    (["batch0"], "approved", ("batch_clinic", "clinic"), 422),
+    ([], "confirmed", ("batch_clinic", "clinic"), 422),
+])
+def test_rejected_batches_change_nothing(session_factory, seeded_client, ids, status, user, expected):
+    with session_factory() as db:
+        before = db.get(Appointment, "batch0").status
+    assert batch(seeded_client, ids, status, headers=headers_for(*user)).status_code == expected
+    with session_factory() as db:
+        assert db.get(Appointment, "batch0").status == before
+
+def test_cancelling_releases_slots(session_factory, seeded_client):
+    assert batch(seeded_client, ["batch6", "batch7"], "cancelled").status_code == 200
+    with session_factory() as db:
+        assert db.query(AppointmentSlot).filter(AppointmentSlot.appointment_id.in_(["batch6", "batch7"])).count() == 0
+    # Reinstating has to re-check the slots, one appointment at a time
+    assert batch(seeded_client, ["batch7"], "pending").status_code == 400
+
+def test_single_update_builds_its_response_from_one_load(session_factory, seeded_client):
+    response = seeded_client.put("/api/appointments/batch0", headers=CLINIC, json={"notes": "Bring records"})
+    assert response.status_code == 200, response.text
+    assert response.json()["clinic_name"] == "Front Desk Clinic"
+    # Current user, the appointment, the UPDATE and the joined response load
+    assert response.headers["X-DB-Queries"] == "4"
@@ -0,0 +1,164 @@
+import os
+import pytest
+from alembic import command
+from alembic.config import Config
+from datetime import date, datetime, time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.appointments import Appointment
+from app.models.clinics import Clinic
+from app.models.users import User
+from app.schemas.appointment import AppointmentResponse
+from app.schemas.prescription import PrescriptionCreate
+from app.tests.seed_data import headers_for
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+CLINIC = headers_for("calendar_clinic", "clinic")
+PATIENT = headers_for("patient2", "patient")
+
+# (id, date, time) of calendar_clinic's appointments, all with patient2
+APPOINTMENTS = [
+    ("cal_before", "2030-03-03", "23:30"),
+    ("cal_mon", "2030-03-04", "09:00"),
+    ("cal_mon_early", "2030-03-04", "08:00"),
+    ("cal_fri", "2030-03-08", "16:00"),
+    ("cal_next_mon", "2030-03-11", "00:00"),
+]
+
+@pytest.fixture(scope="module")
+def client(seeded_engine, seeded_client):
+    session = sessionmaker(bind=seeded_engine)()
+    session.add(User(id="calendar_clinic", email="calendar_clinic@example.com", name="Calendar", type="clinic"))
+    session.add(Clinic(id="calendar_clinic"))
+    for appointment_id, day, start in APPOINTMENTS:
+        session.add(Appointment(id=appointment_id, patient_id="patient2", clinic_id="calendar_clinic",
+                                service_id="service0", date=day, time=start))
+    session.commit()
+    session.close()
+    return seeded_client
+
+def ids(response):
+    assert response.status_code == 200, response.text
+    return [appointment["id"] for appointment in response.json()]
+
+# --- Range queries ---
+
+def test_clinic_week_view(client):
+    response = client.get("/api/appointments/clinic/calendar_clinic?from=2030-03-04&to=2030-03-11", headers=CLINIC)
+    assert ids(response) == ["cal_mon_early", "cal_mon", "cal_fri"]
+    assert response.json()[0]["date"] == "2030-03-04"
+    assert response.json()[0]["time"] == "08:00"
+
+def test_open_ended_ranges(client):
+    after = client.get("/api/appointments/clinic/calendar_clinic?from=2030-03-08T16:00:00", headers=CLINIC)
+    assert ids(after) == ["cal_fri", "cal_next_mon"]
+    before = client.get("/api/appointments/clinic/calendar_clinic?to=2030-03-04T09:00:00", headers=CLINIC)
+    assert ids(before) == ["cal_before", "cal_mon_early"]
+    assert len(ids(client.get("/api/appointments/clinic/calendar_clinic", headers=CLINIC))) == len(APPOINTMENTS)
+
+def test_patient_range(client):
+    response = client.get("/api/appointments/patient/patient2?from=2030-03-04&to=2030-03-05", headers=PATIENT)
+    assert ids(response) == ["cal_mon_early", "cal_mon"]
+
+def test_invalid_ranges_are_rejected(client):
+    assert client.get("/api/appointments/clinic/calendar_clinic?from=2030-03-11&to=2030-03-04",
+                      headers=CLINIC).status_code == 400
+    assert client.get("/api/appointments/clinic/calendar_clinic?from=next-week", headers=CLINIC).status_code == 422
+
+def test_start_at_follows_date_and_time(seeded_engine, client):
+    with sessionmaker(bind=seeded_engine)() as db:
+        appointment = db.get(Appointment, "cal_fri")
+        assert (appointment.date, appointment.time) == (date(2030, 3, 8), time(16, 0))
+        appointment.time = "17:15"
+        db.commit()
+        assert db.get(Appointment, "cal_fri").start_at == datetime(2030, 3, 8, 17, 15)
+        appointment.time = "16:00"
+        db.commit()
+
+def test_week_view_is_one_index_range_scan(seeded_engine, client):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM appointments" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(seeded_engine, "before_cursor_execute", capture)
+    try:
+        client.get("/api/appointments/clinic/calendar_clinic?from=2030-03-04&to=2030-03-11", headers=CLINIC)
+    finally:
+        event.remove(seeded_engine, "before_cursor_execute", capture)
+    (statement, parameters), = statements
+    with seeded_engine.connect() as connection:
+        plan = connection.connection.dbapi_connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    details = " | ".join(row[-1] for row in plan)
+    assert "SEARCH appointments USING INDEX ix_appointments_clinic_id_start_at (clinic_id=? AND start_at>? AND start_at<?)" in details
+
+# --- API string compatibility ---
+
+def test_responses_keep_string_format():
+    response = AppointmentResponse(
+        id="a", patient_id="p", clinic_id="c", service_id="s", date=date(2030, 3, 4), time=time(9, 30),
+        status="pending", created_at="2030-01-01T00:00:00"
+    )
+    assert (response.date, response.time) == ("2030-03-04", "09:30")
+
+def test_requests_reject_invalid_dates():
+    assert PrescriptionCreate(patient_id="p", issue_date="2025-01-01", medications=[]).issue_date == "2025-01-01"
+    with pytest.raises(ValueError):
+        PrescriptionCreate(patient_id="p", issue_date="01/01/2025", medications=[])
+
+# --- Migration ---
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    yield engine
+    engine.dispose()
+
+def migrate(engine, revision):
+    config = Config(ALEMBIC_INI)
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+        connection.commit()
+
+def seed_legacy_rows(engine):
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO appointments (id, patient_id, clinic_id, date, time, status) VALUES "
+            "('a1', 'p', 'c', '2030-03-04', '9:30', 'pending'), ('a2', 'p', 'c', ' 2030-03-05 ', '14:00', 'pending')"
+        ))
+        connection.execute(text(
+            "INSERT INTO prescriptions (id, patient_id, clinic_id, issue_date, valid_until) VALUES "
+            "('r1', 'p', 'c', '2025-01-01', ''), ('r2', 'p', 'c', '2025-02-01', '2025-08-01')"
+        ))
+
+def test_migration_converts_date_and_time_columns(legacy_engine):
+    migrate(legacy_engine, "0010")
+    seed_legacy_rows(legacy_engine)
+    migrate(legacy_engine, "head")
+
+    with sessionmaker(bind=legacy_engine)() as db:
+        rows = db.query(Appointment.id, Appointment.date, Appointment.time, Appointment.start_at).order_by(Appointment.id).all()
+        valid_until = [value for (value,) in db.execute(text("SELECT valid_until FROM prescriptions ORDER BY id"))]
+    assert [tuple(row) for row in rows] == [
+        ("a1", date(2030, 3, 4), time(9, 30), datetime(2030, 3, 4, 9, 30)),
+        ("a2", date(2030, 3, 5), time(14, 0), datetime(2030, 3, 5, 14, 0)),
+    ]
+    assert valid_until == [None, "2025-08-01"]
+
+def test_swap_refuses_unconverted_values(legacy_engine):
+    migrate(legacy_engine, "0010")
+    seed_legacy_rows(legacy_engine)
+    with legacy_engine.begin() as connection:
+        connection.execute(text("UPDATE appointments SET time = 'noon' WHERE id = 'a2'"))
+
+    with pytest.raises(RuntimeError, match="appointments.time"):
+        migrate(legacy_engine, "head")
+
+    with legacy_engine.begin() as connection:
+        connection.execute(text("UPDATE appointments SET time = '12:00' WHERE id = 'a2'"))
+    migrate(legacy_engine, "head")
+    with sessionmaker(bind=legacy_engine)() as db:
+        assert db.get(Appointment, "a2").start_at == datetime(2030, 3, 5, 12, 0)
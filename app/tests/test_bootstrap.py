@@ -0,0 +1,98 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+
+import app.bootstrap as bootstrap_module
+import app.sample_data
+import app.updates.add_admin_user
+from app.auth import get_password_hash
+from app.bootstrap import (
+    alembic_config, bootstrap, ensure_bootstrapped, is_bootstrapped, migrations_head, schema_version
+)
+from app.models.users import User
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bootstrap.db'}")
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+
+    def counting_hash(password):
+        calls.append(password)
+        return get_password_hash(password)
+
+    monkeypatch.setattr(app.sample_data, "get_password_hash", counting_hash)
+    monkeypatch.setattr(app.updates.add_admin_user, "get_password_hash", counting_hash)
+    return calls
+
+def test_bootstrap_migrates_seeds_and_sets_marker(engine, hash_calls):
+    assert bootstrap(engine, sample_data=True) is True
+
+    assert {"alembic_version", "bootstrap_markers", "users"} <= set(inspect(engine).get_table_names())
+    with Session(engine) as db:
+        assert is_bootstrapped(db)
+        assert db.query(User).filter(User.email == "admin@healthcaremarket.com").one().type == "admin"
+        assert db.query(User).filter(User.type == "clinic").count() == 3
+    # One hash for the admin and one shared by every sample account
+    assert len(hash_calls) == 2
+
+def test_second_bootstrap_is_a_no_op(engine, hash_calls):
+    bootstrap(engine, sample_data=False)
+    hash_calls.clear()
+    assert bootstrap(engine, sample_data=True) is False
+    assert hash_calls == []
+    with Session(engine) as db:
+        assert db.query(User).filter(User.type == "clinic").count() == 0
+
+def test_startup_check_only_reads_the_marker(engine, hash_calls):
+    bootstrap(engine, sample_data=False)
+    hash_calls.clear()
+    ensure_bootstrapped(engine)
+    assert hash_calls == []
+
+def test_startup_refuses_unbootstrapped_database(engine, monkeypatch):
+    monkeypatch.setattr(bootstrap_module, "AUTO_BOOTSTRAP", False)
+    with Session(engine) as db:
+        assert not is_bootstrapped(db)
+    with pytest.raises(RuntimeError, match="python -m app.bootstrap"):
+        ensure_bootstrapped(engine)
+
+def test_startup_bootstraps_when_allowed(engine, monkeypatch):
+    monkeypatch.setattr(bootstrap_module, "AUTO_BOOTSTRAP", True)
+    ensure_bootstrapped(engine)
+    with Session(engine) as db:
+        assert is_bootstrapped(db)
+
+def test_migrations_head_matches_alembic():
+    from alembic.script import ScriptDirectory
+    assert migrations_head() == ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+# A bootstrapped database one migration behind the code, as after a deploy
+def fall_behind(engine):
+    bootstrap(engine, sample_data=False)
+    config = alembic_config()
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.downgrade(config, "-1")
+        connection.commit()
+    with Session(engine) as db:
+        assert is_bootstrapped(db)
+        assert schema_version(db) != migrations_head()
+
+def test_startup_migrates_a_stale_schema_when_allowed(engine, monkeypatch):
+    fall_behind(engine)
+    monkeypatch.setattr(bootstrap_module, "AUTO_BOOTSTRAP", True)
+    ensure_bootstrapped(engine)
+    with Session(engine) as db:
+        assert schema_version(db) == migrations_head()
+
+def test_startup_refuses_a_stale_schema(engine, monkeypatch):
+    fall_behind(engine)
+    monkeypatch.setattr(bootstrap_module, "AUTO_BOOTSTRAP", False)
+    with pytest.raises(RuntimeError, match=f"newest migration is {migrations_head()}; run `python -m app.bootstrap`"):
+        ensure_bootstrapped(engine)
@@ -0,0 +1,76 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.users import User
+from app.models.clinics import Clinic
+
+@pytest.fixture(scope="module")
+def client(seeded_engine, seeded_client):
+    # Clinics sharing one timestamp, stored in both of SQLite's text formats:
+    # the server default's and the one SQLAlchemy writes for Python datetimes
+    with seeded_engine.begin() as connection:
+        for clinic_id in ("tie_a", "tie_c"):
+            connection.execute(text(
+                "INSERT INTO users (id, email, name, type, is_active) VALUES (:id, :id || '@example.com', :id, 'clinic', 1)"
+            ), {"id": clinic_id})
+            connection.execute(text(
+                "INSERT INTO clinics (id, location, specialization, created_at) "
+                "VALUES (:id, 'Harbor', 'Cardiology', '2020-01-01 00:00:00')"
+            ), {"id": clinic_id})
+    session = sessionmaker(bind=seeded_engine)()
+    session.add(User(id="tie_b", email="tie_b@example.com", name="tie_b", type="clinic", is_active=True))
+    session.add(Clinic(id="tie_b", location="Harbor", specialization="Dermatology", created_at=datetime(2020, 1, 1)))
+    session.commit()
+    session.close()
+    return seeded_client
+
+def walk(client, query):
+    pages, url = [], f"/api/clinics/all?{query}"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/api/clinics/all?{query}&cursor={cursor}" if cursor else None
+    return pages
+
+def test_unpaginated_request_returns_whole_directory(client):
+    response = client.get("/api/clinics/all")
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+    clinics = response.json()
+    assert len(clinics) == 8
+    # Oldest first; SQLite orders the equal timestamps by their stored text
+    assert [c["id"] for c in clinics[:3]] == ["tie_a", "tie_c", "tie_b"]
+    assert set(clinics[0]) == {"id", "name", "email", "phone", "address", "location", "specialization",
+                               "latitude", "longitude", "is_active", "created_at", "updated_at", "services"}
+    assert clinics[3]["name"] == "Clinic 0" and clinics[3]["email"] == "clinic0@example.com"
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 8])
+def test_pages_cover_directory_exactly_once(client, limit):
+    everything = [c["id"] for c in client.get("/api/clinics/all").json()]
+    pages = walk(client, f"limit={limit}")
+    assert all(len(page) <= limit for page in pages)
+    assert [c["id"] for page in pages for c in page] == everything
+    assert len(pages) == -(-len(everything) // limit)
+
+def test_next_page_link(client):
+    response = client.get("/api/clinics/all?limit=2&location=City")
+    cursor = response.headers["X-Next-Cursor"]
+    assert response.headers["Link"] == f'<http://testserver/api/clinics/all?limit=2&location=City&cursor={cursor}>; rel="next"'
+
+def test_filters(client):
+    assert [c["id"] for c in client.get("/api/clinics/all?location=Harbor").json()] == ["tie_a", "tie_c", "tie_b"]
+    assert [c["id"] for page in walk(client, "limit=1&location=Harbor&specialization=Cardiology")
+            for c in page] == ["tie_a", "tie_c"]
+    assert client.get("/api/clinics/all?specialization=Oncology").json() == []
+
+def test_cursor_without_limit_uses_default_page_size(client):
+    cursor = client.get("/api/clinics/all?limit=1").headers["X-Next-Cursor"]
+    assert len(client.get(f"/api/clinics/all?cursor={cursor}").json()) == 7
+
+@pytest.mark.parametrize("query,status", [("cursor=not-a-cursor", 400), ("cursor=WzFd", 400), ("limit=0", 422), ("limit=1000", 422)])
+def test_rejects_bad_parameters(client, query, status):
+    assert client.get(f"/api/clinics/all?{query}").status_code == status
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.users import User
+from app.models.clinics import Clinic
+from app.routes.auth import _create_user
+from app.schemas.user import UserCreate
+from app.search import index_clinics, search_terms
+from app.tests.seed_data import headers_for
+
+@pytest.fixture(scope="module")
+def session_factory(seeded_engine):
+    return sessionmaker(bind=seeded_engine)
+
+@pytest.fixture(scope="module")
+def client(seeded_client, session_factory):
+    session = session_factory()
+    session.add(User(id="harbor_name", email="harbor_name@example.com", name="Harbor Dental Care", type="clinic", is_active=True))
+    session.add(Clinic(id="harbor_name", location="Old Town", specialization="Dentistry", address="1 Quay Rd"))
+    session.add(User(id="harbor_address", email="harbor_address@example.com", name="Quayside Family Practice", type="clinic", is_active=True))
+    session.add(Clinic(id="harbor_address", location="Old Town", specialization="Family Medicine", address="9 Harbor St"))
+    session.add(User(id="closed", email="closed@example.com", name="Harbor Closed Clinic", type="clinic", is_active=False))
+    session.add(Clinic(id="closed", location="Harbor", specialization="Dentistry"))
+    session.flush()
+    index_clinics(session, ["harbor_name", "harbor_address", "closed"])
+    session.commit()
+    session.close()
+    return seeded_client
+
+def ids(client, query):
+    response = client.get(f"/api/clinics/search?{query}")
+    assert response.status_code == 200, response.text
+    return [clinic["id"] for clinic in response.json()]
+
+def test_search_terms_strip_syntax():
+    assert search_terms('"Cardio" OR NEAR(heart*, 2) -x_y') == ["cardio", "or", "near", "heart", "2", "x", "y"]
+
+def test_every_word_must_match_as_prefix(client):
+    assert ids(client, "q=clin 3") == ["clinic3"]
+    assert set(ids(client, "q=gen")) == {f"clinic{c}" for c in range(5)}
+    assert ids(client, "q=dent old") == ["harbor_name"]
+
+def test_name_matches_rank_above_address_matches(client):
+    assert ids(client, "q=harbor") == ["harbor_name", "harbor_address"]
+
+def test_inactive_clinics_are_hidden(client):
+    assert "closed" not in ids(client, "q=closed")
+
+def test_results_match_directory_shape(client):
+    [clinic] = client.get("/api/clinics/search?q=dental").json()
+    directory = {c["id"]: c for c in client.get("/api/clinics/all").json()}
+    assert clinic == directory["harbor_name"]
+
+def test_pagination_links_to_next_offset(client):
+    first = client.get("/api/clinics/search?q=clinic&limit=2")
+    assert first.headers["Link"] == '<http://testserver/api/clinics/search?q=clinic&limit=2&offset=2>; rel="next"'
+    pages = [first.json(), client.get("/api/clinics/search?q=clinic&limit=2&offset=2").json(),
+             client.get("/api/clinics/search?q=clinic&limit=2&offset=4").json()]
+    assert sorted(c["id"] for page in pages for c in page) == [f"clinic{c}" for c in range(5)]
+    assert "Link" not in client.get("/api/clinics/search?q=clinic&limit=2&offset=4").headers
+
+@pytest.mark.parametrize("query", ['q="unbalanced', "q=NEAR(a b", "q=*", "q=a AND OR NOT"])
+def test_search_syntax_in_input_is_harmless(client, query):
+    assert client.get(f"/api/clinics/search?{query}").status_code == 200
+
+def test_missing_query_is_rejected(client):
+    assert client.get("/api/clinics/search").status_code == 422
+
+def test_update_clinic_reindexes(client):
+    response = client.put("/api/clinics/clinic4", json={"name": "Sunrise Pediatrics", "location": "Lakeside"},
+                          headers=headers_for("clinic4", "clinic"))
+    assert response.status_code == 200, response.text
+    assert ids(client, "q=sunrise lakeside") == ["clinic4"]
+    assert "clinic4" not in ids(client, "q=clinic")
+
+def test_registration_indexes_new_clinic(client, session_factory):
+    session = session_factory()
+    user = _create_user(session, UserCreate(email="new@example.com", name="Northstar Cardiology", type="clinic",
+                                            password="x", specialization="Cardiology", location="Northend"),
+                        "hash")
+    session.close()
+    assert ids(client, "q=northstar") == [user.id]
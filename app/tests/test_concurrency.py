@@ -0,0 +1,68 @@
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base, get_db, get_read_db
+from app.models.products import Product
+from app.routes import products as product_routes
+
+# Simulated per-statement database latency (e.g. a network round trip)
+STATEMENT_LATENCY = 0.1
+CONCURRENT_REQUESTS = 8
+
+@pytest.fixture
+def test_app(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'concurrency.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(bind=engine)
+
+    db = TestingSession()
+    db.add(Product(id="concurrency_product", clinic_id="concurrency_clinic", name="Bandage", price="4.99", category="First Aid"))
+    db.commit()
+    db.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_statement(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(STATEMENT_LATENCY)
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(product_routes.router, prefix="/api/products")
+
+    # Control: the same handler called inline from an async route, as before
+    @app.get("/blocking/products/all")
+    async def blocking_products(db: Session = Depends(get_db)):
+        return product_routes.get_all_products(db=db)
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    yield app
+    engine.dispose()
+
+async def fire_concurrently(app, path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(CONCURRENT_REQUESTS)))
+        elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    return elapsed
+
+def test_threadpool_routes_overlap(test_app):
+    elapsed = asyncio.run(fire_concurrently(test_app, "/api/products/all"))
+    # Serialized execution would take at least CONCURRENT_REQUESTS * STATEMENT_LATENCY
+    assert elapsed < CONCURRENT_REQUESTS * STATEMENT_LATENCY / 2
+
+def test_inline_async_routes_serialize(test_app):
+    elapsed = asyncio.run(fire_concurrently(test_app, "/blocking/products/all"))
+    assert elapsed >= CONCURRENT_REQUESTS * STATEMENT_LATENCY
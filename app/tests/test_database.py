@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import database
+from app.database import get_db, wait_for_database
+
+# --- Tests for get_db ---
+
+def test_get_db_yields_session_without_round_trip():
+    with patch.object(database.engine, "connect") as mock_connect:
+        generator = get_db()
+        db = next(generator)
+        assert isinstance(db, Session)
+        generator.close()
+    mock_connect.assert_not_called()
+
+def test_get_db_closes_session():
+    mock_session = MagicMock(spec=Session)
+    with patch("app.database.SessionLocal", return_value=mock_session):
+        generator = get_db()
+        next(generator)
+        generator.close()
+    mock_session.close.assert_called_once()
+
+# --- Tests for wait_for_database ---
+
+def test_wait_for_database_backs_off_without_blocking():
+    failing_then_ok = MagicMock(side_effect=[OperationalError("SELECT 1", {}, Exception("down")), MagicMock()])
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    with patch.object(database.engine, "connect", failing_then_ok), patch("app.database.asyncio.sleep", fake_sleep):
+        asyncio.run(wait_for_database(max_retries=3, base_delay=0.5))
+
+    assert sleeps == [0.5]
+
+def test_wait_for_database_raises_after_max_retries():
+    always_down = MagicMock(side_effect=OperationalError("SELECT 1", {}, Exception("down")))
+
+    async def fake_sleep(delay):
+        pass
+
+    with patch.object(database.engine, "connect", always_down), patch("app.database.asyncio.sleep", fake_sleep):
+        with pytest.raises(OperationalError):
+            asyncio.run(wait_for_database(max_retries=2))
+    assert always_down.call_count == 2
+
+# --- Tests for the tuned SQLite profile ---
+
+def test_apply_sqlite_profile_sets_pragmas(tmp_path):
+    import sqlite3
+    from app.database import apply_sqlite_profile
+
+    connection = sqlite3.connect(str(tmp_path / "tuned.db"))
+    apply_sqlite_profile(connection)
+
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert connection.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert connection.execute("PRAGMA busy_timeout").fetchone()[0] == database.SQLITE_TUNED_PRAGMAS["busy_timeout"]
+    assert connection.execute("PRAGMA cache_size").fetchone()[0] == database.SQLITE_TUNED_PRAGMAS["cache_size"]
+    connection.close()
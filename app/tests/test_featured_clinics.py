@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+import json
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.featured import FEATURED_WINDOW_DAYS, build_snapshot, featured_clinics
+from app.models.appointments import Appointment
+from app.models.clinics import Clinic
+from app.models.products import Order, OrderItem
+from app.models.users import User
+from app.query_stats import query_budget
+
+NOW = datetime.now(timezone.utc)
+OLD = NOW - timedelta(days=FEATURED_WINDOW_DAYS + 1)
+
+@pytest.fixture(scope="module")
+def session_factory(seeded_engine):
+    # Seeded clinics tie at 4 appointments and 24 order lines each. Give
+    # clinic3 recent bookings, clinic4 only old or cancelled traffic, and add
+    # a busy inactive clinic.
+    session = sessionmaker(bind=seeded_engine)()
+    session.add(User(id="closed", email="closed@example.com", name="Closed", type="clinic", is_active=False))
+    session.add(Clinic(id="closed"))
+    for i in range(3):
+        session.add(Appointment(id=f"featured_recent{i}", patient_id="patient0", clinic_id="clinic3", created_at=NOW))
+        session.add(Appointment(id=f"featured_old{i}", patient_id="patient0", clinic_id="clinic4", created_at=OLD))
+        session.add(Appointment(id=f"featured_cancelled{i}", patient_id="patient0", clinic_id="clinic4",
+                                status="cancelled", created_at=NOW))
+        session.add(Appointment(id=f"featured_closed{i}", patient_id="patient0", clinic_id="closed", created_at=NOW))
+    session.add(Order(id="featured_old_order", patient_id="patient0", total="99", created_at=OLD))
+    for i in range(10):
+        session.add(OrderItem(id=f"featured_old_item{i}", order_id="featured_old_order", product_id="product4_0", price="9.9",
+                              clinic_id="clinic4"))
+    session.commit()
+    session.close()
+    featured_clinics.clear()
+    return sessionmaker(bind=seeded_engine)
+
+def featured_ids(snapshot):
+    return [clinic["id"] for clinic in json.loads(snapshot.body)]
+
+def test_ranked_by_recent_traffic(session_factory):
+    with session_factory() as db:
+        snapshot = build_snapshot(db, count=5, now=NOW)
+    # clinic4's old and cancelled traffic does not count; ties fall back to id order
+    assert featured_ids(snapshot) == ["clinic3", "clinic0", "clinic1", "clinic2", "clinic4"]
+
+def test_clinics_without_traffic_follow_newest_first(session_factory):
+    with session_factory() as db:
+        snapshot = build_snapshot(db, count=20, now=NOW + timedelta(days=365))
+    ids = featured_ids(snapshot)
+    assert "closed" not in ids
+    assert set(ids) >= {f"clinic{c}" for c in range(5)}
+
+def test_snapshot_matches_clinic_response(session_factory):
+    with session_factory() as db:
+        snapshot = build_snapshot(db, count=1, now=NOW)
+    (clinic,) = json.loads(snapshot.body)
+    assert clinic["id"] == "clinic3"
+    assert clinic["name"] == "Clinic 3"
+    assert clinic["email"] == "clinic3@example.com"
+    assert [service["id"] for service in clinic["services"]] == ["service3"]
+
+def test_route_serves_snapshot_from_memory(session_factory, seeded_client):
+    first = seeded_client.get("/api/clinics/featured")
+    assert first.status_code == 200
+    assert [clinic["id"] for clinic in first.json()] == ["clinic3", "clinic0", "clinic1"]
+    with query_budget(0):
+        second = seeded_client.get("/api/clinics/featured")
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert "max-age" in second.headers["Cache-Control"]
+
+def test_matching_etag_gets_not_modified(session_factory, seeded_client):
+    etag = seeded_client.get("/api/clinics/featured").headers["ETag"]
+    for if_none_match in (etag, f'"stale", {etag}', f"W/{etag}"):
+        response = seeded_client.get("/api/clinics/featured", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+    assert seeded_client.get("/api/clinics/featured", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+def test_refresh_publishes_a_new_snapshot(session_factory, seeded_client):
+    etag = seeded_client.get("/api/clinics/featured").headers["ETag"]
+    with session_factory() as db:
+        db.add(Appointment(id="featured_boost", patient_id="patient0", clinic_id="clinic2", created_at=NOW))
+        db.commit()
+        # The snapshot is unchanged until the next refresh
+        assert seeded_client.get("/api/clinics/featured").headers["ETag"] == etag
+        featured_clinics.refresh(db)
+    response = seeded_client.get("/api/clinics/featured")
+    assert response.headers["ETag"] != etag
+    assert [clinic["id"] for clinic in response.json()] == ["clinic3", "clinic2", "clinic0"]
@@ -0,0 +1,99 @@
+import math
+import random
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.geo import BASE32, covering_cells, encode, haversine_km, search_precision
+from app.models.users import User
+from app.models.clinics import Clinic
+from app.tests.seed_data import headers_for
+
+# Points around lower Manhattan, (id, latitude, longitude, active)
+CLINICS = [
+    ("near_0", 40.7130, -74.0062, True),    # ~30m from the origin
+    ("near_1", 40.7200, -74.0000, True),    # ~1km
+    ("near_2", 40.7306, -73.9866, True),    # ~2.6km
+    ("far", 40.8448, -73.8648, True),       # ~18km
+    ("inactive", 40.7129, -74.0061, False),
+]
+ORIGIN = (40.7128, -74.0060)
+
+@pytest.fixture(scope="module")
+def client(seeded_engine, seeded_client):
+    session = sessionmaker(bind=seeded_engine)()
+    for clinic_id, latitude, longitude, active in CLINICS:
+        session.add(User(id=clinic_id, email=f"{clinic_id}@example.com", name=clinic_id, type="clinic", is_active=active))
+        session.add(Clinic(id=clinic_id, location="Manhattan", latitude=latitude, longitude=longitude))
+    session.commit()
+    session.close()
+    return seeded_client
+
+def nearby(client, radius, **params):
+    query = "&".join(f"{key}={value}" for key, value in {"lat": ORIGIN[0], "lng": ORIGIN[1], "radius": radius, **params}.items())
+    response = client.get(f"/api/clinics/nearby?{query}")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_geohash_matches_reference_values():
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert encode(40.7128, -74.0060, 5) == "dr5re"
+
+def test_haversine_distance():
+    # New York to London
+    assert haversine_km(40.7128, -74.0060, 51.5074, -0.1278) == pytest.approx(5570, rel=0.01)
+
+def test_covering_cells_contain_the_whole_circle():
+    rng = random.Random(7)
+    for _ in range(300):
+        latitude, longitude = rng.uniform(-70, 70), rng.uniform(-179.9, 179.9)
+        radius = rng.choice([0.05, 0.5, 2, 10, 50])
+        cells = covering_cells(latitude, longitude, radius)
+        assert len(cells) <= 9
+        for bearing in range(0, 360, 15):
+            # A point just inside the circle at this bearing
+            d = radius * 0.999 / 6371.0088
+            phi1, lambda1, theta = math.radians(latitude), math.radians(longitude), math.radians(bearing)
+            phi2 = math.asin(math.sin(phi1) * math.cos(d) + math.cos(phi1) * math.sin(d) * math.cos(theta))
+            lambda2 = lambda1 + math.atan2(math.sin(theta) * math.sin(d) * math.cos(phi1),
+                                           math.cos(d) - math.sin(phi1) * math.sin(phi2))
+            point = encode(math.degrees(phi2), (math.degrees(lambda2) + 540) % 360 - 180)
+            assert any(point.startswith(cell) for cell in cells), (latitude, longitude, radius, bearing)
+
+def test_precision_shrinks_as_radius_grows():
+    assert search_precision(40, 0.1) > search_precision(40, 5) > search_precision(40, 100)
+
+def test_nearest_first_within_radius(client):
+    clinics = nearby(client, 5)
+    assert [c["id"] for c in clinics] == ["near_0", "near_1", "near_2"]
+    assert clinics[0]["distance_km"] == pytest.approx(0.028, abs=0.002)
+    assert clinics[1]["distance_km"] == pytest.approx(haversine_km(*ORIGIN, 40.72, -74.0), abs=0.001)
+    assert clinics[0]["latitude"] == 40.7130 and clinics[0]["name"] == "near_0"
+
+def test_radius_and_limit(client):
+    assert [c["id"] for c in nearby(client, 1.5)] == ["near_0", "near_1"]
+    assert [c["id"] for c in nearby(client, 50)] == ["near_0", "near_1", "near_2", "far"]
+    assert [c["id"] for c in nearby(client, 50, limit=1)] == ["near_0"]
+
+@pytest.mark.parametrize("params", ["lat=91&lng=0", "lat=0&lng=181", "lat=0&lng=0&radius=0", "lat=0&lng=0&radius=1000", "lng=0"])
+def test_rejects_bad_parameters(client, params):
+    assert client.get(f"/api/clinics/nearby?{params}").status_code == 422
+
+def test_moving_a_clinic_updates_its_cell(client):
+    response = client.put("/api/clinics/far", json={"latitude": 40.7140, "longitude": -74.0070},
+                          headers=headers_for("far", "clinic"))
+    assert response.status_code == 200, response.text
+    assert [c["id"] for c in nearby(client, 0.5)] == ["near_0", "far"]
+
+
+# Cells are read as [cell, cell + "~") ranges, so every geohash must sort
+# below "~" byte-wise and PostgreSQL must compare the column in byte order
+# (under en_US, "~" sorts before letters and the ranges come back empty)
+def test_cell_ranges_rely_on_byte_order():
+    assert max(BASE32) < "~"
+    ddl = str(CreateTable(Clinic.__table__).compile(dialect=postgresql.dialect()))
+    assert 'geohash VARCHAR COLLATE "C"' in ddl
+    [index] = [index for index in Clinic.__table__.indexes if index.name == "ix_clinics_geohash"]
+    assert str(CreateIndex(index).compile(dialect=postgresql.dialect())) == \
+        "CREATE INDEX ix_clinics_geohash ON clinics (geohash)"
@@ -0,0 +1,164 @@
+import os
+import pytest
+from alembic import command
+from alembic.config import Config
+from decimal import Decimal
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.schemas.product import OrderResponse, ProductCreate
+from app.featured import featured_clinics
+from app.models.products import Order, OrderItem, Product
+from app.schemas.clinic import ClinicServiceResponse
+from app.tests.seed_data import headers_for
+from app.updates.backfill_numeric_columns import backfill
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    yield engine
+    engine.dispose()
+
+def migrate(engine, revision):
+    config = Config(ALEMBIC_INI)
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+        connection.commit()
+
+def seed_legacy_rows(engine):
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO products (id, clinic_id, name, price, in_stock) VALUES "
+            "('p1', 'c', 'Bandage', '12.99', 1), ('p2', 'c', 'Gauze', ' 5 ', 1), ('p3', 'c', 'Tape', '', 1)"
+        ))
+        connection.execute(text(
+            "INSERT INTO clinic_services (id, clinic_id, name, price, duration, available) VALUES "
+            "('s1', 'c', 'Checkup', '50.00', '30', 'true'), ('s2', 'c', 'Consult', '35', '15.0', 'false')"
+        ))
+        connection.execute(text(
+            "INSERT INTO reward_points (id, patient_id, points, description, type) VALUES "
+            "('r1', 'pt', '120', 'Order', 'earned'), ('r2', 'pt', '20', 'Redeemed', 'redeemed')"
+        ))
+
+# --- Migration and backfill ---
+
+def test_migration_converts_string_columns(engine):
+    migrate(engine, "0001")
+    seed_legacy_rows(engine)
+    migrate(engine, "head")
+
+    with engine.connect() as connection:
+        prices = dict(connection.execute(text("SELECT id, price FROM products")).all())
+        services = connection.execute(text("SELECT duration, available FROM clinic_services ORDER BY id")).all()
+        earned = connection.execute(text(
+            "SELECT SUM(points) FROM reward_points WHERE patient_id = 'pt' AND type = 'earned'"
+        )).scalar()
+
+    assert prices == {"p1": 12.99, "p2": 5, "p3": None}
+    assert [tuple(row) for row in services] == [(30, 1), (15, 0)]
+    assert earned == 120
+
+def test_backfill_resumes_in_batches(engine):
+    migrate(engine, "0002")
+    seed_legacy_rows(engine)
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE products SET price_new = 12.99 WHERE id = 'p1'"))
+
+    with engine.connect() as connection:
+        backfill(connection, batch_size=1)
+        staged = dict(connection.execute(text("SELECT id, price_new FROM products")).all())
+    assert staged == {"p1": 12.99, "p2": 5, "p3": None}
+
+def test_swap_refuses_unconverted_values(engine):
+    migrate(engine, "0001")
+    seed_legacy_rows(engine)
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE products SET price = 'n/a' WHERE id = 'p2'"))
+
+    with pytest.raises(RuntimeError, match="products.price"):
+        migrate(engine, "head")
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE products SET price = '5' WHERE id = 'p2'"))
+    migrate(engine, "head")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT price FROM products WHERE id = 'p2'")).scalar() == 5
+
+# --- API string compatibility ---
+
+def test_responses_keep_string_format():
+    order = OrderResponse(id="o", patient_id="p", total=Decimal("37.98"), status="processing", points_earned=379)
+    assert order.total == "37.98"
+    assert order.points_earned == "379"
+
+    service = ClinicServiceResponse(
+        id="s", clinic_id="c", name="Checkup", price=Decimal("50.00"), duration=30, available=True,
+        created_at="2025-01-01T00:00:00"
+    )
+    assert (service.price, service.duration, service.available) == ("50.00", "30", "true")
+
+def test_requests_accept_strings_and_reject_garbage():
+    assert ProductCreate(name="Bandage", price="12.99").price == "12.99"
+    assert ProductCreate(name="Bandage", price=5).price == "5.00"
+    with pytest.raises(ValueError):
+        ProductCreate(name="Bandage", price="cheap")
+
+# Blank legacy values were migrated to NULL; listings show them as null
+def test_order_listings_pass_null_values_through(seeded_engine, seeded_client):
+    with sessionmaker(bind=seeded_engine)() as db:
+        db.add(Order(id="blank_order", patient_id="patient1", total=None, points_earned=None, status="processing"))
+        db.add(OrderItem(id="blank_item", order_id="blank_order", product_name="Gauze", quantity=None, price=None))
+        db.flush()
+        # Bypass the column defaults, as the migration did
+        db.execute(text("UPDATE orders SET points_earned = NULL WHERE id = 'blank_order'"))
+        db.execute(text("UPDATE order_items SET quantity = NULL WHERE id = 'blank_item'"))
+        db.commit()
+    try:
+        admin = headers_for("admin", "admin")
+        for path in ("/api/products/orders/all", "/api/products/orders/recent?limit=100"):
+            response = seeded_client.get(path, headers=admin)
+            assert response.status_code == 200, response.text
+            [order] = [order for order in response.json() if order["id"] == "blank_order"]
+            assert (order["total"], order["points_earned"]) == (None, None)
+            assert (order["items"][0]["quantity"], order["items"][0]["price"]) == (None, None)
+
+        response = seeded_client.get("/api/products/orders/patient/patient1", headers=headers_for("patient1", "patient"))
+        assert response.status_code == 200, response.text
+        [order] = [order for order in response.json() if order["id"] == "blank_order"]
+        assert (order["total"], order["items"][0]["price"]) == (None, None)
+    finally:
+        with sessionmaker(bind=seeded_engine)() as db:
+            db.query(OrderItem).filter(OrderItem.order_id == "blank_order").delete()
+            db.query(Order).filter(Order.id == "blank_order").delete()
+            db.commit()
+
+def test_product_and_service_listings_pass_null_values_through(seeded_engine, seeded_client):
+    with sessionmaker(bind=seeded_engine)() as db:
+        db.add(Product(id="blank_product", clinic_id="clinic1", name="Unpriced Gauze", price=None))
+        db.commit()
+        saved = db.execute(text("SELECT id, price, duration FROM clinic_services")).all()
+        # Every service, so whichever clinics are featured have one
+        db.execute(text("UPDATE clinic_services SET price = NULL, duration = NULL"))
+        db.commit()
+    featured_clinics.clear()
+    try:
+        for path in ("/api/products/all", "/api/products?limit=100"):
+            response = seeded_client.get(path)
+            assert response.status_code == 200, response.text
+            [product] = [product for product in response.json() if product["id"] == "blank_product"]
+            assert product["price"] is None
+
+        response = seeded_client.get("/api/clinics/featured")
+        assert response.status_code == 200, response.text
+        services = [service for clinic in response.json() for service in clinic["services"]]
+        assert services and all((s["price"], s["duration"]) == (None, None) for s in services)
+    finally:
+        with sessionmaker(bind=seeded_engine)() as db:
+            db.query(Product).filter(Product.id == "blank_product").delete()
+            db.execute(text("UPDATE clinic_services SET price = :price, duration = :duration WHERE id = :id"),
+                       [{"id": id, "price": price, "duration": duration} for id, price, duration in saved])
+            db.commit()
+        featured_clinics.clear()
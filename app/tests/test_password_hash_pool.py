@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.auth import (
+    get_password_hash,
+    get_password_hash_async,
+    verify_password_async,
+    authenticate_user_async,
+)
+from app.models.users import User
+
+HASHED = get_password_hash("correctpassword")
+
+MOCK_USER_FROM_DB = User(
+    id="pool_user_1",
+    email="pool@example.com",
+    hashed_password=HASHED,
+    name="Pool User",
+    type="patient",
+    is_active=True
+)
+
+def test_get_password_hash_async_round_trip():
+    hashed = asyncio.run(get_password_hash_async("somepassword"))
+    assert asyncio.run(verify_password_async("somepassword", hashed)) is True
+    assert asyncio.run(verify_password_async("otherpassword", hashed)) is False
+
+def test_authenticate_user_async_success_and_failure():
+    mock_db_session = MagicMock(spec=Session)
+    mock_db_session.query.return_value.filter.return_value.first.return_value = MOCK_USER_FROM_DB
+
+    assert asyncio.run(authenticate_user_async(mock_db_session, MOCK_USER_FROM_DB.email, "correctpassword")) is MOCK_USER_FROM_DB
+    assert asyncio.run(authenticate_user_async(mock_db_session, MOCK_USER_FROM_DB.email, "wrongpassword")) is False
+
+def test_saturated_pool_fails_fast_with_503():
+    exhausted = MagicMock()
+    exhausted.acquire.return_value = False
+    with patch("app.auth._hash_slots", exhausted):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(verify_password_async("correctpassword", HASHED))
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert exc_info.value.headers["Retry-After"] == "1"
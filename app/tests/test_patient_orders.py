@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.patients import Patient
+from app.models.prescriptions import Prescription
+from app.models.products import Order, OrderItem
+from app.models.users import User
+from app.tests.seed_data import headers_for
+from app.updates.backfill_order_snapshots import backfill
+
+PATIENT = headers_for("history_patient", "patient")
+ORDERS = 30
+START = datetime(2025, 6, 1, 12, 0)
+
+# history_patient has ORDERS orders of three items each; pairs of orders share
+# a timestamp, every third order comes from clinic2's prescription and
+# order0's second item's product has since been deleted
+@pytest.fixture(scope="module")
+def client(seeded_engine, seeded_client):
+    session = sessionmaker(bind=seeded_engine)()
+    session.add(User(id="history_patient", email="history_patient@example.com", name="History", type="patient"))
+    session.add(Patient(id="history_patient"))
+    session.add(Prescription(id="history_rx", patient_id="history_patient", clinic_id="clinic2", issue_date="2025-01-01"))
+    for o in range(ORDERS):
+        order_id = f"history{o:02d}"
+        prescribed = o % 3 == 0
+        session.add(Order(id=order_id, patient_id="history_patient", total="29.97", points_earned=299,
+                          prescription_id="history_rx" if prescribed else None,
+                          clinic_name="Clinic 2" if prescribed else None,
+                          created_at=START + timedelta(days=o // 2)))
+        for i in range(3):
+            deleted = (o, i) == (0, 1)
+            session.add(OrderItem(id=f"{order_id}_{i}", order_id=order_id, quantity=1, price="9.99",
+                                  product_id=None if deleted else f"product{o % 5}_{i}",
+                                  product_name="Retired Product" if deleted else f"Product {i}",
+                                  product_category="Devices", clinic_id=f"clinic{o % 5}"))
+    session.commit()
+    session.close()
+    return seeded_client
+
+def order_ids(response):
+    assert response.status_code == 200, response.text
+    return [order["id"] for order in response.json()]
+
+def newest_first():
+    return sorted((f"history{o:02d}" for o in range(ORDERS)), key=lambda order_id: (int(order_id[7:]) // 2, order_id),
+                  reverse=True)
+
+def test_full_history_newest_first(client):
+    response = client.get("/api/products/orders/patient/history_patient", headers=PATIENT)
+    assert order_ids(response) == newest_first()
+    assert "X-Next-Cursor" not in response.headers
+    orders = {order["id"]: order for order in response.json()}
+    assert orders["history03"]["clinic_name"] == "Clinic 2"
+    assert orders["history04"]["clinic_name"] is None
+    assert orders["history04"]["items"][0]["name"] == "Product 0"
+    assert orders["history04"]["total"] == "29.97"
+    assert len(orders["history04"]["items"]) == 3
+    assert orders["history00"]["items"][1] == {
+        "id": "history00_1", "product_id": None, "name": "Retired Product", "quantity": "1", "price": "9.99"
+    }
+
+def test_query_count_does_not_grow_with_history(client):
+    long_history = client.get("/api/products/orders/patient/history_patient", headers=PATIENT)
+    short_history = client.get("/api/products/orders/patient/patient1", headers=headers_for("patient1", "patient"))
+    # The orders, then their items
+    assert long_history.headers["X-DB-Queries"] == short_history.headers["X-DB-Queries"] == "2"
+
+def test_pages_walk_the_history_once(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/products/orders/patient/history_patient", headers=PATIENT, params=params)
+        page = order_ids(response)
+        assert len(page) <= 7
+        seen += page
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        assert 'rel="next"' in response.headers["Link"]
+    assert seen == newest_first()
+
+def test_cursor_without_limit_uses_default_page_size(client):
+    first = client.get("/api/products/orders/patient/history_patient?limit=2", headers=PATIENT)
+    rest = client.get(f"/api/products/orders/patient/history_patient?cursor={first.headers['X-Next-Cursor']}",
+                      headers=PATIENT)
+    assert order_ids(rest) == newest_first()[2:22]
+
+def test_invalid_requests(client):
+    assert client.get("/api/products/orders/patient/history_patient?cursor=nope", headers=PATIENT).status_code == 400
+    assert client.get("/api/products/orders/patient/history_patient?limit=0", headers=PATIENT).status_code == 422
+    assert client.get("/api/products/orders/patient/history_patient",
+                      headers=headers_for("patient1", "patient")).status_code == 403
+
+# --- Purchase-time snapshots ---
+
+def test_orders_keep_product_details_after_deletion(seeded_engine, client):
+    clinic = headers_for("clinic3", "clinic")
+    response = client.post("/api/products/", headers=clinic, json={"name": "Seasonal Kit", "price": "12.50",
+                                                                  "category": "First Aid"})
+    assert response.status_code == 200, response.text
+    product_id = response.json()["id"]
+    response = client.post("/api/products/order", headers=PATIENT, json={
+        "items": [{"product_id": product_id, "quantity": "2"}], "prescription_id": "history_rx"
+    })
+    assert response.status_code == 200, response.text
+    order = response.json()
+    assert order["clinic_name"] == "Clinic 2"
+    assert order["items"][0]["name"] == "Seasonal Kit"
+    with sessionmaker(bind=seeded_engine)() as db:
+        item = db.query(OrderItem).filter(OrderItem.order_id == order["id"]).one()
+        assert (item.product_category, item.clinic_id) == ("First Aid", "clinic3")
+
+    assert client.delete(f"/api/products/{product_id}", headers=clinic).status_code in (200, 204)
+    history = client.get("/api/products/orders/patient/history_patient?limit=1", headers=PATIENT).json()
+    assert history[0]["id"] == order["id"]
+    assert history[0]["clinic_name"] == "Clinic 2"
+    assert history[0]["items"][0]["name"] == "Seasonal Kit"
+    assert history[0]["items"][0]["product_id"] is None
+
+def test_backfill_fills_older_orders(seeded_engine, client):
+    with sessionmaker(bind=seeded_engine)() as db:
+        db.add(Order(id="legacy_order", patient_id="history_patient", total="9.99", prescription_id="history_rx",
+                     created_at=START))
+        db.add(OrderItem(id="legacy_item", order_id="legacy_order", product_id="product1_2", quantity=1, price="9.99"))
+        db.add(OrderItem(id="legacy_orphan", order_id="legacy_order", product_id="no_such_product", quantity=1,
+                         price="9.99"))
+        db.commit()
+        connection = db.connection()
+        items, orders = backfill(connection, batch_size=1, commit=False)
+        assert items >= 1 and orders >= 1
+        item = db.get(OrderItem, "legacy_item")
+        assert (item.product_name, item.product_category, item.clinic_id) == ("Product 2", "Devices", "clinic1")
+        assert db.get(OrderItem, "legacy_orphan").product_name is None
+        assert db.get(Order, "legacy_order").clinic_name == "Clinic 2"
+        # Re-running finds nothing left to fill
+        assert backfill(connection, commit=False) == (0, 0)
+        db.rollback()
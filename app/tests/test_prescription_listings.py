@@ -0,0 +1,22 @@
+from app.tests.seed_data import headers_for
+
+def test_listings_carry_names_and_medications(seeded_client):
+    response = seeded_client.get("/api/prescriptions/patient/patient1", headers=headers_for("patient1", "patient"))
+    assert response.status_code == 200, response.text
+    [prescription] = response.json()
+    assert prescription["id"] == "prescription1"
+    assert (prescription["clinic_name"], prescription["patient_name"]) == ("Clinic 1", "Patient 1")
+    assert [medication["name"] for medication in prescription["medications"]] == ["Ibuprofen"]
+
+def test_clinic_listing_names_the_issuing_clinic(seeded_client):
+    # Any clinic may read another's list; clinic_name is the issuer, not the reader
+    response = seeded_client.get("/api/prescriptions/clinic/clinic1", headers=headers_for("clinic2", "clinic"))
+    assert response.status_code == 200, response.text
+    assert response.json() and {p["clinic_name"] for p in response.json()} == {"Clinic 1"}
+
+def test_query_count_does_not_grow_with_the_listing(seeded_client):
+    every = seeded_client.get("/api/prescriptions/all", headers=headers_for("admin", "admin"))
+    one = seeded_client.get("/api/prescriptions/patient/patient1", headers=headers_for("patient1", "patient"))
+    assert len(every.json()) > len(one.json())
+    # The prescriptions with both names, then their medications
+    assert every.headers["X-DB-Queries"] == one.headers["X-DB-Queries"] == "2"
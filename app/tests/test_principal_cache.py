@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.users import User
+from app.principal_cache import PrincipalCache, principal_cache
+from app.auth import create_access_token, get_current_user
+
+MOCK_USER = User(
+    id="cached_user_1",
+    email="cached@example.com",
+    name="Cached User",
+    type="patient",
+    is_active=True
+)
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+# --- Tests for PrincipalCache ---
+
+def test_get_returns_detached_copy():
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    cache.put(MOCK_USER)
+
+    first = cache.get(MOCK_USER.id)
+    second = cache.get(MOCK_USER.id)
+    assert first is not second
+    assert first.id == MOCK_USER.id
+    assert first.type == "patient"
+    assert first.is_active is True
+
+def test_get_miss_returns_none():
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    assert cache.get("unknown") is None
+
+def test_entries_expire_after_ttl():
+    cache = PrincipalCache(ttl_seconds=5, max_size=10)
+    with patch("app.principal_cache.time.monotonic", return_value=100.0):
+        cache.put(MOCK_USER)
+    with patch("app.principal_cache.time.monotonic", return_value=104.0):
+        assert cache.get(MOCK_USER.id) is not None
+    with patch("app.principal_cache.time.monotonic", return_value=105.0):
+        assert cache.get(MOCK_USER.id) is None
+    assert len(cache) == 0
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(ttl_seconds=60, max_size=2)
+    users = [User(id=f"user_{i}", email=f"u{i}@example.com", name="U", type="patient", is_active=True) for i in range(3)]
+    cache.put(users[0])
+    cache.put(users[1])
+    cache.get("user_0")  # user_1 is now least recently used
+    cache.put(users[2])
+
+    assert cache.get("user_0") is not None
+    assert cache.get("user_1") is None
+    assert cache.get("user_2") is not None
+
+def test_invalidate_removes_entry():
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    cache.put(MOCK_USER)
+    cache.invalidate(MOCK_USER.id)
+    assert cache.get(MOCK_USER.id) is None
+
+def test_disabled_cache_never_stores():
+    cache = PrincipalCache(ttl_seconds=0, max_size=10)
+    cache.put(MOCK_USER)
+    assert cache.get(MOCK_USER.id) is None
+
+# --- Tests for get_current_user with the cache ---
+
+def test_get_current_user_queries_database_once():
+    mock_db_session = MagicMock(spec=Session)
+    mock_db_session.query.return_value.filter.return_value.first.return_value = MOCK_USER
+    token = create_access_token({"sub": MOCK_USER.id})
+
+    first = asyncio.run(get_current_user(token=token, db=mock_db_session))
+    second = asyncio.run(get_current_user(token=token, db=mock_db_session))
+
+    assert first.id == second.id == MOCK_USER.id
+    mock_db_session.query.assert_called_once_with(User)
+
+# --- Tests for commit-time invalidation ---
+
+def test_committed_user_update_invalidates_cache():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(bind=engine)
+
+    db = TestingSession()
+    db.add(User(id="row_user", email="row@example.com", name="Row User", type="patient", is_active=True))
+    db.commit()
+
+    user = db.query(User).filter(User.id == "row_user").first()
+    principal_cache.put(user)
+    assert principal_cache.get("row_user") is not None
+
+    user.is_active = False
+    db.flush()
+    assert principal_cache.get("row_user") is not None  # Not yet committed
+
+    db.commit()
+    assert principal_cache.get("row_user") is None
+    db.close()
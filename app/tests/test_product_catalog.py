@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.clinics import Clinic
+from app.models.products import Product
+from app.models.users import User
+from app.routes.products import product_counts
+
+START = datetime(2025, 3, 1, 8, 0)
+CATEGORIES = ("Vitamins", "First Aid", "Devices")
+
+# catalog_clinic sells 40 products; prices repeat every 8 and timestamps every
+# 3 products, so every ordering has ties the id must break
+@pytest.fixture(scope="module")
+def client(seeded_engine, seeded_client):
+    session = sessionmaker(bind=seeded_engine)()
+    session.add(User(id="catalog_clinic", email="catalog_clinic@example.com", name="Catalog", type="clinic"))
+    session.add(Clinic(id="catalog_clinic"))
+    for p in range(40):
+        session.add(Product(id=f"catalog{p:02d}", clinic_id="catalog_clinic", name=f"Item {p % 13:02d}",
+                            price=Decimal("4.50") + (p % 8) * Decimal("2.25"), category=CATEGORIES[p % 3],
+                            in_stock=p % 5 != 0, created_at=START + timedelta(hours=p // 3)))
+    session.commit()
+    session.close()
+    product_counts.clear()
+    return seeded_client
+
+def all_products(seeded_engine):
+    with sessionmaker(bind=seeded_engine)() as db:
+        return [
+            {"id": p.id, "name": p.name, "price": p.price, "category": p.category, "clinic_id": p.clinic_id,
+             "in_stock": p.in_stock, "created_at": p.created_at}
+            for p in db.query(Product).all()
+        ]
+
+SORT_KEYS = {
+    "newest": (lambda p: (p["created_at"], p["id"]), True),
+    "price_asc": (lambda p: (p["price"], p["id"]), False),
+    "price_desc": (lambda p: (p["price"], p["id"]), True),
+    "name": (lambda p: (p["name"], p["id"]), False),
+}
+
+def expected_ids(products, sort, **filters):
+    matching = [
+        p for p in products
+        if all(p[name] == value for name, value in filters.items() if name not in ("min_price", "max_price"))
+        and p["price"] >= filters.get("min_price", 0)
+        and p["price"] <= filters.get("max_price", Decimal("1e9"))
+    ]
+    key, reverse = SORT_KEYS[sort]
+    return [p["id"] for p in sorted(matching, key=key, reverse=reverse)]
+
+def walk(client, limit, **params):
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/products", params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        page = [product["id"] for product in response.json()]
+        assert len(page) <= limit
+        seen += page
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen, response
+
+@pytest.mark.parametrize("sort", list(SORT_KEYS))
+def test_pages_follow_each_ordering(seeded_engine, client, sort):
+    seen, _ = walk(client, 7, sort=sort)
+    assert seen == expected_ids(all_products(seeded_engine), sort)
+
+@pytest.mark.parametrize("filters", [
+    {"category": "Devices"},
+    {"clinic_id": "catalog_clinic", "in_stock": True},
+    {"min_price": Decimal("6.75"), "max_price": Decimal("13.50")},
+    {"category": "Vitamins", "in_stock": False, "max_price": Decimal("10")},
+])
+@pytest.mark.parametrize("sort", ["price_asc", "newest"])
+def test_filters(seeded_engine, client, filters, sort):
+    params = {name: str(value).lower() if isinstance(value, bool) else str(value) for name, value in filters.items()}
+    seen, response = walk(client, 4, sort=sort, **params)
+    expected = expected_ids(all_products(seeded_engine), sort, **filters)
+    assert seen == expected
+    assert response.headers["X-Total-Count"] == str(len(expected))
+
+def test_first_page_and_trailing_slash(client):
+    response = client.get("/api/products/?limit=3")
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert response.json()[0]["price"]
+    assert 'rel="next"' in response.headers["Link"]
+
+def test_total_count_is_counted_once_per_filter(seeded_engine, client):
+    product_counts.clear()
+    first = client.get("/api/products?category=Devices&limit=2")
+    assert first.headers["X-DB-Queries"] == "2"  # The page and the count
+    following = client.get(f"/api/products?category=Devices&limit=2&cursor={first.headers['X-Next-Cursor']}")
+    assert following.headers["X-DB-Queries"] == "1"
+    assert following.headers["X-Total-Count"] == first.headers["X-Total-Count"]
+    # Another sort of the same filters reuses the count too
+    assert client.get("/api/products?category=Devices&sort=name").headers["X-DB-Queries"] == "1"
+
+@pytest.mark.parametrize("query,status", [
+    ("cursor=garbage", 400),
+    ("sort=price_asc&cursor=WyJub3QgYSBwcmljZSIsImNhdGFsb2cwMSJd", 400),  # ["not a price","catalog01"]
+    ("min_price=10&max_price=5", 400),
+    ("sort=popular", 422),
+    ("limit=0", 422),
+    ("min_price=-1", 422),
+])
+def test_invalid_requests(client, query, status):
+    assert client.get(f"/api/products?{query}").status_code == status
@@ -0,0 +1,139 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.products import Product
+from app.tests.seed_data import headers_for
+from app.typeahead import ProductSuggestions, product_suggestions
+
+CLINIC = headers_for("clinic1", "clinic")
+
+@pytest.fixture(scope="module")
+def client(seeded_client):
+    return seeded_client
+
+def add(client, name, category=None, description=None):
+    response = client.post("/api/products/", headers=CLINIC, json={
+        "name": name, "category": category, "description": description, "price": "5.00"
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+def ids(client, query):
+    response = client.get(f"/api/products/search?{query}")
+    assert response.status_code == 200, response.text
+    return [product["id"] for product in response.json()]
+
+def names(client, query):
+    response = client.get(f"/api/products/suggest?{query}")
+    assert response.status_code == 200, response.text
+    return [product["name"] for product in response.json()]
+
+@pytest.fixture(scope="module")
+def catalog(client):
+    # Build the typeahead first, so the products below reach it incrementally
+    assert names(client, "q=product") == ["Product 0"] * 5 + ["Product 1"] * 3
+    return {
+        "vitamin": add(client, "Vitamin D3 Drops", "Vitamins", "Daily sunshine supplement"),
+        "omega": add(client, "Omega 3 Capsules", "Supplements"),
+        "described": add(client, "Sunscreen SPF 50", "Skin Care", "Broad spectrum, with omega oils"),
+        "category": add(client, "Zinc Lozenges", "Omega Blends"),
+        "bandage": add(client, "Elastic Bandage", "First Aid", "Crêpe wrap for sprains"),
+    }
+
+# --- Search ---
+
+def test_name_matches_rank_above_category_and_description(client, catalog):
+    assert ids(client, "q=omega") == [catalog["omega"], catalog["category"], catalog["described"]]
+
+def test_every_word_must_match_as_prefix(client, catalog):
+    assert ids(client, "q=vit drop") == [catalog["vitamin"]]
+    assert ids(client, "q=crepe") == [catalog["bandage"]]  # Diacritics are ignored
+    assert ids(client, "q=vitamin drops zinc") == []
+    assert ids(client, "q=" + '"vit" OR NEAR(zinc*)') == []
+
+def test_category_filter_and_result_shape(client, catalog):
+    assert ids(client, "q=drop&category=First%20Aid") == []
+    [product] = client.get("/api/products/search?q=drop&category=Vitamins").json()
+    assert product["id"] == catalog["vitamin"]
+    assert (product["name"], product["price"], product["clinic_id"]) == ("Vitamin D3 Drops", "5.00", "clinic1")
+    assert product["in_stock"] is True and product["created_at"]
+
+def test_pagination_links_to_next_offset(client, catalog):
+    first = client.get("/api/products/search?q=product&limit=10")
+    assert first.headers["Link"] == '<http://testserver/api/products/search?q=product&limit=10&offset=10>; rel="next"'
+    rest = client.get("/api/products/search?q=product&limit=10&offset=10")
+    assert "Link" not in rest.headers
+    assert len(first.json()) + len(rest.json()) == 15
+
+def test_writes_keep_the_index_in_step(client, catalog):
+    product_id = add(client, "Heat Pack", "First Aid")
+    assert ids(client, "q=heat") == [product_id]
+    assert client.put(f"/api/products/{product_id}", headers=CLINIC, json={"name": "Cold Pack"}).status_code == 200
+    assert ids(client, "q=heat") == []
+    assert ids(client, "q=cold") == [product_id]
+    assert names(client, "q=cold") == ["Cold Pack"]
+    assert names(client, "q=heat") == []
+    assert client.delete(f"/api/products/{product_id}", headers=CLINIC).status_code == 204
+    assert ids(client, "q=cold") == []
+    assert names(client, "q=cold") == []
+
+# --- Typeahead ---
+
+def test_suggestions_match_word_prefixes(client, catalog):
+    assert names(client, "q=v") == ["Vitamin D3 Drops"]
+    assert names(client, "q=dro vit") == ["Vitamin D3 Drops"]
+    assert names(client, "q=ba el") == ["Elastic Bandage"]
+    assert names(client, "q=s") == ["Sunscreen SPF 50"]
+    assert names(client, "q=pro&limit=2") == ["Product 0", "Product 0"]
+    assert client.get("/api/products/suggest?q=").status_code == 422
+    assert client.get("/api/products/suggest?q=a&limit=50").status_code == 422
+
+def test_suggestions_are_served_from_memory(client, catalog):
+    response = client.get("/api/products/suggest?q=vit")
+    assert response.headers["X-DB-Queries"] == "0"
+
+def test_incremental_updates_match_a_rebuild(seeded_engine, client, catalog):
+    rebuilt = ProductSuggestions()
+    with sessionmaker(bind=seeded_engine)() as db:
+        rebuilt.rebuild(db)
+        assert rebuilt._keys == product_suggestions._keys
+        assert rebuilt._products == product_suggestions._products
+        # Products with the same name are told apart by id
+        assert [s["id"] for s in rebuilt.suggest(db, "product 0", 10)] == sorted(
+            product.id for product in db.query(Product).filter(Product.name == "Product 0")
+        )
+
+# A session whose product scan is overtaken by writes: they land after the
+# rows were read, as they would while a rebuild reads a large catalog
+class RacingSession:
+    def __init__(self, rows, during_scan):
+        self.rows = rows
+        self.during_scan = during_scan
+
+    def query(self, *columns):
+        return self
+
+    def __iter__(self):
+        self.during_scan()
+        return iter(self.rows)
+
+def test_writes_during_a_rebuild_are_not_lost():
+    suggestions = ProductSuggestions()
+    suggestions.rebuild(RacingSession([("p1", "Heat Pack", None), ("p2", "Ice Pack", None)], lambda: None))
+
+    def writes():
+        suggestions.upsert("p3", "Night Cream", "Skin Care")
+        suggestions.upsert("p1", "Warm Pack", None)
+        suggestions.remove("p2")
+    stale = [("p1", "Heat Pack", None), ("p2", "Ice Pack", None)]
+    suggestions.rebuild(RacingSession(stale, writes))
+
+    assert [s["name"] for s in suggestions.suggest(None, "pack", 10)] == ["Warm Pack"]
+    assert [s["id"] for s in suggestions.suggest(None, "night", 10)] == ["p3"]
+    assert suggestions.suggest(None, "heat", 10) == []
+    assert suggestions._change_logs == []
+
+def test_writes_during_the_first_build_are_replayed():
+    suggestions = ProductSuggestions()
+    suggestions.rebuild(RacingSession([], lambda: suggestions.upsert("p1", "Heat Pack")))
+    assert [s["id"] for s in suggestions.suggest(None, "heat", 10)] == ["p1"]
@@ -0,0 +1,87 @@
+"""
+Query-plan regression suite.
+
+Each case calls a route against a seeded SQLite database, captures every
+statement it runs and checks `EXPLAIN QUERY PLAN` for full table scans.
+A scan through an index (e.g. ORDER BY created_at) is fine; a bare
+"SCAN <table>" means a filter lost its index. Scans of derived tables
+(anon_N, e.g. a LIMITed subquery under a joined load) are not table scans.
+"""
+import re
+import pytest
+from sqlalchemy import event, select
+
+from app.models.prescriptions import Prescription, Medication
+from app.models.rewards import RewardPoint
+from app.tests.seed_data import headers_for
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+@pytest.fixture(scope="module")
+def planner(seeded_engine, seeded_client):
+    statements = []
+
+    @event.listens_for(seeded_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    yield seeded_engine, seeded_client, statements
+    event.remove(seeded_engine, "before_cursor_execute", capture)
+
+def full_scans(engine, statements):
+    scans = set()
+    with engine.connect() as connection:
+        raw = connection.connection.dbapi_connection
+        for statement, parameters in statements:
+            for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall():
+                match = FULL_SCAN.match(row[-1])
+                if match and not match.group(1).startswith("anon_"):
+                    # Drop the alias suffix SQLAlchemy adds for joined loads (users_1)
+                    scans.add(re.sub(r"_\d+$", "", match.group(1)))
+    return scans
+
+CASES = [
+    ("/api/appointments/patient/patient1", ("patient1", "patient")),
+    ("/api/appointments/clinic/clinic1", ("clinic1", "clinic")),
+    ("/api/appointments/clinic/clinic1?from=2025-01-01&to=2025-01-08", ("clinic1", "clinic")),
+    ("/api/appointments/availability?clinic_id=clinic1&service_id=service1&date=2030-01-07", None),
+    ("/api/products/orders/patient/patient1", ("patient1", "patient")),
+    ("/api/products/orders/recent", ("admin", "admin")),
+    ("/api/products/clinic/clinic1", None),
+    ("/api/products/all?category=Vitamins", None),
+    ("/api/products?sort=newest&limit=5", None),
+    ("/api/products?category=Vitamins&sort=price_asc&limit=5", None),
+    ("/api/products?sort=price_desc&min_price=5&max_price=20", None),
+    ("/api/products?category=First%20Aid&sort=name&in_stock=true", None),
+    ("/api/products?clinic_id=clinic1&sort=price_asc", None),
+    ("/api/products/search?q=product&category=Vitamins", None),
+    ("/api/clinics/clinic1/services", None),
+    ("/api/clinics/all?limit=2", None),
+    ("/api/clinics/search?q=clinic", None),
+    ("/api/clinics/nearby?lat=40.7&lng=-74&radius=5", None),
+    ("/api/rewards/patient/patient1", ("patient1", "patient")),
+]
+
+@pytest.mark.parametrize("path,user", CASES, ids=[case[0] for case in CASES])
+def test_route_queries_use_indexes(planner, path, user):
+    engine, client, statements = planner
+    statements.clear()
+    response = client.get(path, headers=headers_for(*user) if user else {})
+    assert response.status_code == 200, response.text
+    assert statements, "route ran no queries"
+    assert full_scans(engine, statements) == set()
+
+# Filters whose routes cannot be called here yet; checked on the query itself
+QUERIES = [
+    select(Prescription).where(Prescription.patient_id == "patient1"),
+    select(Prescription).where(Prescription.clinic_id == "clinic1"),
+    select(Medication).where(Medication.prescription_id == "prescription1"),
+    select(RewardPoint).where(RewardPoint.patient_id == "patient1", RewardPoint.type == "earned"),
+]
+
+@pytest.mark.parametrize("query", QUERIES, ids=[str(query.whereclause) for query in QUERIES])
+def test_filters_use_indexes(planner, query):
+    engine, client, statements = planner
+    statement = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    assert full_scans(engine, [(statement, ())]) == set()
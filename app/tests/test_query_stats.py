@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import text
+
+from app.query_stats import QueryBudgetExceeded, current_query_stats, query_budget
+from app.tests.seed_data import headers_for
+
+# --- Response headers ---
+
+def test_responses_carry_query_count_and_time(seeded_client):
+    response = seeded_client.get("/api/products/all")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "1"
+    assert float(response.headers["X-DB-Time-ms"]) > 0
+
+def test_counts_include_auth_and_route_queries(seeded_client):
+    response = seeded_client.get("/api/rewards/patient/patient1", headers=headers_for("patient1", "patient"))
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "3"
+
+def test_no_stats_outside_a_request(seeded_engine):
+    with seeded_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert current_query_stats() is None
+
+# --- Query budgets ---
+
+def test_query_budget_fails_when_exceeded(seeded_engine):
+    with pytest.raises(QueryBudgetExceeded, match="2 queries, budget 1"):
+        with query_budget(1):
+            with seeded_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+
+# Per-endpoint budgets against the seeded dataset. Budgets must not depend on
+# how many rows the endpoint returns; a loop issuing one query per row (N+1)
+# pushes the count past the budget.
+BUDGETS = [
+    ("/api/products/all", None, 1),
+    ("/api/products/all?category=Vitamins", None, 1),
+    ("/api/products/clinic/clinic1", None, 1),
+    ("/api/products/categories", None, 1),
+    ("/api/products?category=Vitamins&sort=price_asc&limit=2", None, 2),
+    ("/api/products/search?q=product", None, 1),
+    ("/api/clinics/clinic1/services", None, 2),
+    ("/api/rewards/info", None, 2),
+    ("/api/rewards/patient/patient1", ("patient1", "patient"), 3),
+    ("/api/rewards/top-earners", ("admin", "admin"), 1),
+    ("/api/appointments/patient/patient1", ("patient1", "patient"), 1),
+    ("/api/appointments/clinic/clinic1", ("clinic1", "clinic"), 1),
+    ("/api/appointments/clinic/clinic1?from=2025-01-01&to=2025-01-08", ("clinic1", "clinic"), 1),
+    ("/api/appointments/availability?clinic_id=clinic1&service_id=service1&date=2030-01-07", None, 3),
+    ("/api/products/orders/recent", ("admin", "admin"), 1),
+    ("/api/products/orders/all", ("admin", "admin"), 1),
+    ("/api/clinics/all", None, 1),
+    ("/api/clinics/all?limit=2&location=City", None, 1),
+    ("/api/clinics/search?q=clinic", None, 1),
+    ("/api/clinics/nearby?lat=40.7&lng=-74&radius=5", None, 1),
+    ("/api/clinics/featured", None, 2),
+    ("/api/products/orders/patient/patient1", ("patient1", "patient"), 2),
+    ("/api/products/orders/patient/patient1?limit=1", ("patient1", "patient"), 2),
+    ("/api/prescriptions/all", ("admin", "admin"), 2),
+    ("/api/prescriptions/patient/patient1", ("patient1", "patient"), 2),
+    ("/api/prescriptions/clinic/clinic1", ("clinic1", "clinic"), 2),
+]
+
+@pytest.mark.parametrize("path,user,budget", BUDGETS)
+def test_endpoint_query_budget(seeded_client, path, user, budget):
+    with query_budget(budget):
+        response = seeded_client.get(path, headers=headers_for(*user) if user else {})
+    assert response.status_code == 200, response.text
@@ -0,0 +1,137 @@
+import pytest
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import database
+from app.auth import create_access_token
+from app.database import Base, SessionLocal, ReadSessionLocal, create_database_engine
+from app.models.products import Product
+from app.revocation import revocation_filter
+from app.routes import products as product_routes
+from app.typeahead import product_suggestions
+
+CLINIC_ID = "replica_clinic"
+
+@pytest.fixture
+def client(tmp_path):
+    primary = create_database_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_database_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "Primary Bandage"), (replica, "Replica Bandage")):
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(Product.__table__.insert().values(
+                id=f"{name}_id", clinic_id=CLINIC_ID, name=name, price="4.99", category="First Aid", in_stock=True
+            ))
+
+    SessionLocal.configure(bind=primary)
+    ReadSessionLocal.configure(bind=replica)
+    database._recent_writers.clear()
+    revocation_filter.clear()
+
+    app = FastAPI()
+    app.include_router(product_routes.router, prefix="/api/products")
+    app.add_middleware(database.ReadYourWritesMiddleware)
+    yield TestClient(app)
+
+    SessionLocal.configure(bind=database.engine)
+    ReadSessionLocal.configure(bind=database.read_engine)
+    database._recent_writers.clear()
+    revocation_filter.clear()
+    primary.dispose()
+    replica.dispose()
+
+def clinic_headers():
+    token = create_access_token({"sub": CLINIC_ID, "type": "clinic", "active": True, "name": "Clinic", "email": "c@example.com"})
+    return {"Authorization": f"Bearer {token}"}
+
+def product_names(response):
+    assert response.status_code == 200
+    return {product["name"] for product in response.json()}
+
+def test_reads_are_served_by_the_replica(client):
+    assert product_names(client.get("/api/products/all")) == {"Replica Bandage"}
+
+def test_writer_reads_own_writes_from_primary(client):
+    headers = clinic_headers()
+    response = client.post("/api/products/", headers=headers, json={
+        "name": "New Gauze", "price": "2.50", "category": "First Aid", "in_stock": True
+    })
+    assert response.status_code == 200
+
+    assert product_names(client.get("/api/products/all", headers=headers)) == {"Primary Bandage", "New Gauze"}
+    # Other (anonymous) readers are still served by the replica
+    assert product_names(client.get("/api/products/all")) == {"Replica Bandage"}
+
+def add_gauze(client, headers):
+    response = client.post("/api/products/", headers=headers, json={
+        "name": "New Gauze", "price": "2.50", "category": "First Aid", "in_stock": True
+    })
+    assert response.status_code == 200
+    return response
+
+# Another worker serves the next read: it never saw the write, only the marker
+def test_marker_carries_read_your_writes_to_other_workers(client):
+    headers = clinic_headers()
+    response = add_gauze(client, headers)
+    assert response.headers["X-Read-Your-Writes"] == client.cookies[database.READ_YOUR_WRITES_COOKIE]
+    database._recent_writers.clear()
+    assert product_names(client.get("/api/products/all", headers=headers)) == {"Primary Bandage", "New Gauze"}
+
+    # Clients without cookies (the Cordova app) send the marker back as a header
+    marker = client.cookies[database.READ_YOUR_WRITES_COOKIE]
+    client.cookies.clear()
+    assert product_names(client.get("/api/products/all", headers=headers)) == {"Replica Bandage"}
+    response = client.get("/api/products/all", headers={**headers, "X-Read-Your-Writes": marker})
+    assert product_names(response) == {"Primary Bandage", "New Gauze"}
+
+def test_reads_do_not_hand_out_markers(client):
+    response = client.get("/api/products/all", headers=clinic_headers())
+    assert "X-Read-Your-Writes" not in response.headers
+    assert database.READ_YOUR_WRITES_COOKIE not in client.cookies
+
+def tampered(marker):
+    return marker[:-1] + ("1" if marker.endswith("0") else "0")
+
+@pytest.mark.parametrize("marker", [
+    lambda: database.write_marker("other_clinic"),  # Issued to someone else
+    lambda: database.write_marker(CLINIC_ID, now=time.time() - 60),  # Expired
+    lambda: tampered(database.write_marker(CLINIC_ID)),
+    lambda: "garbage",
+])
+def test_invalid_markers_read_the_replica(client, marker):
+    headers = {**clinic_headers(), "X-Read-Your-Writes": marker()}
+    assert product_names(client.get("/api/products/all", headers=headers)) == {"Replica Bandage"}
+    # Without a bearer token a marker is ignored
+    response = client.get("/api/products/all", headers={"X-Read-Your-Writes": database.write_marker(CLINIC_ID)})
+    assert product_names(response) == {"Replica Bandage"}
+
+def test_read_your_writes_window_expires(client, monkeypatch):
+    headers = clinic_headers()
+    database.note_write(CLINIC_ID)
+    assert product_names(client.get("/api/products/all", headers=headers)) == {"Primary Bandage"}
+
+    monkeypatch.setattr(database, "READ_YOUR_WRITES_SECONDS", 0)
+    assert product_names(client.get("/api/products/all", headers=headers)) == {"Replica Bandage"}
+
+def test_reads_do_not_mark_the_user_as_writer(client):
+    client.get("/api/products/all", headers=clinic_headers())
+    assert not database.wrote_recently(CLINIC_ID)
+
+def test_replica_sessions_reject_writes(client):
+    db = ReadSessionLocal()
+    try:
+        db.add(Product(id="rejected", clinic_id=CLINIC_ID, name="Rejected", price="1.00", category="First Aid"))
+        with pytest.raises(RuntimeError):
+            db.flush()
+    finally:
+        db.close()
+
+# A worker asked for suggestions before its first rebuild builds the index inline
+def test_cold_typeahead_is_built_from_the_primary(client):
+    product_suggestions.clear()
+    try:
+        response = client.get("/api/products/suggest?q=bandage")
+        assert product_names(response) == {"Primary Bandage"}
+    finally:
+        product_suggestions.clear()
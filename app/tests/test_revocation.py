@@ -0,0 +1,169 @@
+import asyncio
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.auth import create_user_tokens, decode_token, get_current_user, get_password_hash
+from app.database import Base, get_db
+from app.models.users import User
+from app.models.revocations import TokenRevocation
+from app.revocation import BloomFilter, RevocationFilter, revocation_filter
+from app.routes import auth as auth_routes
+
+@pytest.fixture
+def session_factory():
+    revocation_filter.clear()
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(bind=engine)
+
+    db = TestingSession()
+    db.add(User(id="revoke_user", email="revoke@example.com", name="Revoke User", type="patient",
+                hashed_password=get_password_hash("password123"), is_active=True))
+    db.commit()
+    db.close()
+    yield TestingSession
+    revocation_filter.clear()
+
+def resolve(TestingSession, token):
+    db = TestingSession()
+    try:
+        return asyncio.run(get_current_user(token=token, db=db))
+    finally:
+        db.close()
+
+def issue_token(TestingSession):
+    db = TestingSession()
+    user = db.query(User).filter(User.id == "revoke_user").first()
+    tokens = create_user_tokens(user)
+    db.close()
+    return tokens
+
+# --- Tests for BloomFilter ---
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"user:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user:{i}")
+    false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+# --- Tests for revocation through get_current_user ---
+
+def test_deactivation_revokes_existing_tokens(session_factory):
+    tokens = issue_token(session_factory)
+    assert resolve(session_factory, tokens["access_token"]).id == "revoke_user"
+
+    db = session_factory()
+    db.query(User).filter(User.id == "revoke_user").first().is_active = False
+    db.commit()
+    db.close()
+
+    with pytest.raises(HTTPException) as exc_info:
+        resolve(session_factory, tokens["access_token"])
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_tokens_issued_after_role_change_are_accepted(session_factory):
+    db = session_factory()
+    db.query(User).filter(User.id == "revoke_user").first().type = "clinic"
+    db.commit()
+    db.close()
+
+    time.sleep(1)  # iat has one-second resolution
+    tokens = issue_token(session_factory)
+    assert resolve(session_factory, tokens["access_token"]).type == "clinic"
+
+def test_other_workers_see_revocations_after_sync(session_factory):
+    tokens = issue_token(session_factory)
+    token_data = decode_token(tokens["access_token"])
+    other_worker = RevocationFilter(sync_seconds=3600)
+    db = session_factory()
+    assert not other_worker.is_revoked(db, "revoke_user", token_data.issued_at, token_data.jti)
+
+    now = datetime.now(timezone.utc)
+    db.add(TokenRevocation(user_id="revoke_user", jti=token_data.jti, reason="logout",
+                           revoked_at=now, expires_at=now + timedelta(minutes=15)))
+    db.commit()
+
+    other_worker.sync(db, force=True)
+    assert other_worker.is_revoked(db, "revoke_user", token_data.issued_at, token_data.jti)
+    db.close()
+
+def test_rebuild_purges_expired_rows(session_factory):
+    db = session_factory()
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    db.add(TokenRevocation(user_id="revoke_user", jti="old", reason="logout", revoked_at=past, expires_at=past))
+    db.commit()
+
+    RevocationFilter().rebuild(db)
+    assert db.query(TokenRevocation).count() == 0
+    db.close()
+
+# --- Tests for POST /api/auth/logout ---
+
+def test_logout_revokes_access_and_refresh_tokens(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    test_app = FastAPI()
+    test_app.include_router(auth_routes.router, prefix="/api/auth")
+    test_app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(test_app)
+
+    tokens = issue_token(session_factory)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/auth/check", headers=headers).status_code == status.HTTP_200_OK
+
+    response = client.post("/api/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert client.get("/api/auth/check", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+# --- Tests for POST /api/auth/refresh ---
+
+def test_refresh_tokens_are_single_use(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    test_app = FastAPI()
+    test_app.include_router(auth_routes.router, prefix="/api/auth")
+    test_app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(test_app)
+
+    tokens = issue_token(session_factory)
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_200_OK
+    rotated = response.json()["refresh_token"]
+    assert rotated != tokens["refresh_token"]
+
+    # Replaying the old token fails; its replacement still works once
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.post("/api/auth/refresh", json={"refresh_token": rotated}).status_code == status.HTTP_200_OK
+    assert client.post("/api/auth/refresh", json={"refresh_token": rotated}).status_code == status.HTTP_401_UNAUTHORIZED
+
+    db = session_factory()
+    assert [row.reason for row in db.query(TokenRevocation)] == ["refreshed", "refreshed"]
+    db.close()
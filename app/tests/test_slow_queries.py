@@ -0,0 +1,138 @@
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import get_db
+from app.routes import db_admin
+from app.slow_queries import SlowQueryLog, fingerprint, parameter_shape
+from app.tests.seed_data import headers_for
+
+# --- Fingerprints ---
+
+def test_fingerprint_replaces_values_and_collapses_in_lists():
+    assert fingerprint("SELECT * FROM users WHERE id IN (?, ?, ?) AND name = 'O''Brien' LIMIT 10") == \
+        "SELECT * FROM users WHERE id IN (?...) AND name = ? LIMIT ?"
+    assert fingerprint("SELECT *\n  FROM orders WHERE patient_id = %(patient_id_1)s") == \
+        fingerprint("SELECT * FROM orders WHERE patient_id = :patient_id_1")
+
+def test_fingerprint_keeps_identifiers_with_digits():
+    assert fingerprint("SELECT users_1.id FROM users AS users_1") == "SELECT users_1.id FROM users AS users_1"
+
+# --- Recording ---
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        connection.execute(text("INSERT INTO items (name) VALUES ('a'), ('b')"))
+    yield engine
+    engine.dispose()
+
+def test_records_histograms_per_fingerprint(engine):
+    log = SlowQueryLog(threshold_ms=10_000)
+    log.attach(engine)
+    with engine.connect() as connection:
+        for name in ("a", "b", "c"):
+            connection.execute(text("SELECT id FROM items WHERE name = :name"), {"name": name})
+    log.detach(engine)
+
+    [entry] = [e for e in log.report() if e["fingerprint"] == "SELECT id FROM items WHERE name = ?"]
+    assert entry["calls"] == 3
+    assert entry["slow_calls"] == 0
+    assert sum(entry["histogram"].values()) == 3
+    assert entry["samples"] == []
+
+def test_slow_statements_capture_plan_and_append_jsonl(engine, tmp_path):
+    log_path = tmp_path / "slow.jsonl"
+    log = SlowQueryLog(threshold_ms=0, log_path=str(log_path), samples=2)
+    log.attach(engine)
+    with engine.connect() as connection:
+        for name in ("a", "b", "c"):
+            connection.execute(text("SELECT id FROM items WHERE name = :name"), {"name": name})
+    log.detach(engine)
+
+    [entry] = [e for e in log.report() if e["fingerprint"] == "SELECT id FROM items WHERE name = ?"]
+    assert entry["slow_calls"] == 3
+    assert len(entry["samples"]) == 2  # only the most recent samples are kept
+    assert any("SCAN items" in step for step in entry["samples"][-1]["plan"])
+
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [line["id"] for line in lines].count(entry["id"]) == 3
+    assert all(line["plan"] for line in lines if line["id"] == entry["id"])
+
+def test_samples_keep_parameter_shapes_not_values(engine, tmp_path):
+    log_path = tmp_path / "slow.jsonl"
+    log = SlowQueryLog(threshold_ms=0, log_path=str(log_path))
+    log.attach(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT id FROM items WHERE name = :name AND id > :id"),
+                           {"name": "secret@example.com", "id": 1})
+        connection.execute(text("INSERT INTO items (name) VALUES (:name)"),
+                           [{"name": "hash$2b$12$abc"}, {"name": None}])
+    log.detach(engine)
+
+    dumped = log_path.read_text() + json.dumps(log.report())
+    assert "secret@example.com" not in dumped and "$2b$12$abc" not in dumped
+    samples = {entry["fingerprint"]: entry["samples"][-1] for entry in log.report() if entry["samples"]}
+    assert samples["SELECT id FROM items WHERE name = ? AND id > ?"]["parameters"] == ["str", "int"]
+    assert samples["INSERT INTO items (name) VALUES (?)"]["parameters"] == {"rows": 2, "shape": ["str"]}
+    # The plan is still taken with the real values
+    assert samples["SELECT id FROM items WHERE name = ? AND id > ?"]["plan"]
+
+def test_parameter_shape():
+    assert parameter_shape({"email": "a@b.c", "age": None}) == {"email": "str", "age": "NoneType"}
+    assert parameter_shape((1, 2.5)) == ["int", "float"]
+    assert parameter_shape([], executemany=True) == {"rows": 0, "shape": None}
+    assert parameter_shape(None) is None
+
+def test_fingerprint_limit_bounds_memory():
+    log = SlowQueryLog(threshold_ms=10_000, max_fingerprints=2)
+    for table in ("a", "b", "c"):
+        log.record(f"SELECT * FROM {table}", 1.0)
+    assert len(log.report()) == 2
+
+# --- Admin endpoint ---
+
+@pytest.fixture
+def client(monkeypatch, seeded_engine):
+    log = SlowQueryLog(threshold_ms=10_000)
+    log.record("SELECT * FROM products WHERE id = 'x'", 3.0)
+    log.record("SELECT * FROM products WHERE id = 'y'", 5.0)
+    monkeypatch.setattr(db_admin, "slow_query_log", log)
+    monkeypatch.setattr(db_admin, "SLOW_QUERY_LOG", True)
+    app = FastAPI()
+    app.include_router(db_admin.router, prefix="/api/admin/db")
+    TestingSession = sessionmaker(bind=seeded_engine)
+
+    def override_get_db():
+        db = TestingSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+def test_report_is_admin_only(client):
+    response = client.get("/api/admin/db/slow-queries", headers=headers_for("patient1", "patient"))
+    assert response.status_code == 403
+
+def test_report_and_jsonl_dump(client):
+    headers = headers_for("admin", "admin")
+    report = client.get("/api/admin/db/slow-queries", headers=headers).json()
+    assert report[0]["fingerprint"] == "SELECT * FROM products WHERE id = ?"
+    assert report[0]["calls"] == 2
+    assert report[0]["max_ms"] == 5.0
+
+    dump = client.get("/api/admin/db/slow-queries.jsonl", headers=headers)
+    assert dump.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["id"] for line in dump.text.splitlines()] == [report[0]["id"]]
+
+def test_report_is_unavailable_when_disabled(client, monkeypatch):
+    monkeypatch.setattr(db_admin, "SLOW_QUERY_LOG", False)
+    assert client.get("/api/admin/db/slow-queries", headers=headers_for("admin", "admin")).status_code == 404
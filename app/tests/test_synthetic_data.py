@@ -0,0 +1,135 @@
+import uuid
+import pytest
+from sqlalchemy import create_engine, func, select, text
+
+import app.synthetic_data
+from app.availability import SLOT_MINUTES, service_span
+from app.database import Base
+from app.models.appointments import Appointment, AppointmentSlot
+from app.models.clinics import ClinicService
+from app.models.products import Order, OrderItem
+from app.models.rewards import RewardPoint
+from app.synthetic_data import generate, seed_namespace, synthetic_id
+
+VOLUMES = {"clinics": 3, "patients": 40, "orders": 120, "appointments": 30}
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def make(name):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        Base.metadata.create_all(bind=engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(app.synthetic_data, "get_password_hash", lambda password: calls.append(password) or "hash")
+    return calls
+
+def test_generates_requested_volumes_in_chunks(make_engine, hash_calls):
+    engine = make_engine("synthetic.db")
+    with engine.connect() as connection:
+        counts = generate(connection, seed=1, chunk_size=7, products_per_clinic=4, **VOLUMES)
+
+    assert counts["users"] == 43
+    assert counts["clinics"] == 3
+    assert counts["products"] == 12
+    assert counts["patients"] == 40
+    assert counts["appointments"] == 30
+    assert counts["orders"] == 120
+    assert counts["order_items"] >= 120
+    # Every account shares one password hash
+    assert hash_calls == ["password123"]
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(DISTINCT hashed_password) FROM users")).scalar() == 1
+
+def test_referential_integrity_and_consistent_totals(make_engine, hash_calls):
+    engine = make_engine("synthetic.db")
+    with engine.connect() as connection:
+        generate(connection, seed=2, **VOLUMES)
+        orphans = {
+            "order_items": "SELECT count(*) FROM order_items WHERE order_id NOT IN (SELECT id FROM orders) "
+                           "OR product_id NOT IN (SELECT id FROM products)",
+            "orders": "SELECT count(*) FROM orders WHERE patient_id NOT IN (SELECT id FROM patients)",
+            "appointments": "SELECT count(*) FROM appointments WHERE clinic_id NOT IN (SELECT id FROM clinics) "
+                            "OR patient_id NOT IN (SELECT id FROM patients) "
+                            "OR service_id NOT IN (SELECT id FROM clinic_services WHERE clinic_id = appointments.clinic_id)",
+            "reward_points": "SELECT count(*) FROM reward_points WHERE patient_id NOT IN (SELECT id FROM patients)",
+        }
+        for table, query in orphans.items():
+            assert connection.execute(text(query)).scalar() == 0, table
+
+        item_totals = dict(connection.execute(
+            select(OrderItem.order_id, func.sum(OrderItem.price * OrderItem.quantity)).group_by(OrderItem.order_id)
+        ).all())
+        for order_id, total in connection.execute(select(Order.id, Order.total)):
+            assert float(total) == pytest.approx(float(item_totals[order_id]))
+
+        earned, redeemed = connection.execute(select(
+            func.sum(RewardPoint.points).filter(RewardPoint.type == "earned"),
+            func.sum(RewardPoint.points).filter(RewardPoint.type == "redeemed"),
+        )).one()
+        assert earned >= (redeemed or 0)
+
+def test_active_appointments_claim_their_slots_without_overlap(make_engine, hash_calls):
+    engine = make_engine("synthetic.db")
+    with engine.connect() as connection:
+        # One clinic and many appointments, so times collide often; the slots'
+        # primary key would refuse any overlapping claim
+        counts = generate(connection, seed=7, clinics=1, patients=5, orders=0, appointments=400)
+        claims = {}
+        for appointment_id, clinic_id, day, start in connection.execute(select(
+            AppointmentSlot.appointment_id, AppointmentSlot.clinic_id, AppointmentSlot.date, AppointmentSlot.start
+        )):
+            claims.setdefault(appointment_id, []).append(start)
+        rows = connection.execute(
+            select(Appointment.id, Appointment.status, Appointment.time, ClinicService.duration)
+            .join(ClinicService, ClinicService.id == Appointment.service_id)
+        ).all()
+
+    assert counts["appointment_slots"] == sum(len(starts) for starts in claims.values())
+    for appointment_id, status, start, duration in rows:
+        if status == "cancelled":
+            assert appointment_id not in claims
+            continue
+        first = start.hour * 60 + start.minute
+        assert first % SLOT_MINUTES == 0
+        assert sorted(claims[appointment_id]) == [
+            f"{minute // 60:02d}:{minute % 60:02d}"
+            for minute in range(first, first + service_span(duration), SLOT_MINUTES)
+        ]
+    # Some appointments found no free time and were generated as cancelled
+    assert sum(status == "cancelled" for _, status, _, _ in rows) > 0
+
+def test_same_seed_gives_same_data(make_engine, hash_calls):
+    dumps = []
+    for name in ("first.db", "second.db"):
+        engine = make_engine(name)
+        with engine.connect() as connection:
+            generate(connection, seed=3, **VOLUMES)
+            dumps.append(connection.execute(text(
+                "SELECT o.id, o.patient_id, o.total, o.created_at, i.product_id, i.quantity "
+                "FROM orders o JOIN order_items i ON i.order_id = o.id ORDER BY i.id"
+            )).all())
+    assert dumps[0] == dumps[1]
+
+def test_refuses_to_generate_the_same_seed_twice(make_engine, hash_calls):
+    engine = make_engine("synthetic.db")
+    with engine.connect() as connection:
+        generate(connection, seed=4, **VOLUMES)
+        with pytest.raises(ValueError, match="seed 4 already exists"):
+            generate(connection, seed=4, **VOLUMES)
+        # A different seed coexists with the first dataset
+        generate(connection, seed=5, **VOLUMES)
+
+def test_synthetic_ids_are_uuid5():
+    namespace = seed_namespace(6)
+    for index in range(100):
+        assert synthetic_id(namespace, "order", index) == str(uuid.uuid5(namespace, f"order/{index}"))
@@ -0,0 +1,145 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi import FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.auth import (
+    create_access_token,
+    create_refresh_token,
+    create_user_tokens,
+    decode_token,
+    get_current_user,
+    get_current_admin,
+    get_password_hash,
+    is_admin,
+    SECRET_KEY,
+    ALGORITHM
+)
+from app.database import Base, get_db
+from app.models.users import User
+from app.routes import auth as auth_routes
+from app.principal_cache import principal_cache
+from app.revocation import revocation_filter
+
+MOCK_ADMIN_USER = User(id="claims_admin", email="admin@example.com", name="Admin", type="Administrator", is_active=True)
+MOCK_PATIENT_USER = User(id="claims_patient", email="patient@example.com", name="Patient", type="patient", is_active=True)
+
+# --- Tests for token claims ---
+
+def test_access_token_carries_role_and_active_claims():
+    tokens = create_user_tokens(MOCK_PATIENT_USER)
+    payload = jwt.decode(tokens["access_token"], SECRET_KEY, algorithms=[ALGORITHM])
+
+    assert payload["sub"] == MOCK_PATIENT_USER.id
+    assert payload["type"] == "patient"
+    assert payload["active"] is True
+    assert payload["token_use"] == "access"
+    assert tokens["expires_in"] > 0
+
+def test_refresh_token_is_rejected_as_access_token():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_token(create_refresh_token(MOCK_PATIENT_USER.id))
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_access_token_is_rejected_as_refresh_token():
+    with pytest.raises(HTTPException):
+        decode_token(create_access_token({"sub": MOCK_PATIENT_USER.id}), token_use="refresh")
+
+def test_is_admin_accepts_all_admin_types():
+    assert is_admin(MOCK_ADMIN_USER)
+    assert not is_admin(MOCK_PATIENT_USER)
+    assert not is_admin(User(id="no_type", type=None))
+
+# --- Tests for claim-based principals ---
+
+def test_get_current_user_resolves_claims_without_user_lookup(client):
+    _, TestingSession = client
+    db = TestingSession()
+    token = create_user_tokens(MOCK_ADMIN_USER)["access_token"]
+
+    with patch.object(db, "query", wraps=db.query) as query_spy:
+        principal = asyncio.run(get_current_user(token=token, db=db))
+    db.close()
+
+    assert principal.id == MOCK_ADMIN_USER.id
+    assert principal.type == "Administrator"
+    assert principal.name == "Admin"
+    assert User not in [call.args[0] for call in query_spy.call_args_list]
+
+def test_get_current_user_falls_back_for_legacy_tokens():
+    mock_db_session = MagicMock(spec=Session)
+    mock_db_session.query.return_value.filter.return_value.first.return_value = MOCK_PATIENT_USER
+    legacy_token = jwt.encode({"sub": "legacy_patient"}, SECRET_KEY, algorithm=ALGORITHM)
+
+    principal = asyncio.run(get_current_user(token=legacy_token, db=mock_db_session))
+
+    assert principal.type == "patient"
+    mock_db_session.query.assert_called_once_with(User)
+
+def test_get_current_admin_rejects_non_admin():
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_current_admin(current_user=MOCK_PATIENT_USER))
+    assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+
+# --- Tests for POST /api/auth/refresh ---
+
+@pytest.fixture
+def client():
+    principal_cache.clear()
+    revocation_filter.clear()
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(bind=engine)
+
+    db = TestingSession()
+    db.add(User(id="refresh_user", email="refresh@example.com", name="Refresh User", type="clinic",
+                hashed_password=get_password_hash("password123"), is_active=True))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    test_app = FastAPI()
+    test_app.include_router(auth_routes.router, prefix="/api/auth")
+    test_app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(test_app), TestingSession
+
+def test_login_returns_refresh_token_and_refresh_rotates(client):
+    test_client, _ = client
+    response = test_client.post("/api/auth/login", json={"email": "refresh@example.com", "password": "password123"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["refresh_token"]
+
+    response = test_client.post("/api/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == status.HTTP_200_OK
+    refreshed = response.json()
+    assert refreshed["user"]["type"] == "clinic"
+    assert refreshed["refresh_token"] != data["refresh_token"]
+    assert decode_token(refreshed["access_token"]).type == "clinic"
+
+def test_refresh_rejects_deactivated_user(client):
+    test_client, TestingSession = client
+    db = TestingSession()
+    db.query(User).filter(User.id == "refresh_user").update({"is_active": False})
+    db.commit()
+    db.close()
+
+    response = test_client.post("/api/auth/refresh", json={"refresh_token": create_refresh_token("refresh_user")})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_refresh_rejects_access_token(client):
+    test_client, _ = client
+    access_token = create_user_tokens(MOCK_PATIENT_USER)["access_token"]
+    response = test_client.post("/api/auth/refresh", json={"refresh_token": access_token})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.rewards import RewardPoint
+from app.tests.seed_data import SEED_PATIENTS, headers_for
+
+@pytest.fixture
+def extra_points(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    session.add_all([
+        RewardPoint(id="extra1", patient_id="patient3", points=500, description="Order", type="earned"),
+        RewardPoint(id="extra2", patient_id="patient3", points=150, description="Voucher", type="redeemed"),
+        RewardPoint(id="extra3", patient_id="patient7", points=200, description="Order", type="earned"),
+    ])
+    session.commit()
+    yield
+    session.query(RewardPoint).filter(RewardPoint.id.in_(["extra1", "extra2", "extra3"])).delete()
+    session.commit()
+    session.close()
+
+def test_top_earners_are_ranked_by_summed_points(seeded_client, extra_points):
+    response = seeded_client.get("/api/rewards/top-earners?limit=3", headers=headers_for("admin", "admin"))
+    assert response.status_code == 200, response.text
+    assert response.json() == [
+        {"patientId": "patient3", "name": "Patient 3", "totalPoints": 599, "redeemedPoints": 150, "currentBalance": 449},
+        {"patientId": "patient7", "name": "Patient 7", "totalPoints": 299, "redeemedPoints": 0, "currentBalance": 299},
+        {"patientId": "patient0", "name": "Patient 0", "totalPoints": 99, "redeemedPoints": 0, "currentBalance": 99},
+    ]
+
+def test_top_earners_are_one_query_however_many_rows(seeded_client):
+    response = seeded_client.get(f"/api/rewards/top-earners?limit={SEED_PATIENTS * 2}", headers=headers_for("admin", "admin"))
+    assert len(response.json()) == SEED_PATIENTS
+    assert response.headers["X-DB-Queries"] == "1"
@@ -0,0 +1,165 @@
+"""
+Product name typeahead served from memory.
+
+ProductSuggestions keeps a sorted list of (word, name, product id) keys, one
+per word of every product name. A prefix is a contiguous range of that list
+that starts where a binary search lands, so suggestions never touch the
+database once the list is built. Products whose name matches every typed word as a
+prefix are returned in alphabetical order of the matching word and name.
+
+A background task (started in main.py) builds the list from the products
+table at startup and rebuilds it every TYPEAHEAD_REBUILD_SECONDS, which
+picks up writes made through other workers; a worker asked before then
+builds it inline once. add_product, update_product and delete_product
+update it incrementally in the process that served the write.
+
+A rebuild reads a snapshot that may predate writes committed while it runs,
+so upserts and removes made during a rebuild are also logged and replayed
+onto the new index before it is published. Every rebuild, periodic or
+inline, reads the primary, since a lagging replica would drop writes
+committed before it started.
+"""
+from bisect import bisect_left, insort
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+import asyncio
+import logging
+import os
+import threading
+
+from app.models.products import Product
+from app.search import search_terms
+
+logger = logging.getLogger(__name__)
+
+TYPEAHEAD_REBUILD_SECONDS = float(os.environ.get("TYPEAHEAD_REBUILD_SECONDS", "600"))
+# Keys read per suggestion request; bounds the work for one- and two-letter prefixes
+TYPEAHEAD_MAX_SCAN = int(os.environ.get("TYPEAHEAD_MAX_SCAN", "5000"))
+SUGGESTION_LIMIT = int(os.environ.get("SUGGESTION_LIMIT", "8"))
+MAX_SUGGESTION_LIMIT = 20
+
+
+class ProductSuggestions:
+    """Per-process prefix index over product names."""
+
+    def __init__(self, rebuild_seconds: float = TYPEAHEAD_REBUILD_SECONDS, max_scan: int = TYPEAHEAD_MAX_SCAN):
+        self.rebuild_seconds = rebuild_seconds
+        self.max_scan = max_scan
+        self._keys = None  # Sorted (word, lowercased name, product id); None until built
+        self._products = {}  # product id -> (name, category, words)
+        self._change_logs = []  # One list per rebuild in progress, of writes made since it started
+        self._lock = threading.Lock()
+
+    def rebuild(self, db: Session):
+        """Rebuild the index from every product and publish it."""
+        changes = []  # (product id, name, category), or (product id,) for a removal
+        with self._lock:
+            self._change_logs.append(changes)
+        products = {}
+        keys = []
+        try:
+            for product_id, name, category in db.query(Product.id, Product.name, Product.category):
+                words = tuple(sorted(set(search_terms(name or ""))))
+                products[product_id] = (name, category, words)
+                keys.extend((word, name.lower(), product_id) for word in words)
+            keys.sort()
+        except Exception:
+            with self._lock:
+                self._change_logs.remove(changes)
+            raise
+        with self._lock:
+            self._change_logs.remove(changes)
+            # Writes made while the products were read may be missing from them
+            for change in changes:
+                if len(change) == 1:
+                    self._remove(change[0], keys, products)
+                else:
+                    self._insert(*change, keys, products)
+            self._keys, self._products = keys, products
+        logger.info(f"Product typeahead rebuilt: {len(products)} products, {len(keys)} keys")
+
+    def upsert(self, product_id: str, name: str, category: str = None):
+        """Add a product, or replace its name and category."""
+        with self._lock:
+            for changes in self._change_logs:
+                changes.append((product_id, name, category))
+            if self._keys is None:
+                return  # Not built yet; the first build reads the product or replays this
+            self._insert(product_id, name, category, self._keys, self._products)
+
+    def remove(self, product_id: str):
+        """Drop a deleted product."""
+        with self._lock:
+            for changes in self._change_logs:
+                changes.append((product_id,))
+            if self._keys is not None:
+                self._remove(product_id, self._keys, self._products)
+
+    @staticmethod
+    def _insert(product_id: str, name: str, category: str, keys: list, products: dict):
+        ProductSuggestions._remove(product_id, keys, products)
+        words = tuple(sorted(set(search_terms(name or ""))))
+        products[product_id] = (name, category, words)
+        for word in words:
+            insort(keys, (word, name.lower(), product_id))
+
+    @staticmethod
+    def _remove(product_id: str, keys: list, products: dict):
+        entry = products.pop(product_id, None)
+        if entry is None:
+            return
+        name, _, words = entry
+        for word in words:
+            key = (word, name.lower(), product_id)
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+
+    def suggest(self, db: Session, query: str, limit: int) -> list:
+        """Up to limit products whose name has a word starting with each word of query."""
+        if self._keys is None:
+            self.rebuild(db)
+        terms = search_terms(query)
+        if not terms:
+            return []
+        # The longest word has the narrowest range; the others are checked per product
+        lead = max(terms, key=len)
+        others = [term for term in terms if term != lead]
+        suggestions = []
+        seen = set()
+        with self._lock:
+            keys, products = self._keys, self._products
+            start = bisect_left(keys, (lead,))
+            for word, _, product_id in keys[start:start + self.max_scan]:
+                if not word.startswith(lead):
+                    break
+                if product_id in seen:
+                    continue
+                name, category, words = products[product_id]
+                if all(any(w.startswith(term) for w in words) for term in others):
+                    seen.add(product_id)
+                    suggestions.append({"id": product_id, "name": name, "category": category})
+                    if len(suggestions) == limit:
+                        break
+        return suggestions
+
+    def clear(self):
+        with self._lock:
+            self._keys = None
+            self._products = {}
+
+    async def rebuild_periodically(self, session_factory):
+        """Rebuild forever; a failed rebuild keeps serving the previous index."""
+        while True:
+            db = session_factory()
+            try:
+                await run_in_threadpool(self.rebuild, db)
+            except Exception:
+                logger.exception("Product typeahead rebuild failed")
+            finally:
+                db.close()
+            await asyncio.sleep(self.rebuild_seconds)
+
+
+# Process-wide index served by GET /api/products/suggest
+product_suggestions = ProductSuggestions()
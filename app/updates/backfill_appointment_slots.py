@@ -0,0 +1,89 @@
+"""
+Slot claims for appointments booked before double-booking protection.
+
+Migration 0010 creates appointment_slots and runs this backfill, which
+claims the slots of every active appointment from today on, BATCH_SIZE
+appointments at a time. Existing double bookings cannot all hold their
+slots: the first appointment (in id order) keeps a contested slot, and the
+others are logged so the clinic can resolve them. Appointments that already
+hold claims are skipped, so the backfill can be re-run.
+
+    python -m app.updates.backfill_appointment_slots [--batch-size 5000]
+"""
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import column, exists, select, table
+from sqlalchemy.dialects import postgresql, sqlite
+import argparse
+import logging
+
+from app.availability import SLOT_MINUTES, minutes_of, service_span, slot_starts
+from app.models.types import to_date
+from app.updates.backfill_numeric_columns import BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+appointments = table("appointments", column("id"), column("clinic_id"), column("service_id"), column("date"),
+                     column("time"), column("status"))
+services = table("clinic_services", column("id"), column("duration"))
+slots = table("appointment_slots", column("clinic_id"), column("date"), column("start"), column("appointment_id"))
+
+
+# INSERT that skips slots already claimed
+def _insert_claims(connection):
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    return dialect.insert(slots).on_conflict_do_nothing()
+
+
+# Claim slots for active appointments from today on; returns (claimed, contested) slot counts
+def backfill(connection, batch_size: int = BATCH_SIZE, commit: bool = True, today: date = None):
+    today = (today or date.today()).isoformat()
+    claimed = contested = 0
+    last_id = None
+    while True:
+        query = select(
+            appointments.c.id, appointments.c.clinic_id, appointments.c.date, appointments.c.time, services.c.duration
+        ).select_from(appointments.outerjoin(services, services.c.id == appointments.c.service_id)).where(
+            appointments.c.date >= today,
+            appointments.c.status != "cancelled",
+            ~exists().where(slots.c.appointment_id == appointments.c.id)
+        ).order_by(appointments.c.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(appointments.c.id > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+
+        for row in rows:
+            try:
+                day, start = to_date(row.date).isoformat(), minutes_of(row.time)
+            except (HTTPException, ValueError):
+                logger.warning(f"Appointment {row.id}: cannot place {row.date!r} {row.time!r} on the slot grid")
+                continue
+            # A time off the slot grid also claims the slot it starts in
+            offset = start % SLOT_MINUTES
+            span = service_span(row.duration) + (SLOT_MINUTES if offset else 0)
+            values = [
+                {"clinic_id": row.clinic_id, "date": day, "start": slot, "appointment_id": row.id}
+                for slot in slot_starts(start - offset, span)
+            ]
+            inserted = connection.execute(_insert_claims(connection), values).rowcount
+            claimed += inserted
+            if inserted < len(values):
+                contested += len(values) - inserted
+                logger.warning(f"Appointment {row.id} overlaps another booking at clinic {row.clinic_id} on {row.date}")
+        if commit:
+            connection.commit()
+        last_id = rows[-1].id
+    logger.info(f"Backfilled appointment slots: {claimed} claimed, {contested} contested")
+    return claimed, contested
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description="Claim slots for appointments booked before slot claims existed.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    with engine.connect() as connection:
+        backfill(connection, args.batch_size)
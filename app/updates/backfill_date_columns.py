@@ -0,0 +1,88 @@
+"""
+Batched, resumable backfill for the string -> Date/Time column migration.
+
+The same expand/backfill/contract steps as the numeric migration (see
+backfill_numeric_columns): 0011 adds a typed <column>_new next to each string
+column in DATE_COLUMNS, 0012 runs this backfill and 0013 swaps the staging
+columns in. 0013 then fills appointments.start_at, the date and time
+combined, which calendar queries range-scan.
+
+    python -m app.updates.backfill_date_columns [--batch-size 5000]
+"""
+from datetime import datetime
+from sqlalchemy import Date, DateTime, Time, bindparam, column, select, table, update
+import argparse
+import logging
+
+from app.models.types import to_date, to_time
+from app.updates.backfill_numeric_columns import BATCH_SIZE, _has_column, backfill_column, staging_column
+
+logger = logging.getLogger(__name__)
+
+# (table, string column, target type)
+DATE_COLUMNS = [
+    ("appointments", "date", Date()),
+    ("appointments", "time", Time()),
+    ("prescriptions", "issue_date", Date()),
+    ("prescriptions", "valid_until", Date()),
+    ("seasons", "start_date", Date()),
+    ("seasons", "end_date", Date()),
+]
+
+
+# Convert a legacy ISO date or HH:MM time string; returns None if it cannot be parsed
+def convert_temporal(raw: str, target_type):
+    try:
+        return to_time(raw) if isinstance(target_type, Time) else to_date(raw)
+    except ValueError:
+        return None
+
+
+# Backfill every staged column; columns without a staging column are skipped.
+# Pass commit=False when the connection is already in autocommit mode.
+def backfill(connection, batch_size: int = BATCH_SIZE, commit: bool = True):
+    for table_name, column_name, target_type in DATE_COLUMNS:
+        if not _has_column(connection, table_name, staging_column(column_name)):
+            continue
+        converted, unparseable = backfill_column(connection, table_name, column_name, target_type, batch_size, commit,
+                                                 convert=convert_temporal)
+        logger.info(f"Backfilled {table_name}.{column_name}: {converted} rows converted, {unparseable} unparseable")
+
+
+# Fill appointments.start_at from the typed date and time columns; returns the row count
+def backfill_start_at(connection, batch_size: int = BATCH_SIZE, commit: bool = True):
+    appointments = table("appointments", column("id"), column("date", Date()), column("time", Time()),
+                         column("start_at", DateTime()))
+    filled = 0
+    last_id = None
+    while True:
+        query = select(appointments.c.id, appointments.c.date, appointments.c.time).where(
+            appointments.c.start_at.is_(None),
+            appointments.c.date.is_not(None),
+            appointments.c.time.is_not(None)
+        ).order_by(appointments.c.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(appointments.c.id > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+        connection.execute(
+            update(appointments).where(appointments.c.id == bindparam("row_id")).values(start_at=bindparam("start_at")),
+            [{"row_id": row.id, "start_at": datetime.combine(row.date, row.time)} for row in rows]
+        )
+        if commit:
+            connection.commit()
+        filled += len(rows)
+        last_id = rows[-1].id
+    logger.info(f"Backfilled appointments.start_at: {filled} rows")
+    return filled
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description="Backfill typed date/time staging columns from their string originals.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    with engine.connect() as connection:
+        backfill(connection, args.batch_size)
@@ -0,0 +1,132 @@
+"""
+Batched, resumable backfill for the string -> numeric column migration.
+
+Migration 0002 adds a typed staging column (<column>_new) next to each string
+column listed in NUMERIC_COLUMNS, 0003 runs this backfill and 0004 swaps the
+staging columns in. Rows are converted in primary-key order, BATCH_SIZE at a
+time, and every batch is committed on its own, so an interrupted run picks
+up where it stopped: only rows whose staging column is still NULL are read.
+
+It can also be run on its own, e.g. ahead of a deploy on a large database:
+
+    python -m app.updates.backfill_numeric_columns [--batch-size 5000]
+"""
+from sqlalchemy import Boolean, Integer, Numeric, bindparam, column, inspect, select, table, update
+from decimal import Decimal, InvalidOperation
+import argparse
+import logging
+import os
+
+from app.models.types import TRUE_STRINGS, FALSE_STRINGS
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.environ.get("BACKFILL_BATCH_SIZE", "1000"))
+STAGING_SUFFIX = "_new"
+
+# (table, string column, target type)
+NUMERIC_COLUMNS = [
+    ("products", "price", Numeric(10, 2)),
+    ("orders", "total", Numeric(10, 2)),
+    ("orders", "points_earned", Integer()),
+    ("order_items", "quantity", Integer()),
+    ("order_items", "price", Numeric(10, 2)),
+    ("reward_points", "points", Integer()),
+    ("clinic_services", "price", Numeric(10, 2)),
+    ("clinic_services", "duration", Integer()),
+    ("clinic_services", "available", Boolean()),
+    ("reward_configs", "base_rate", Numeric(10, 2)),
+    ("reward_configs", "season_multiplier", Numeric(8, 3)),
+    ("seasons", "multiplier", Numeric(8, 3)),
+]
+
+
+def staging_column(name: str) -> str:
+    return name + STAGING_SUFFIX
+
+
+# Convert a legacy string value; returns None if it cannot be parsed
+def convert_value(raw: str, target_type):
+    text = raw.strip()
+    if isinstance(target_type, Boolean):
+        lowered = text.lower()
+        if lowered in TRUE_STRINGS:
+            return True
+        if lowered in FALSE_STRINGS:
+            return False
+        return None
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        return None
+    if not number.is_finite():
+        return None
+    if isinstance(target_type, Integer):
+        return int(number)
+    return number
+
+
+def _has_column(connection, table_name: str, column_name: str) -> bool:
+    columns = inspect(connection).get_columns(table_name)
+    return any(col["name"] == column_name for col in columns)
+
+
+# Backfill one column; returns (converted, unparseable) row counts.
+# convert(raw, target_type) returns the typed value, or None if raw cannot be parsed.
+def backfill_column(connection, table_name: str, column_name: str, target_type, batch_size: int = BATCH_SIZE,
+                    commit: bool = True, convert=convert_value):
+    staging = staging_column(column_name)
+    source = table(table_name, column("id"), column(column_name), column(staging, target_type))
+    converted = unparseable = 0
+    last_id = None
+    while True:
+        query = select(source.c.id, source.c[column_name]).where(
+            source.c[staging].is_(None),
+            source.c[column_name].is_not(None)
+        ).order_by(source.c.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(source.c.id > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+
+        values = []
+        for row_id, raw in rows:
+            value = convert(str(raw), target_type)
+            if value is None:
+                if str(raw).strip():
+                    logger.warning(f"{table_name}.{column_name}: cannot convert {raw!r} (id {row_id})")
+                    unparseable += 1
+                continue
+            values.append({"row_id": row_id, "value": value})
+        if values:
+            connection.execute(
+                update(source).where(source.c.id == bindparam("row_id")).values({staging: bindparam("value")}),
+                values
+            )
+        if commit:
+            connection.commit()
+
+        converted += len(values)
+        last_id = rows[-1].id
+    return converted, unparseable
+
+
+# Backfill every staged column; columns without a staging column are skipped.
+# Pass commit=False when the connection is already in autocommit mode.
+def backfill(connection, batch_size: int = BATCH_SIZE, commit: bool = True):
+    for table_name, column_name, target_type in NUMERIC_COLUMNS:
+        if not _has_column(connection, table_name, staging_column(column_name)):
+            continue
+        converted, unparseable = backfill_column(connection, table_name, column_name, target_type, batch_size, commit)
+        logger.info(f"Backfilled {table_name}.{column_name}: {converted} rows converted, {unparseable} unparseable")
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description="Backfill typed staging columns from their string originals.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    with engine.connect() as connection:
+        backfill(connection, args.batch_size)
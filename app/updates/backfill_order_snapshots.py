@@ -0,0 +1,85 @@
+"""
+Batched, resumable backfill of the purchase-time snapshots on orders.
+
+Orders placed since migration 0015 carry the prescribing clinic's name, and
+their items the product's name, category and clinic, written by
+create_order. This backfill copies the current values onto older rows,
+BATCH_SIZE rows at a time in primary-key order, committing every batch.
+Only rows whose snapshot is still NULL are read, so an interrupted run picks
+up where it stopped. Items whose product was already deleted, and orders
+whose prescription or clinic is gone, have nothing to copy and are left
+NULL; listings show them as "Unknown Product" and without a clinic.
+
+    python -m app.updates.backfill_order_snapshots [--batch-size 5000]
+"""
+from sqlalchemy import bindparam, column, select, table, update
+import argparse
+import logging
+
+from app.updates.backfill_numeric_columns import BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+orders = table("orders", column("id"), column("prescription_id"), column("clinic_name"))
+order_items = table("order_items", column("id"), column("product_id"), column("product_name"),
+                    column("product_category"), column("clinic_id"))
+products = table("products", column("id"), column("name"), column("category"), column("clinic_id"))
+prescriptions = table("prescriptions", column("id"), column("clinic_id"))
+users = table("users", column("id"), column("name"))
+
+
+# Copy the selected values onto the target rows in batches; returns the number of rows filled.
+# `query` selects the target's id as row_id and one labelled column per snapshot column.
+def _fill(connection, target, query, batch_size: int, commit: bool) -> int:
+    filled = 0
+    last_id = None
+    while True:
+        batch = query.order_by(target.c.id).limit(batch_size)
+        if last_id is not None:
+            batch = batch.where(target.c.id > last_id)
+        rows = connection.execute(batch).mappings().all()
+        if not rows:
+            break
+        values = {name: bindparam(name) for name in rows[0].keys() if name != "row_id"}
+        connection.execute(update(target).where(target.c.id == bindparam("row_id")).values(values),
+                           [dict(row) for row in rows])
+        if commit:
+            connection.commit()
+        filled += len(rows)
+        last_id = rows[-1]["row_id"]
+    return filled
+
+
+# Fill the product and clinic snapshots; returns (items filled, orders filled)
+def backfill(connection, batch_size: int = BATCH_SIZE, commit: bool = True):
+    items = _fill(connection, order_items, select(
+        order_items.c.id.label("row_id"),
+        products.c.name.label("product_name"),
+        products.c.category.label("product_category"),
+        products.c.clinic_id.label("clinic_id")
+    ).join(products, products.c.id == order_items.c.product_id).where(
+        order_items.c.product_name.is_(None)
+    ), batch_size, commit)
+    logger.info(f"Backfilled order_items product snapshots: {items} rows")
+
+    filled_orders = _fill(connection, orders, select(
+        orders.c.id.label("row_id"),
+        users.c.name.label("clinic_name")
+    ).join(prescriptions, prescriptions.c.id == orders.c.prescription_id).join(
+        users, users.c.id == prescriptions.c.clinic_id
+    ).where(
+        orders.c.clinic_name.is_(None),
+        users.c.name.is_not(None)
+    ), batch_size, commit)
+    logger.info(f"Backfilled orders clinic names: {filled_orders} rows")
+    return items, filled_orders
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description="Copy product and clinic details onto orders placed before snapshots.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    with engine.connect() as connection:
+        backfill(connection, args.batch_size)
@@ -0,0 +1,37 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks run against a throwaway SQLite database so they never touch
+test.db. Call use_temp_database() before importing anything from app/ or main.
+"""
+import os
+import statistics
+import tempfile
+
+
+def use_temp_database(name: str = "bench.db") -> str:
+    """Point DATABASE_URL at a fresh SQLite file and return its path."""
+    path = os.path.join(tempfile.mkdtemp(prefix="medimarket-bench-"), name)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(label: str, samples_ms) -> str:
+    """Format count, p50, p99 and max for a list of millisecond samples."""
+    if not samples_ms:
+        return f"{label:<32} n=0"
+    return (
+        f"{label:<32} n={len(samples_ms):<5} "
+        f"p50={statistics.median(samples_ms):8.1f}ms "
+        f"p99={percentile(samples_ms, 99):8.1f}ms "
+        f"max={max(samples_ms):8.1f}ms"
+    )
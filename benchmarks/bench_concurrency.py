@@ -0,0 +1,99 @@
+"""
+Load test: do concurrent requests overlap or serialize?
+
+Fires batches of concurrent requests at database-backed endpoints of the
+real app and compares the batch wall-clock time with running the same
+requests one after another (overlap ~1x means they serialized).
+A --latency-ms delay is injected into every statement to stand in for a
+networked database round trip (SQLite is otherwise too fast to show it).
+The "inline" mode mounts the same handlers behind async routes that call
+them directly on the event loop, which is how they ran before.
+
+Keep --concurrency within the connection pool (15 for the default SQLite
+pool): in inline mode a handler that waits for a pooled connection blocks
+the loop that would release one, so the batch deadlocks.
+
+    python -m benchmarks.bench_concurrency [--concurrency 10] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import use_temp_database, summarize
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import engine, get_db  # noqa: E402
+from app.routes import clinics as clinic_routes, products as product_routes  # noqa: E402
+from app.bootstrap import bootstrap  # noqa: E402
+from main import app  # noqa: E402
+
+ENDPOINTS = {
+    "/api/products/all": "/bench/inline/products/all",
+    "/api/clinics/all": "/bench/inline/clinics/all",
+}
+
+
+@app.get("/bench/inline/products/all")
+async def inline_products(db: Session = Depends(get_db)):
+    return product_routes.get_all_products(db=db)
+
+
+@app.get("/bench/inline/clinics/all")
+async def inline_clinics(db: Session = Depends(get_db)):
+    return clinic_routes.get_all_clinics(db=db)
+
+
+# Static mounts are registered last in main.py and would shadow routes added
+# afterwards; move the benchmark routes in front of them.
+app.router.routes.sort(key=lambda route: not getattr(route, "path", "").startswith("/bench/"))
+
+
+async def run_batch(client, path, concurrency):
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+    return (time.perf_counter() - start) * 1000, latencies
+
+
+async def run(concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for threadpool_path, inline_path in ENDPOINTS.items():
+            for mode, path in (("inline", inline_path), ("threadpool", threadpool_path)):
+                solo_ms, _ = await run_batch(client, path, 1)
+                wall_ms, latencies = await run_batch(client, path, concurrency)
+                overlap = concurrency * solo_ms / wall_ms if wall_ms else 0
+                print(f"[{mode:<10}] {threadpool_path:<20} wall={wall_ms:8.1f}ms overlap={overlap:5.1f}x")
+                print("             " + summarize("latency", latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    bootstrap()
+    if args.latency_ms > 0:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _network_latency(conn, cursor, statement, parameters, context, executemany):
+            time.sleep(args.latency_ms / 1000)
+
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Database round trips per request, with and without the per-checkout SELECT 1.
+
+Counts the statements sent to the database (via before_cursor_execute) for a
+few representative authenticated and public endpoints. The "select-1" mode
+swaps in the previous get_db, which pinged the connection before yielding
+every session.
+
+    python -m benchmarks.bench_db_roundtrips [--requests 50]
+"""
+import argparse
+import time
+
+from benchmarks._common import use_temp_database
+
+use_temp_database()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+
+from app.auth import create_user_tokens  # noqa: E402
+from app.database import SessionLocal, engine, get_db  # noqa: E402
+from app.models.users import User  # noqa: E402
+from app.bootstrap import bootstrap  # noqa: E402
+from main import app  # noqa: E402
+
+ENDPOINTS = ["/api/auth/check", "/api/products/all", "/api/clinics/featured", "/api/rewards/info"]
+
+statement_count = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    global statement_count
+    statement_count += 1
+
+
+def select_one_get_db():
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        yield db
+    finally:
+        db.close()
+
+
+def main():
+    global statement_count
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    bootstrap()
+    db = SessionLocal()
+    patient = db.query(User).filter(User.type == "patient").first()
+    headers = {"Authorization": f"Bearer {create_user_tokens(patient)['access_token']}"}
+    db.close()
+
+    client = TestClient(app)
+    for mode in ("select-1", "current"):
+        if mode == "select-1":
+            app.dependency_overrides[get_db] = select_one_get_db
+        else:
+            app.dependency_overrides.clear()
+        print(f"[{mode}]")
+        for endpoint in ENDPOINTS:
+            client.get(endpoint, headers=headers)  # warm up caches and the revocation filter
+            statement_count = 0
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                client.get(endpoint, headers=headers).raise_for_status()
+            elapsed_ms = (time.perf_counter() - start) * 1000 / args.requests
+            print(f"  {endpoint:<28} {statement_count / args.requests:5.1f} statements/request {elapsed_ms:7.2f}ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Login latency benchmark: bcrypt on the event loop vs. on the hash pool.
+
+Fires a burst of concurrent /api/auth/login calls while a steady stream of
+/api/health requests runs alongside, and reports login p99 and the latency
+of the unrelated requests. The "blocking" mode reproduces the old behaviour
+by verifying passwords synchronously inside the route.
+
+    python -m benchmarks.bench_login [--logins 32] [--health 200]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import use_temp_database, summarize
+
+use_temp_database()
+
+import httpx  # noqa: E402
+
+import app.routes.auth as auth_routes  # noqa: E402
+from app.auth import authenticate_user, get_password_hash  # noqa: E402
+from app.bootstrap import bootstrap  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.models.users import User  # noqa: E402
+from main import app  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchpassword"
+
+
+def seed_user():
+    db = SessionLocal()
+    if not db.query(User).filter(User.email == EMAIL).first():
+        db.add(User(id="bench-user", email=EMAIL, name="Bench User", type="patient",
+                    hashed_password=get_password_hash(PASSWORD), is_active=True))
+        db.commit()
+    db.close()
+
+
+async def _blocking_authenticate(db, email, password):
+    return authenticate_user(db, email, password)
+
+
+async def run(logins: int, health: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        login_ms, health_ms = [], []
+
+        async def login():
+            start = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            response.raise_for_status()
+            login_ms.append((time.perf_counter() - start) * 1000)
+
+        async def ping():
+            # Latency is measured from each request's scheduled send time so a
+            # stalled event loop shows up instead of silently delaying the sender.
+            interval = 0.005
+            first = time.perf_counter()
+            for i in range(health):
+                scheduled = first + i * interval
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/api/health")
+                health_ms.append((time.perf_counter() - scheduled) * 1000)
+
+        await asyncio.gather(ping(), *(login() for _ in range(logins)))
+        return login_ms, health_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--health", type=int, default=200)
+    args = parser.parse_args()
+
+    bootstrap(sample_data=False)
+    seed_user()
+    pooled = auth_routes.authenticate_user_async
+    for mode in ("blocking", "pooled"):
+        auth_routes.authenticate_user_async = _blocking_authenticate if mode == "blocking" else pooled
+        login_ms, health_ms = asyncio.run(run(args.logins, args.health))
+        print(f"[{mode}]")
+        print("  " + summarize("login", login_ms))
+        print("  " + summarize("concurrent /api/health", health_ms))
+
+
+if __name__ == "__main__":
+    main()
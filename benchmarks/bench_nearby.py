@@ -0,0 +1,89 @@
+"""
+"Clinics near me" at scale: geohash-pruned /api/clinics/nearby vs. a scan.
+
+Generates --clinics synthetic clinics clustered around a dozen metro areas,
+then asks for the nearest clinics around random points in those metros at
+several radii. The "scan" mode is the alternative without the grid index:
+read every clinic with coordinates and rank all of them by haversine
+distance. Both must return the same clinics.
+
+    python -m benchmarks.bench_nearby [--clinics 100000] [--queries 200]
+"""
+import argparse
+import random
+import time
+
+from benchmarks._common import use_temp_database, summarize
+
+use_temp_database()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.bootstrap import run_migrations  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.geo import haversine_km  # noqa: E402
+from app.models.clinics import Clinic  # noqa: E402
+from app.models.users import User  # noqa: E402
+from app.routes.clinics import DIRECTORY_COLUMNS  # noqa: E402
+from app.synthetic_data import METROS, METRO_SPREAD_DEGREES, generate  # noqa: E402
+from main import app  # noqa: E402
+
+RADII_KM = (1, 5, 25)
+LIMIT = 20
+
+
+def scan_nearby(lat, lng, radius):
+    db = SessionLocal()
+    try:
+        rows = db.query(*DIRECTORY_COLUMNS).join(User, User.id == Clinic.id).filter(
+            User.is_active.is_(True), Clinic.latitude.isnot(None)
+        ).all()
+    finally:
+        db.close()
+    ranked = sorted(
+        (distance, row.id) for row in rows
+        if (distance := haversine_km(lat, lng, row.latitude, row.longitude)) <= radius
+    )
+    return [row_id for _, row_id in ranked[:LIMIT]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clinics", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    run_migrations()
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        generate(connection, clinics=args.clinics, patients=1, orders=0, appointments=0,
+                 services_per_clinic=1, products_per_clinic=0, seed=17)
+    print(f"generated {args.clinics} clinics in {time.perf_counter() - started:.1f}s")
+
+    client = TestClient(app)
+    rng = random.Random(17)
+    for radius in RADII_KM:
+        grid_ms, scan_ms, found = [], [], 0
+        # The scan reads every clinic per query, so it gets fewer queries
+        for i in range(args.queries):
+            metro_lat, metro_lng = rng.choice(METROS)
+            lat = metro_lat + rng.gauss(0, METRO_SPREAD_DEGREES)
+            lng = metro_lng + rng.gauss(0, METRO_SPREAD_DEGREES)
+            start = time.perf_counter()
+            response = client.get(f"/api/clinics/nearby?lat={lat}&lng={lng}&radius={radius}&limit={LIMIT}")
+            grid_ms.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+            grid_ids = [clinic["id"] for clinic in response.json()]
+            found += len(grid_ids)
+            if i % 10 == 0:
+                start = time.perf_counter()
+                scan_ids = scan_nearby(lat, lng, radius)
+                scan_ms.append((time.perf_counter() - start) * 1000)
+                assert scan_ids == grid_ids, (lat, lng, radius)
+        print(f"[radius {radius}km, {found / args.queries:.1f} clinics per result]")
+        print("  " + summarize("grid (/api/clinics/nearby)", grid_ms))
+        print("  " + summarize("scan", scan_ms))
+
+
+if __name__ == "__main__":
+    main()
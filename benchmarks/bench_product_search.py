@@ -0,0 +1,70 @@
+"""
+Product typeahead and search at scale.
+
+Generates --products synthetic products (20 per clinic), then types random
+product words one letter at a time against /api/products/suggest, the
+in-memory prefix index, and runs each full word through
+/api/products/search, the FTS5 index. The first suggestion request, which
+builds the prefix index, is reported separately.
+
+    python -m benchmarks.bench_product_search [--products 100000] [--queries 200]
+"""
+import argparse
+import random
+import time
+
+from benchmarks._common import use_temp_database, summarize
+
+use_temp_database()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.bootstrap import run_migrations  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.synthetic_data import PRODUCT_ADJECTIVES, PRODUCT_NOUNS, generate  # noqa: E402
+from main import app  # noqa: E402
+
+PRODUCTS_PER_CLINIC = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    run_migrations()
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        generate(connection, clinics=args.products // PRODUCTS_PER_CLINIC, patients=1, orders=0, appointments=0,
+                 services_per_clinic=1, products_per_clinic=PRODUCTS_PER_CLINIC, seed=17)
+    print(f"generated {args.products} products in {time.perf_counter() - started:.1f}s")
+
+    client = TestClient(app)
+    start = time.perf_counter()
+    assert client.get("/api/products/suggest?q=a").status_code == 200
+    print(summarize("suggest (first, builds index)", [(time.perf_counter() - start) * 1000]))
+
+    names = PRODUCT_ADJECTIVES + [noun for nouns in PRODUCT_NOUNS.values() for noun in nouns]
+    words = sorted({word.lower() for name in names for word in name.split()})
+    rng = random.Random(17)
+    suggest_ms = {length: [] for length in (1, 2, 3, 4)}
+    search_ms = []
+    for _ in range(args.queries):
+        word = rng.choice(words)
+        for length in suggest_ms:
+            start = time.perf_counter()
+            response = client.get(f"/api/products/suggest?q={word[:length]}")
+            suggest_ms[length].append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+        start = time.perf_counter()
+        response = client.get(f"/api/products/search?q={word}")
+        search_ms.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200 and response.json(), word
+    for length, samples in suggest_ms.items():
+        print(summarize(f"suggest ({length} letter prefix)", samples))
+    print(summarize("search (full word)", search_ms))
+
+
+if __name__ == "__main__":
+    main()
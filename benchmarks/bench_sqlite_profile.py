@@ -0,0 +1,110 @@
+"""
+SQLite concurrency benchmark: default rollback journal vs. SQLITE_PROFILE=tuned.
+
+Runs reader threads (product catalog and patient order history queries)
+alongside writer threads that place orders through create_order. Each
+profile runs in its own process against its own database file, since the
+profile is applied when the engine connects. Reports read latency,
+write latency, throughput and "database is locked" failures.
+
+    python -m benchmarks.bench_sqlite_profile [--seconds 5] [--readers 8] [--writers 2]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks._common import summarize
+
+
+def run_child(seconds: float, readers: int, writers: int):
+    from benchmarks._common import use_temp_database
+    use_temp_database()
+
+    from sqlalchemy.exc import OperationalError
+
+    from app.database import Base, SessionLocal, engine
+    from app.models.products import Order, Product
+    from app.models.users import User
+    from app.routes.products import create_order
+    from app.sample_data import create_initial_data
+    from app.schemas.product import OrderItemCreate, UserOrderCreate
+
+    Base.metadata.create_all(bind=engine)
+    create_initial_data()
+
+    db = SessionLocal()
+    patient = db.query(User).filter(User.type == "patient").first()
+    patient = User(id=patient.id, type=patient.type, name=patient.name, email=patient.email, is_active=True)
+    product_ids = [p.id for p in db.query(Product).all()]
+    db.close()
+
+    read_ms, write_ms, locked = [], [], [0]
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        while time.perf_counter() < deadline:
+            db = SessionLocal()
+            start = time.perf_counter()
+            try:
+                db.query(Product).all()
+                db.query(Order).filter(Order.patient_id == patient.id).all()
+                read_ms.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                locked[0] += 1
+            finally:
+                db.close()
+
+    def writer():
+        index = 0
+        while time.perf_counter() < deadline:
+            db = SessionLocal()
+            order = UserOrderCreate(items=[OrderItemCreate(product_id=product_ids[index % len(product_ids)], quantity="1")])
+            start = time.perf_counter()
+            try:
+                create_order(order_data=order, db=db, current_user=patient)
+                write_ms.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                locked[0] += 1
+            finally:
+                db.close()
+            index += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"[{os.environ.get('SQLITE_PROFILE', 'default')}]")
+    print("  " + summarize("reads", read_ms) + f" ({len(read_ms) / seconds:.0f}/s)")
+    print("  " + summarize("create_order writes", write_ms) + f" ({len(write_ms) / seconds:.0f}/s)")
+    print(f"  database is locked errors: {locked[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.seconds, args.readers, args.writers)
+        return
+
+    for profile in ("default", "tuned"):
+        env = {**os.environ, "SQLITE_PROFILE": profile}
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_sqlite_profile", "--child",
+             "--seconds", str(args.seconds), "--readers", str(args.readers), "--writers", str(args.writers)],
+            env=env, check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold-start benchmark: time from launching a fresh interpreter to the first
+response.
+
+Bootstraps a throwaway database once (migrations, admin account, sample data),
+then starts the app repeatedly in new processes: import main, run the startup
+event and serve GET /api/health. Import time is mostly FastAPI and SQLAlchemy
+loading and depends on the machine, so it is reported separately; the budget
+applies to what the app itself does from the end of import to the first
+response. The benchmark exits non-zero when the median exceeds the budget,
+which guards against seeding or password hashing creeping back into startup.
+
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 300]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks._common import use_temp_database, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child process and prints "<import ms> <startup to first response ms>"
+FIRST_REQUEST = """
+import time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from main import app
+imported = time.perf_counter()
+with TestClient(app) as client:
+    assert client.get("/api/health").status_code == 200
+    ready = time.perf_counter()
+print((imported - start) * 1000, (ready - imported) * 1000)
+"""
+
+
+def timed(args) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def start_app():
+    """Start the app in a fresh process; returns (total, import, startup) in ms."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", FIRST_REQUEST], cwd=ROOT, check=True,
+                            capture_output=True, text=True)
+    total_ms = (time.perf_counter() - start) * 1000
+    import_ms, startup_ms = map(float, result.stdout.split()[-2:])
+    return total_ms, import_ms, startup_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    use_temp_database()
+    # Workers must find the marker; they should never bootstrap during the benchmark
+    os.environ["AUTO_BOOTSTRAP"] = "0"
+    bootstrap_ms = timed(["-m", "app.bootstrap"])
+    baseline_ms = [timed(["-c", "pass"]) for _ in range(args.runs)]
+    total_ms, import_ms, startup_ms = zip(*(start_app() for _ in range(args.runs)))
+
+    print(f"{'one-shot bootstrap':<32} {bootstrap_ms:8.1f}ms")
+    print(summarize("empty interpreter", baseline_ms))
+    print(summarize("import main", import_ms))
+    print(summarize("startup to first response", startup_ms))
+    print(summarize("launch to first response", total_ms))
+    median = statistics.median(startup_ms)
+    if median > args.budget_ms:
+        print(f"FAIL: median startup {median:.1f}ms exceeds the {args.budget_ms:.0f}ms budget")
+        sys.exit(1)
+    print(f"OK: median startup {median:.1f}ms within the {args.budget_ms:.0f}ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,56 @@
 // API base URL - change this for production
 const API_BASE_URL = '/api';
 
+/**
+ * Exchange the stored refresh token for a new access token. Refresh tokens
+ * are single use, so concurrent callers share one request.
+ * @returns {Promise<boolean>} - Whether a new access token was stored
+ */
+let refreshInFlight = null;
+function refreshAccessToken() {
+    if (!refreshInFlight) {
+        refreshInFlight = exchangeRefreshToken().finally(() => { refreshInFlight = null; });
+    }
+    return refreshInFlight;
+}
+
+async function exchangeRefreshToken() {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!refreshToken) {
+        return false;
+    }
+    
+    const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ refresh_token: refreshToken })
+    }).catch(() => null);
+    
+    if (!response || !response.ok) {
+        return false;
+    }
+    
+    const data = await response.json();
+    localStorage.setItem('token', data.access_token);
+    localStorage.setItem('refresh_token', data.refresh_token);
+    return true;
+}
+
+// Marker the API hands out after a write; sending it back routes this user's
+// reads to the primary database for a few seconds, so they see the write.
+// The web app gets the same marker as a cookie.
+let readYourWritesMarker = null;
+
 /**
  * Generic API call function with authentication
  * @param {string} endpoint - API endpoint
  * @param {Object} options - Fetch options
+ * @param {boolean} retried - Set on the single retry after a token refresh
  * @returns {Promise} - Promise with response data
  */
-async function apiCall(endpoint, options = {}) {
+async function apiCall(endpoint, options = {}, retried = false) {
     // Get authentication token if it exists
     const token = localStorage.getItem('token');
     
@@ -25,6 +68,9 @@ async function apiCall(endpoint, options = {}) {
     if (token) {
         headers['Authorization'] = `Bearer ${token}`;
     }
+    if (readYourWritesMarker) {
+        headers['X-Read-Your-Writes'] = readYourWritesMarker;
+    }
     
     // Build full URL
     const url = `${API_BASE_URL}${endpoint}`;
@@ -35,11 +81,18 @@ async function apiCall(endpoint, options = {}) {
             ...options,
             headers
         });
+        readYourWritesMarker = response.headers.get('X-Read-Your-Writes') || readYourWritesMarker;
+        
+        // Access tokens are short-lived; refresh once and retry before giving up
+        if (response.status === 401 && !retried && await refreshAccessToken()) {
+            return apiCall(endpoint, options, true);
+        }
         
         // Handle unauthorized errors
         if (response.status === 401) {
             // Clear invalid token
             localStorage.removeItem('token');
+            localStorage.removeItem('refresh_token');
             localStorage.removeItem('userType');
             localStorage.removeItem('userId');
             
@@ -158,6 +211,21 @@ const ClinicsAPI = {
      */
     getClinicServices: async (clinicId) => {
         return apiCall(`/clinics/${clinicId}/services`);
+    },
+    
+    /**
+     * Get active clinics near a point, nearest first, each with distance_km
+     * @param {number} lat - Latitude of the point
+     * @param {number} lng - Longitude of the point
+     * @param {number} radius - Search radius in km (server default 5)
+     * @returns {Promise} - Promise with nearby clinics list
+     */
+    nearby: async (lat, lng, radius) => {
+        const params = new URLSearchParams({ lat, lng });
+        if (radius !== undefined) {
+            params.set('radius', radius);
+        }
+        return apiCall(`/clinics/nearby?${params}`);
     }
 };
 
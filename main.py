@@ -1,23 +1,36 @@
 # main.py - Entry point for the FastAPI backend
 
 # Import FastAPI and related modules for building the API
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from typing import Optional
+import anyio
+import asyncio
 import uvicorn
+import logging
 import os
 import datetime
 
 # Import database and authentication utilities
-from app.database import engine, Base
+from app.database import ReadSessionLocal, ReadYourWritesMiddleware, SessionLocal, get_db, wait_for_database
+from app.bootstrap import ensure_bootstrapped
 from app.auth import get_current_user
+from app.featured import featured_clinics
+from app.pagination import MAX_PAGE_SIZE
+from app.query_stats import QueryStatsMiddleware
+from app.typeahead import product_suggestions
 # Import routers for different API sections
 from app.routes import auth, clinics, patients, appointments, products
 from app.routes.prescriptions import router as prescriptions_router
 from app.routes.rewards import router as rewards_router
 from app.routes.reward_config import router as reward_config_router
 from app.routes.rewards_admin import router as rewards_admin_router
-from app.sample_data import create_initial_data
+from app.routes.db_admin import router as db_admin_router
 
 # Create the FastAPI app instance
 app = FastAPI(title="MediMarket API")
@@ -29,10 +42,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Queries", "X-DB-Time-ms", "X-Next-Cursor", "X-Total-Count", "Link", "ETag",
+                    "X-Read-Your-Writes"],
 )
 
-# Create all database tables if they don't exist
-Base.metadata.create_all(bind=engine)
+# Report each request's SQL statement count and database time in response headers
+app.add_middleware(QueryStatsMiddleware)
+
+# Hand users who just wrote a marker that sends their reads to the primary on any worker
+app.add_middleware(ReadYourWritesMiddleware)
+
+logger = logging.getLogger(__name__)
+
+# Route handlers that use the database are plain `def` functions, which FastAPI
+# runs in this threadpool so blocking SQLAlchemy calls never stall the event loop.
+# Keep it roughly in line with the engine's pool size plus overflow.
+ROUTE_THREADPOOL_SIZE = int(os.environ.get("ROUTE_THREADPOOL_SIZE", "40"))
+
+# Database connection failures fail fast with 503 instead of retrying inside the
+# request; the pool has already discarded the broken connection, so clients can retry.
+@app.exception_handler(OperationalError)
+async def database_unavailable_handler(request: Request, exc: OperationalError):
+    logger.error(f"Database error on {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database temporarily unavailable"},
+        headers={"Retry-After": "1"},
+    )
 
 # Register API routers for different resources
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
@@ -44,26 +80,52 @@ app.include_router(prescriptions_router, prefix="/api/prescriptions", tags=["Pre
 app.include_router(rewards_router, prefix="/api/rewards", tags=["Rewards"])
 app.include_router(reward_config_router, prefix="/api/rewards/config", tags=["Reward Configuration"])
 app.include_router(rewards_admin_router, prefix="/api/rewards", tags=["Rewards Admin"])
+app.include_router(db_admin_router, prefix="/api/admin/db", tags=["Database Admin"])
 
 # Special endpoint to support frontend's order API calls
 @app.get("/api/orders/patient/{patient_id}")
-async def get_patient_orders_alias(patient_id: str, current_user = Depends(get_current_user)):
+def get_patient_orders_alias(
+    patient_id: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
     # Forward the request to the actual implementation in products router
     from app.routes.products import get_patient_orders
-    from app.database import get_db
-    db = next(get_db())
-    return await get_patient_orders(patient_id=patient_id, db=db, current_user=current_user)
+    return get_patient_orders(patient_id=patient_id, request=request, response=response, limit=limit,
+                              cursor=cursor, db=db, current_user=current_user)
+
+# Background tasks started at startup and cancelled at shutdown
+background_tasks = []
 
-# Startup event: create initial data and ensure admin user exists
+# Startup event: check the database was bootstrapped, warm the revocation filter
+# and start refreshing the featured clinics snapshot and the product typeahead.
+# Schema migrations, the admin account and sample data are created once by
+# `python -m app.bootstrap`, not on every start (see app/bootstrap.py).
 @app.on_event("startup")
 async def startup_event():
-    create_initial_data()
-    from app.updates.add_admin_user import add_admin_user
-    from app.database import get_db
-    from app.auth_fix import fix_admin_user_type
-    db = next(get_db())
-    add_admin_user(db)
-    fix_admin_user_type()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = ROUTE_THREADPOOL_SIZE
+    await wait_for_database()
+    await run_in_threadpool(ensure_bootstrapped)
+    from app.revocation import revocation_filter
+    db = SessionLocal()
+    try:
+        # Load revoked users/tokens so claim-based auth can reject them in memory
+        revocation_filter.rebuild(db)
+    finally:
+        db.close()
+    background_tasks.append(asyncio.create_task(featured_clinics.refresh_periodically(ReadSessionLocal)))
+    # From the primary: a lagging replica would drop products written just before a rebuild
+    background_tasks.append(asyncio.create_task(product_suggestions.rebuild_periodically(SessionLocal)))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
 
 # Health check endpoint for monitoring
 @app.get("/api/health")
@@ -0,0 +1,61 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, engine
+# Register every model on Base.metadata for autogenerate
+import app.models  # noqa: F401
+import app.models.reward_config  # noqa: F401
+from app.search import SEARCH_TABLES
+
+config = context.config
+
+# Callers running migrations in-process (app.bootstrap) keep their own logging
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+# Autogenerate ignores the full-text search tables, which have no models
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "table" and reflected and compare_to is None and name.startswith(SEARCH_TABLES))
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of running against a database."""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against DATABASE_URL, or a connection passed in by the caller."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with_connection(connection)
+        return
+    with engine.connect() as connection:
+        _run_with_connection(connection)
+
+
+def _run_with_connection(connection) -> None:
+    # Batch mode lets ALTER COLUMN work on SQLite by copying the table
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True,
+                      include_object=include_object)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,374 @@
+"""Baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 19:01:32.236361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the schema as it was before migrations were introduced.
+
+    Databases created by Base.metadata.create_all already have some or all of
+    these tables; only missing tables are created.
+    """
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'partner_shops' not in existing:
+        op.create_table('partner_shops',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('website', sa.String(), nullable=True),
+        sa.Column('logo_url', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('partner_shops', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_partner_shops_id'), ['id'], unique=False)
+
+    if 'reward_configs' not in existing:
+        op.create_table('reward_configs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('base_rate', sa.String(), nullable=True),
+        sa.Column('season_multiplier', sa.String(), nullable=True),
+        sa.Column('product_category_rules', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('reward_configs', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_reward_configs_id'), ['id'], unique=False)
+
+    if 'seasons' not in existing:
+        op.create_table('seasons',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('start_date', sa.String(), nullable=True),
+        sa.Column('end_date', sa.String(), nullable=True),
+        sa.Column('multiplier', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('seasons', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_seasons_id'), ['id'], unique=False)
+
+    if 'token_revocations' not in existing:
+        op.create_table('token_revocations',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(), nullable=True),
+        sa.Column('jti', sa.String(), nullable=True),
+        sa.Column('reason', sa.String(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('token_revocations', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_token_revocations_expires_at'), ['expires_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_token_revocations_jti'), ['jti'], unique=False)
+            batch_op.create_index(batch_op.f('ix_token_revocations_user_id'), ['user_id'], unique=False)
+
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('type', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('users', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+            batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+
+    if 'clinics' not in existing:
+        op.create_table('clinics',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('specialization', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('clinics', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_clinics_id'), ['id'], unique=False)
+
+    if 'partner_shop_categories' not in existing:
+        op.create_table('partner_shop_categories',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('partner_shop_id', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['partner_shop_id'], ['partner_shops.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('partner_shop_categories', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_partner_shop_categories_id'), ['id'], unique=False)
+
+    if 'patients' not in existing:
+        op.create_table('patients',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.Column('date_of_birth', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('patients', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_patients_id'), ['id'], unique=False)
+
+    if 'clinic_services' not in existing:
+        op.create_table('clinic_services',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('clinic_id', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('price', sa.String(), nullable=True),
+        sa.Column('duration', sa.String(), nullable=True),
+        sa.Column('available', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('clinic_services', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_clinic_services_id'), ['id'], unique=False)
+
+    if 'prescriptions' not in existing:
+        op.create_table('prescriptions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('patient_id', sa.String(), nullable=True),
+        sa.Column('clinic_id', sa.String(), nullable=True),
+        sa.Column('issue_date', sa.String(), nullable=True),
+        sa.Column('valid_until', sa.String(), nullable=True),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('prescriptions', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_prescriptions_id'), ['id'], unique=False)
+
+    if 'products' not in existing:
+        op.create_table('products',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('clinic_id', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('price', sa.String(), nullable=True),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('in_stock', sa.Boolean(), nullable=True),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('products', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_products_id'), ['id'], unique=False)
+
+    if 'reward_cards' not in existing:
+        op.create_table('reward_cards',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('patient_id', sa.String(), nullable=True),
+        sa.Column('card_number', sa.String(), nullable=True),
+        sa.Column('issued_date', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('card_number'),
+        sa.UniqueConstraint('patient_id')
+        )
+        with op.batch_alter_table('reward_cards', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_reward_cards_id'), ['id'], unique=False)
+
+    if 'reward_points' not in existing:
+        op.create_table('reward_points',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('patient_id', sa.String(), nullable=True),
+        sa.Column('points', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('source_id', sa.String(), nullable=True),
+        sa.Column('type', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('reward_points', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_reward_points_id'), ['id'], unique=False)
+
+    if 'appointments' not in existing:
+        op.create_table('appointments',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('patient_id', sa.String(), nullable=True),
+        sa.Column('clinic_id', sa.String(), nullable=True),
+        sa.Column('service_id', sa.String(), nullable=True),
+        sa.Column('date', sa.String(), nullable=True),
+        sa.Column('time', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+        sa.ForeignKeyConstraint(['service_id'], ['clinic_services.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('appointments', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_appointments_id'), ['id'], unique=False)
+
+    if 'medications' not in existing:
+        op.create_table('medications',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('prescription_id', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('dosage', sa.String(), nullable=True),
+        sa.Column('frequency', sa.String(), nullable=True),
+        sa.Column('duration', sa.String(), nullable=True),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['prescription_id'], ['prescriptions.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('medications', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_medications_id'), ['id'], unique=False)
+
+    if 'orders' not in existing:
+        op.create_table('orders',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('patient_id', sa.String(), nullable=True),
+        sa.Column('prescription_id', sa.String(), nullable=True),
+        sa.Column('total', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('points_earned', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+        sa.ForeignKeyConstraint(['prescription_id'], ['prescriptions.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('orders', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_orders_id'), ['id'], unique=False)
+
+    if 'order_items' not in existing:
+        op.create_table('order_items',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('order_id', sa.String(), nullable=True),
+        sa.Column('product_id', sa.String(), nullable=True),
+        sa.Column('quantity', sa.String(), nullable=True),
+        sa.Column('price', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('order_items', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_order_items_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_items_id'))
+
+    op.drop_table('order_items')
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_orders_id'))
+
+    op.drop_table('orders')
+    with op.batch_alter_table('medications', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_medications_id'))
+
+    op.drop_table('medications')
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_appointments_id'))
+
+    op.drop_table('appointments')
+    with op.batch_alter_table('reward_points', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reward_points_id'))
+
+    op.drop_table('reward_points')
+    with op.batch_alter_table('reward_cards', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reward_cards_id'))
+
+    op.drop_table('reward_cards')
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_products_id'))
+
+    op.drop_table('products')
+    with op.batch_alter_table('prescriptions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_prescriptions_id'))
+
+    op.drop_table('prescriptions')
+    with op.batch_alter_table('clinic_services', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_clinic_services_id'))
+
+    op.drop_table('clinic_services')
+    with op.batch_alter_table('patients', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_patients_id'))
+
+    op.drop_table('patients')
+    with op.batch_alter_table('partner_shop_categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_partner_shop_categories_id'))
+
+    op.drop_table('partner_shop_categories')
+    with op.batch_alter_table('clinics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_clinics_id'))
+
+    op.drop_table('clinics')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('token_revocations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_token_revocations_user_id'))
+        batch_op.drop_index(batch_op.f('ix_token_revocations_jti'))
+        batch_op.drop_index(batch_op.f('ix_token_revocations_expires_at'))
+
+    op.drop_table('token_revocations')
+    with op.batch_alter_table('seasons', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_seasons_id'))
+
+    op.drop_table('seasons')
+    with op.batch_alter_table('reward_configs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reward_configs_id'))
+
+    op.drop_table('reward_configs')
+    with op.batch_alter_table('partner_shops', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_partner_shops_id'))
+
+    op.drop_table('partner_shops')
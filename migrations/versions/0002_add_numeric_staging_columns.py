@@ -0,0 +1,46 @@
+"""Add typed staging columns for money, quantity and points
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 19:20:00.000000
+
+Expand step of the string -> numeric migration: each string column in
+NUMERIC_COLUMNS gets a nullable <column>_new of the target type. Columns that
+already have a numeric type (databases created from the current models) are
+left alone.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.updates.backfill_numeric_columns import NUMERIC_COLUMNS, staging_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table_name):
+    return {col["name"]: col for col in sa.inspect(op.get_bind()).get_columns(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name, column_name, target_type in NUMERIC_COLUMNS:
+        columns = _columns(table_name)
+        if not isinstance(columns[column_name]["type"], sa.String) or staging_column(column_name) in columns:
+            continue
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column(staging_column(column_name), target_type, nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, column_name, target_type in reversed(NUMERIC_COLUMNS):
+        if staging_column(column_name) in _columns(table_name):
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.drop_column(staging_column(column_name))
@@ -0,0 +1,35 @@
+"""Backfill the typed staging columns
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 19:20:01.000000
+
+Runs app.updates.backfill_numeric_columns outside the migration transaction,
+committing every batch. If it is interrupted, running `alembic upgrade head`
+again resumes with the rows that are not converted yet.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.updates.backfill_numeric_columns import backfill
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each batch commits on its own in autocommit mode
+    with op.get_context().autocommit_block():
+        backfill(op.get_bind(), commit=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The staging columns are dropped by 0002's downgrade
+    pass
@@ -0,0 +1,72 @@
+"""Replace the string columns with their typed staging columns
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 19:20:02.000000
+
+Contract step: drops each string column and renames <column>_new into its
+place. Rows fixed by hand since 0003 are converted first; the swap refuses
+to run while a non-blank string value still has no converted value, so
+nothing is dropped silently. Fix or clear those rows (the backfill logs
+them) and run the upgrade again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.updates.backfill_numeric_columns import NUMERIC_COLUMNS, backfill, staging_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _column_names(table_name):
+    return {col["name"] for col in sa.inspect(op.get_bind()).get_columns(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        backfill(op.get_bind(), commit=False)
+
+    connection = op.get_bind()
+    staged = [
+        (table_name, column_name, target_type)
+        for table_name, column_name, target_type in NUMERIC_COLUMNS
+        if staging_column(column_name) in _column_names(table_name)
+    ]
+
+    for table_name, column_name, target_type in staged:
+        source = sa.table(table_name, sa.column(column_name), sa.column(staging_column(column_name)))
+        pending = connection.execute(
+            sa.select(sa.func.count()).select_from(source).where(
+                source.c[staging_column(column_name)].is_(None),
+                source.c[column_name].is_not(None),
+                sa.func.trim(source.c[column_name]) != ""
+            )
+        ).scalar()
+        if pending:
+            raise RuntimeError(
+                f"{pending} rows in {table_name}.{column_name} have no converted value; "
+                "fix the rows the backfill reports and run the upgrade again"
+            )
+
+    for table_name, column_name, target_type in staged:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column(column_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(staging_column(column_name), new_column_name=column_name, existing_type=target_type)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Back to strings, as cast by the database (on SQLite "50.00" comes back
+    # as "50" and booleans as "1"/"0")
+    for table_name, column_name, target_type in NUMERIC_COLUMNS:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(column_name, type_=sa.String(), existing_type=target_type)
@@ -0,0 +1,53 @@
+"""Index foreign keys and hot filters
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 19:05:11.229346
+
+Every per-patient and per-clinic listing filtered on an unindexed column and
+scanned the whole table. Indexes already created by create_all (from the
+current models) are skipped. On PostgreSQL they are built CONCURRENTLY so
+writes to these tables are not blocked while the migration runs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_appointments_patient_id', 'appointments', ['patient_id']),
+    ('ix_appointments_clinic_id', 'appointments', ['clinic_id']),
+    ('ix_clinic_services_clinic_id', 'clinic_services', ['clinic_id']),
+    ('ix_medications_prescription_id', 'medications', ['prescription_id']),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_orders_patient_id', 'orders', ['patient_id']),
+    ('ix_orders_created_at', 'orders', ['created_at']),
+    ('ix_prescriptions_patient_id', 'prescriptions', ['patient_id']),
+    ('ix_prescriptions_clinic_id', 'prescriptions', ['clinic_id']),
+    ('ix_products_clinic_id', 'products', ['clinic_id']),
+    ('ix_products_category', 'products', ['category']),
+    ('ix_reward_points_patient_id_type', 'reward_points', ['patient_id', 'type']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table_name, columns in INDEXES:
+            op.create_index(name, table_name, columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name, if_exists=True)
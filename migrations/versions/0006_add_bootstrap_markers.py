@@ -0,0 +1,36 @@
+"""Add bootstrap markers
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 19:40:02.518733
+
+Records which one-shot bootstrap steps (admin account, sample data) have
+run, so web workers can skip them with a single primary-key lookup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create bootstrap_markers unless create_all already did."""
+    if 'bootstrap_markers' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table('bootstrap_markers',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Drop bootstrap_markers."""
+    op.drop_table('bootstrap_markers')
@@ -0,0 +1,33 @@
+"""Index clinics on (created_at, id)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 20:12:48.904417
+
+/api/clinics/all pages through the directory in (created_at, id) order with
+a keyset cursor; this index turns each page into a single range scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_clinics_created_at_id', 'clinics', ['created_at', 'id'], unique=False,
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_clinics_created_at_id', table_name='clinics', if_exists=True)
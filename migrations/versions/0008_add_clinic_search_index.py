@@ -0,0 +1,34 @@
+"""Add clinic full-text search index
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 20:41:19.077160
+
+Creates clinic_search (FTS5 on SQLite, a GIN-indexed tsvector table on
+PostgreSQL) for /api/clinics/search and indexes every existing clinic.
+The application keeps it in sync from then on (see app/search.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.search import create_clinic_search, drop_clinic_search, index_clinics
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    create_clinic_search(connection)
+    index_clinics(connection)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_clinic_search(op.get_bind())
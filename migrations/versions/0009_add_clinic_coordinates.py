@@ -0,0 +1,48 @@
+"""Add clinic coordinates and geohash
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 21:06:37.551902
+
+latitude/longitude let /api/clinics/nearby rank clinics by distance; the
+indexed geohash (derived from them by the Clinic model) lets it read only
+the grid cells around the caller. Existing clinics have no coordinates
+until they are set through PUT /api/clinics/{id}.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('geohash', sa.String(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('clinics')}
+    for column in COLUMNS:
+        if column.name not in existing:
+            op.add_column('clinics', column)
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_clinics_geohash', 'clinics', ['geohash'], unique=False, if_not_exists=True,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_clinics_geohash', table_name='clinics', if_exists=True)
+    with op.batch_alter_table('clinics', schema=None) as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,61 @@
+"""Add clinic opening hours and appointment slot claims
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 21:58:12.204117
+
+clinic_opening_hours holds each clinic's weekly open intervals.
+appointment_slots holds one row per slot an active appointment occupies;
+its primary key rejects overlapping bookings (see app/availability.py).
+Upcoming appointments get their claims from
+app.updates.backfill_appointment_slots.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.updates.backfill_appointment_slots import backfill
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'clinic_opening_hours' not in existing:
+        op.create_table('clinic_opening_hours',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('clinic_id', sa.String(), nullable=False),
+        sa.Column('weekday', sa.Integer(), nullable=False),
+        sa.Column('opens', sa.String(), nullable=False),
+        sa.Column('closes', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_clinic_opening_hours_clinic_id'), 'clinic_opening_hours', ['clinic_id'], unique=False)
+    if 'appointment_slots' not in existing:
+        op.create_table('appointment_slots',
+        sa.Column('clinic_id', sa.String(), nullable=False),
+        sa.Column('date', sa.String(), nullable=False),
+        sa.Column('start', sa.String(), nullable=False),
+        sa.Column('appointment_id', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ),
+        sa.PrimaryKeyConstraint('clinic_id', 'date', 'start')
+        )
+        op.create_index(op.f('ix_appointment_slots_appointment_id'), 'appointment_slots', ['appointment_id'], unique=False)
+    backfill(op.get_bind(), commit=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_appointment_slots_appointment_id'), table_name='appointment_slots')
+    op.drop_table('appointment_slots')
+    op.drop_index(op.f('ix_clinic_opening_hours_clinic_id'), table_name='clinic_opening_hours')
+    op.drop_table('clinic_opening_hours')
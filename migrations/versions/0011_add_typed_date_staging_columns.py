@@ -0,0 +1,51 @@
+"""Add typed staging columns for dates and times
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 22:41:05.318227
+
+Expand step of the string -> Date/Time migration: each string column in
+DATE_COLUMNS gets a nullable <column>_new of the target type, as 0002 did
+for numbers. appointments also gets start_at, its date and time combined,
+filled by 0013 once the typed columns are in place.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.updates.backfill_date_columns import DATE_COLUMNS
+from app.updates.backfill_numeric_columns import staging_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table_name):
+    return {col["name"]: col for col in sa.inspect(op.get_bind()).get_columns(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name, column_name, target_type in DATE_COLUMNS:
+        columns = _columns(table_name)
+        if not isinstance(columns[column_name]["type"], sa.String) or staging_column(column_name) in columns:
+            continue
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column(staging_column(column_name), target_type, nullable=True))
+    if 'start_at' not in _columns('appointments'):
+        op.add_column('appointments', sa.Column('start_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments') as batch_op:
+        batch_op.drop_column('start_at')
+    for table_name, column_name, target_type in reversed(DATE_COLUMNS):
+        if staging_column(column_name) in _columns(table_name):
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.drop_column(staging_column(column_name))
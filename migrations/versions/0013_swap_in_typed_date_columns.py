@@ -0,0 +1,87 @@
+"""Replace the date and time strings with typed columns; index start_at
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-17 22:41:07.000000
+
+Contract step, as 0004: drops each string column in DATE_COLUMNS and
+renames <column>_new into its place, refusing to run while a non-blank
+string still has no converted value. Then fills appointments.start_at and
+indexes it with clinic_id and patient_id, so a calendar range is one index
+range scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.updates.backfill_date_columns import DATE_COLUMNS, backfill, backfill_start_at
+from app.updates.backfill_numeric_columns import staging_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_appointments_clinic_id_start_at', ['clinic_id', 'start_at']),
+    ('ix_appointments_patient_id_start_at', ['patient_id', 'start_at']),
+]
+
+
+def _column_names(table_name):
+    return {col["name"] for col in sa.inspect(op.get_bind()).get_columns(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        backfill(op.get_bind(), commit=False)
+
+    connection = op.get_bind()
+    staged = [
+        (table_name, column_name, target_type)
+        for table_name, column_name, target_type in DATE_COLUMNS
+        if staging_column(column_name) in _column_names(table_name)
+    ]
+
+    for table_name, column_name, target_type in staged:
+        source = sa.table(table_name, sa.column(column_name), sa.column(staging_column(column_name)))
+        pending = connection.execute(
+            sa.select(sa.func.count()).select_from(source).where(
+                source.c[staging_column(column_name)].is_(None),
+                source.c[column_name].is_not(None),
+                sa.func.trim(source.c[column_name]) != ""
+            )
+        ).scalar()
+        if pending:
+            raise RuntimeError(
+                f"{pending} rows in {table_name}.{column_name} have no converted value; "
+                "fix the rows the backfill reports and run the upgrade again"
+            )
+
+    for table_name, column_name, target_type in staged:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column(column_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(staging_column(column_name), new_column_name=column_name, existing_type=target_type)
+
+    backfill_start_at(connection, commit=False)
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'appointments', columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, columns in INDEXES:
+        op.drop_index(name, table_name='appointments', if_exists=True)
+    # Back to strings, as cast by the database (on SQLite times come back as
+    # "09:00:00.000000")
+    for table_name, column_name, target_type in DATE_COLUMNS:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(column_name, type_=sa.String(), existing_type=target_type)
@@ -0,0 +1,34 @@
+"""Index orders on (patient_id, created_at, id)
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-17 23:26:15.000000
+
+A patient's order history pages newest first with a keyset cursor on
+(created_at, id); this index turns each page into a single range scan
+with no sort.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, Sequence[str], None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_patient_id_created_at_id', 'orders', ['patient_id', 'created_at', 'id'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_patient_id_created_at_id', table_name='orders', if_exists=True)
@@ -0,0 +1,40 @@
+"""Add purchase-time product and clinic snapshots to orders
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-17 23:58:30.000000
+
+order_items gets the product's name, category and clinic id, and orders the
+prescribing clinic's name, as they were when the order was placed. All are
+nullable; create_order fills them for new orders and 0016 backfills the
+older ones.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, Sequence[str], None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_items', sa.Column('product_name', sa.String(), nullable=True))
+    op.add_column('order_items', sa.Column('product_category', sa.String(), nullable=True))
+    op.add_column('order_items', sa.Column('clinic_id', sa.String(), nullable=True))
+    op.add_column('orders', sa.Column('clinic_name', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('clinic_name')
+    with op.batch_alter_table('order_items') as batch_op:
+        batch_op.drop_column('clinic_id')
+        batch_op.drop_column('product_category')
+        batch_op.drop_column('product_name')
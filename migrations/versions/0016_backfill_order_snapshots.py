@@ -0,0 +1,35 @@
+"""Backfill the product and clinic snapshots on existing orders
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-17 23:58:31.000000
+
+Runs app.updates.backfill_order_snapshots outside the migration transaction,
+committing every batch. If it is interrupted, running `alembic upgrade head`
+again resumes with the rows that are not filled yet.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.updates.backfill_order_snapshots import backfill
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0016'
+down_revision: Union[str, Sequence[str], None] = '0015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each batch commits on its own in autocommit mode
+    with op.get_context().autocommit_block():
+        backfill(op.get_bind(), commit=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The snapshot columns are dropped by 0015's downgrade
+    pass
@@ -0,0 +1,46 @@
+"""Index products for the paged catalog's orderings
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-18 00:41:12.000000
+
+/api/products pages through the catalog by newest, price or name, keyset
+paginated on (sort column, id), either across all products or within one
+category. Each ordering gets an index with and without the category in
+front, so every page is a single range scan with no sort.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0017'
+down_revision: Union[str, Sequence[str], None] = '0016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_products_created_at_id', ['created_at', 'id']),
+    ('ix_products_price_id', ['price', 'id']),
+    ('ix_products_name_id', ['name', 'id']),
+    ('ix_products_category_created_at_id', ['category', 'created_at', 'id']),
+    ('ix_products_category_price_id', ['category', 'price', 'id']),
+    ('ix_products_category_name_id', ['category', 'name', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'products', columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name='products', if_exists=True)
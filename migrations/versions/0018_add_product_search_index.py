@@ -0,0 +1,34 @@
+"""Add product full-text search index
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-18 01:17:44.000000
+
+Creates product_search (FTS5 on SQLite, a GIN-indexed tsvector table on
+PostgreSQL) for /api/products/search and indexes every existing product.
+The application keeps it in sync from then on (see app/search.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.search import create_product_search, drop_product_search, index_products
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0018'
+down_revision: Union[str, Sequence[str], None] = '0017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    create_product_search(connection)
+    index_products(connection)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_product_search(op.get_bind())
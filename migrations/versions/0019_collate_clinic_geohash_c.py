@@ -0,0 +1,40 @@
+"""Compare clinic geohashes in byte order on PostgreSQL
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-18 09:12:05.000000
+
+/api/clinics/nearby reads each geohash cell as the range [cell, cell + "~"),
+which only holds under byte order. PostgreSQL compares with the database
+collation (en_US and friends sort "~" before letters and digits), so there
+the column, and with it ix_clinics_geohash, moves to collation "C". SQLite
+compares with BINARY already and is left alone.
+
+Changing only the collation does not rewrite the table, but it rebuilds the
+index under an ACCESS EXCLUSIVE lock; clinics is small enough for that.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0019'
+down_revision: Union[str, Sequence[str], None] = '0018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('clinics', 'geohash', type_=sa.String(collation='C'), existing_type=sa.String(),
+                        existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('clinics', 'geohash', type_=sa.String(), existing_type=sa.String(collation='C'),
+                        existing_nullable=True)
@@ -551,7 +551,7 @@ async function loadRecentOrders() {
                     <td>${order.id.substring(0, 8)}...</td>
                     <td>${order.patient.name}</td>
                     <td>${formatDate(order.created_at)}</td>
-                    <td>$${parseFloat(order.total).toFixed(2)}</td>
+                    <td>$${parseFloat(order.total || "0").toFixed(2)}</td>
                     <td><span class="badge ${statusClass}">${order.status}</span></td>
                     <td>
                         <button class="btn btn-sm btn-outline-primary me-1" onclick="viewOrderDetails('${order.id}')">
@@ -754,7 +754,7 @@ async function loadProducts() {
                     <td>${product.name}</td>
                     <td>Product</td>
                     <td>${product.clinic ? product.clinic.name : 'N/A'}</td>
-                    <td>$${parseFloat(product.price).toFixed(2)}</td>
+                    <td>$${parseFloat(product.price || "0").toFixed(2)}</td>
                     <td>${status}</td>
                     <td>
                         <button type="button" class="btn btn-sm btn-outline-primary me-1 product-view-btn" data-product-id="${product.id}">
@@ -1044,7 +1044,7 @@ async function loadOrders() {
                 <tr data-id="${order.id}">
                     <td>${order.id.substring(0, 8)}...</td>
                     <td>${order.patient ? order.patient.user.name : 'N/A'}</td>
-                    <td>$${parseFloat(order.total).toFixed(2)}</td>
+                    <td>$${parseFloat(order.total || "0").toFixed(2)}</td>
                     <td>${formatDate(order.created_at)}</td>
                     <td><span class="badge ${statusClass}">${order.status}</span></td>
                     <td>${order.points_earned || '0'}</td>
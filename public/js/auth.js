@@ -5,12 +5,8 @@
 async function checkAuthStatus() {
     try {
         // Send a GET request to the backend to check if the user is authenticated
-        const response = await fetch('/api/auth/check', {
-            method: 'GET',
-            headers: {
-                // Attach the saved token for authentication
-                'Authorization': `Bearer ${getToken()}`
-            }
+        const response = await authorizedFetch('/api/auth/check', {
+            method: 'GET'
         });
         
         if (response.ok) {
@@ -97,7 +93,7 @@ async function login(email, password) {
             throw new Error('Login failed: Unable to process server response');
         });
         // Save token and user info to local storage
-        saveUserData(data.access_token, data.user);
+        saveUserData(data.access_token, data.user, data.refresh_token);
         // Update navigation bar
         updateNavigation(data.user);
         return data.user;
@@ -131,7 +127,7 @@ async function register(userData) {
             throw new Error('Registration failed: Unable to process server response');
         });
         // Save token and user info to local storage
-        saveUserData(data.access_token, data.user);
+        saveUserData(data.access_token, data.user, data.refresh_token);
         // Update navigation bar
         updateNavigation(data.user);
         return data.user;
@@ -142,8 +138,20 @@ async function register(userData) {
     }
 }
 
-// Logs the user out by clearing their data and redirecting to home
-function logout() {
+// Logs the user out by revoking their tokens, clearing their data and redirecting to home
+async function logout() {
+    // Revoke the tokens server-side; log out locally even if this fails
+    const token = getToken();
+    if (token) {
+        await fetch('/api/auth/logout', {
+            method: 'POST',
+            headers: {
+                'Authorization': `Bearer ${token}`,
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ refresh_token: localStorage.getItem('refresh_token') })
+        }).catch(error => console.error('Error revoking tokens:', error));
+    }
     // Remove user data from local storage
     clearUserData();
     // Update navigation bar
@@ -153,17 +161,71 @@ function logout() {
 }
 
 // Saves the user's token and info to local storage for later use
-function saveUserData(token, user) {
+function saveUserData(token, user, refreshToken) {
     localStorage.setItem('token', token);
     localStorage.setItem('user', JSON.stringify(user));
+    if (refreshToken) {
+        localStorage.setItem('refresh_token', refreshToken);
+    }
+    scheduleTokenRefresh();
 }
 
 // Removes user data from local storage (used on logout or failed auth)
 function clearUserData() {
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
 }
 
+// Exchanges the saved refresh token for a new access token; returns true on success.
+// Refresh tokens are single use, so concurrent callers share one request.
+let refreshInFlight = null;
+function refreshAccessToken() {
+    if (!refreshInFlight) {
+        refreshInFlight = exchangeRefreshToken().finally(() => { refreshInFlight = null; });
+    }
+    return refreshInFlight;
+}
+
+async function exchangeRefreshToken() {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!refreshToken) return false;
+    try {
+        const response = await fetch('/api/auth/refresh', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+        if (!response.ok) return false;
+        const data = await response.json();
+        saveUserData(data.access_token, data.user, data.refresh_token);
+        return true;
+    } catch (error) {
+        console.error('Error refreshing access token:', error);
+        return false;
+    }
+}
+
+// Access tokens are short-lived, so renew them shortly before they expire.
+// Pages that call fetch() directly keep working without handling 401s themselves.
+let tokenRefreshTimer = null;
+function scheduleTokenRefresh() {
+    if (tokenRefreshTimer) clearTimeout(tokenRefreshTimer);
+    const token = getToken();
+    if (!token || !localStorage.getItem('refresh_token')) return;
+    let expiresAt;
+    try {
+        expiresAt = JSON.parse(atob(token.split('.')[1].replace(/-/g, '+').replace(/_/g, '/'))).exp * 1000;
+    } catch (e) {
+        return;
+    }
+    const delay = Math.max(0, expiresAt - Date.now() - 60 * 1000);
+    tokenRefreshTimer = setTimeout(refreshAccessToken, delay);
+}
+scheduleTokenRefresh();
+
 // Gets the saved token from local storage
 function getToken() {
     return localStorage.getItem('token');
@@ -204,8 +266,9 @@ function isAdmin() {
     return adminTypes.some(type => user.type.toLowerCase() === type.toLowerCase());
 }
 
-// Helper for making authenticated API requests with the saved token
-function authorizedFetch(url, options = {}) {
+// Helper for making authenticated API requests with the saved token.
+// Retries once with a refreshed access token if the current one has expired.
+async function authorizedFetch(url, options = {}) {
     const token = getToken();
     if (!options.headers) {
         options.headers = {};
@@ -215,5 +278,10 @@ function authorizedFetch(url, options = {}) {
     } else {
         console.warn('No auth token found for request:', url);
     }
-    return fetch(url, options);
+    const response = await fetch(url, options);
+    if (response.status === 401 && await refreshAccessToken()) {
+        options.headers['Authorization'] = `Bearer ${getToken()}`;
+        return fetch(url, options);
+    }
+    return response;
 }
@@ -21,35 +21,53 @@ document.addEventListener('DOMContentLoaded', function() {
     setupCategoryFilters();
 });
 
-// Load all products (with optional category filter)
-function loadProducts(category = null) {
+// Products shown per page; the next page is fetched with "Load more"
+const PRODUCTS_PAGE_SIZE = 24;
+
+// Load a page of products (with optional category filter). Without a cursor
+// the list starts over; with one, the next page is appended.
+function loadProducts(category = null, cursor = null) {
     const container = document.getElementById('products-list');
     if (!container) return;
     
     // Show loading state
-    container.innerHTML = `
-        <div class="col-12 text-center py-5">
-            <div class="spinner-border text-primary" role="status">
+    const loadMore = document.getElementById('products-load-more');
+    if (cursor && loadMore) {
+        loadMore.innerHTML = `
+            <div class="spinner-border text-primary spinner-border-sm" role="status">
                 <span class="visually-hidden">Loading...</span>
             </div>
-        </div>
-    `;
+        `;
+    } else {
+        container.innerHTML = `
+            <div class="col-12 text-center py-5">
+                <div class="spinner-border text-primary" role="status">
+                    <span class="visually-hidden">Loading...</span>
+                </div>
+            </div>
+        `;
+    }
     
-    // Fetch products (with category filter if provided)
-    let url = '/api/products/all';
+    // Fetch a page of products (with category filter if provided)
+    const params = new URLSearchParams({ limit: PRODUCTS_PAGE_SIZE });
     if (category) {
-        url += `?category=${encodeURIComponent(category)}`;
+        params.set('category', category);
+    }
+    if (cursor) {
+        params.set('cursor', cursor);
     }
     
-    fetch(url)
+    let nextCursor = null;
+    fetch(`/api/products?${params}`)
         .then(response => {
             if (!response.ok) {
                 throw new Error(`HTTP error! Status: ${response.status}`);
             }
+            nextCursor = response.headers.get('X-Next-Cursor');
             return response.json();
         })
         .then(products => {
-            if (products.length === 0) {
+            if (products.length === 0 && !cursor) {
                 container.innerHTML = `
                     <div class="col-12 text-center">
                         <p class="text-muted">No products available${category ? ' in this category' : ''}.</p>
@@ -58,8 +76,12 @@ function loadProducts(category = null) {
                 return;
             }
             
-            // Clear the container
-            container.innerHTML = '';
+            // Clear the container on the first page, or just the "Load more" button after it
+            if (cursor) {
+                if (loadMore) loadMore.remove();
+            } else {
+                container.innerHTML = '';
+            }
             
             // Display each product
             products.forEach(product => {
@@ -99,6 +121,16 @@ function loadProducts(category = null) {
                 container.appendChild(card);
             });
             
+            // Offer the next page, if there is one
+            if (nextCursor) {
+                const more = document.createElement('div');
+                more.id = 'products-load-more';
+                more.className = 'col-12 text-center mb-4';
+                more.innerHTML = '<button class="btn btn-outline-primary">Load more</button>';
+                more.querySelector('button').addEventListener('click', () => loadProducts(category, nextCursor));
+                container.appendChild(more);
+            }
+            
             // Set up "Add to Cart" buttons
             setupAddToCartButtons();
             
@@ -234,8 +266,10 @@ function updateCartBadge() {
 
 // Set up "Add to Cart" buttons
 function setupAddToCartButtons() {
-    const addToCartButtons = document.querySelectorAll('.add-to-cart-btn');
+    // Skip buttons already set up, so appending a page doesn't add their listeners twice
+    const addToCartButtons = document.querySelectorAll('.add-to-cart-btn:not([data-bound])');
     addToCartButtons.forEach(button => {
+        button.dataset.bound = 'true';
         button.addEventListener('click', function() {
             const productId = this.getAttribute('data-id');
             const productName = this.getAttribute('data-name');